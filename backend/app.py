@@ -1,36 +1,148 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify, g, stream_with_context
 from flask_cors import CORS
 import os
 from werkzeug.utils import secure_filename
-from services.resume_parser import extract_text_from_file
-from services.watson_service import analyze_resume_with_watson
-from services.database import save_candidate, get_all_candidates, get_candidate_by_id
+from services.database import (
+    init_database, save_candidate, get_all_candidates, get_candidate_by_id, update_job_description,
+    get_open_job_descriptions
+)
 from services.hr_integration import (
     get_supported_hr_systems,
     send_candidate_to_hr,
     validate_hr_system_connection,
     export_candidate_data
 )
-from services.bias_detection import analyze_resume_bias, create_blind_version
 from services.advanced_ranking import analyze_advanced_ranking
+from services.resume_pipeline import process_resume, PIPELINE_STAGES
+from services.job_queue import job_queue, batch_job_queue, find_job_queue, JobQueueFull
+from services.batch_ingest import batch_registry, iter_zip_resumes, discard_batch_items, BatchTooLarge
+from services.file_store import save_stream, FileTooLarge
+from services.resume_parser import read_cached_text, extract_text_cached, prune_text_cache, TEXT_CACHE_FOLDER
+from services.bias_detection import reload_bias_lexicons, get_lexicon_info
+from services.bias_report import build_bias_report
+from services.batch_ranking import rank_candidates, DEFAULT_LEADERBOARD_SIZE
+from services.jd_registry import jd_registry, UnknownJobDescription
+from services.semantic_prefilter import shortlist_candidates, DEFAULT_SHORTLIST_SIZE, MAX_SHORTLIST_SIZE
+from services.role_matching import match_resume_to_roles, DEFAULT_ROLE_MATCHES, MAX_ROLE_MATCHES
+from services.leaderboard import leaderboards, DEFAULT_WINDOW_SIZE, MAX_WINDOW_SIZE
+from services.skill_index import search_candidates, QuerySyntaxError, DEFAULT_SEARCH_RESULTS, MAX_SEARCH_RESULTS
+from services.metrics import registry as metrics_registry, HTTP_REQUEST_SECONDS, CONTENT_TYPE as METRICS_CONTENT_TYPE
+import re
+import json
 import uuid
+import time
+import zipfile
 from datetime import datetime
 
+class ResumeRequest(Request):
+    """Request class that allows a larger body on the bulk upload endpoint"""
+
+    @property
+    def max_content_length(self):
+        if self.path == '/api/upload/batch':
+            return app.config['MAX_BATCH_CONTENT_LENGTH']
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = ResumeRequest
 CORS(app)
 
 # Configuration
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx', 'doc'}
+app.config['MAX_BATCH_FILES'] = int(os.getenv('MAX_BATCH_FILES', '500'))
+app.config['MAX_BATCH_CONTENT_LENGTH'] = int(os.getenv('MAX_BATCH_CONTENT_LENGTH', str(512 * 1024 * 1024)))
+app.config['MAX_RESUME_FILE_SIZE'] = 16 * 1024 * 1024  # per resume inside a batch
+
+app.config['TEXT_CACHE_FOLDER'] = TEXT_CACHE_FOLDER
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Create the candidates database, or add columns missing from an older one
+init_database()
+
+# Text extracted by an older parser version is never read again
+prune_text_cache(app.config['TEXT_CACHE_FOLDER'])
+
+metrics_registry.gauge(
+    'upload_jobs', 'Asynchronous upload jobs by status', ['status'],
+    callback=lambda: {(status,): count for status, count in job_queue.stats()['jobs'].items()}
+)
+metrics_registry.gauge(
+    'batch_upload_jobs', 'Bulk upload jobs by status', ['status'],
+    callback=lambda: {(status,): count for status, count in batch_job_queue.stats()['jobs'].items()}
+)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Label by route template so candidate ids do not explode the series count
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method, route=route, status=response.status_code
+        )
+    return response
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def is_async_request():
+    """Check whether the client opted into asynchronous job processing"""
+    flag = request.args.get('async', request.form.get('async', ''))
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+def save_uploaded_resume(file):
+    """Stream an uploaded resume to the upload folder, returning (file_id, filename, path, content hash)"""
+    # Generate unique filename
+    file_id = str(uuid.uuid4())
+    filename = secure_filename(file.filename)
+    file_extension = filename.rsplit('.', 1)[1].lower()
+    unique_filename = f"{file_id}.{file_extension}"
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+
+    # Save file, hashing it on the way so repeated uploads can reuse earlier analyses
+    _, content_hash = save_stream(file.stream, file_path)
+    return file_id, filename, file_path, content_hash
+
+def request_job_description(data=None):
+    """Job description of a request: a registered ``jd_id`` or inline ``job_description`` text"""
+    data = data or {}
+    return jd_registry.resolve(
+        jd_id=data.get('jd_id', request.form.get('jd_id')),
+        text=data.get('job_description', request.form.get('job_description'))
+    )
+
+def format_sse(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"id: {event_id}\n" if event_id is not None else ''
+    message += f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return message
+
+def stream_job_events(job_id, start=0, queue=job_queue):
+    """SSE response relaying a job's stage events until it completes"""
+    def generate():
+        yield format_sse('queued', {'job_id': job_id})
+        for index, name, data in queue.iter_events(job_id, start=start):
+            if name is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield format_sse(name, data, event_id=index)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/upload', methods=['POST'])
 def upload_resume():
     """Handle resume file upload and processing"""
@@ -43,87 +155,178 @@ def upload_resume():
 
     if file and allowed_file(file.filename):
         try:
-            # Generate unique filename
-            file_id = str(uuid.uuid4())
-            filename = secure_filename(file.filename)
-            file_extension = filename.rsplit('.', 1)[1].lower()
-            unique_filename = f"{file_id}.{file_extension}"
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-
-            # Save file
-            file.save(file_path)
-
-            # Extract text from resume
-            resume_text = extract_text_from_file(file_path)
+            # Get job description from request form (optional)
+            job_description = request_job_description()
+            file_id, filename, file_path, content_hash = save_uploaded_resume(file)
 
-            # Perform bias analysis
-            bias_analysis = analyze_resume_bias(resume_text)
+            if is_async_request():
+                job_id = job_queue.submit(
+                    process_resume, file_path, filename, file_id, job_description,
+                    content_hash=content_hash
+                )
+                return jsonify({
+                    'success': True,
+                    'job_id': job_id,
+                    'candidate_id': file_id,
+                    'status': 'queued',
+                    'status_url': f'/api/jobs/{job_id}',
+                    'events_url': f'/api/jobs/{job_id}/events'
+                }), 202
+
+            return jsonify(process_resume(
+                file_path, filename, file_id, job_description, content_hash=content_hash
+            ))
+
+        except UnknownJobDescription as e:
+            return jsonify({'error': str(e)}), 404
+        except JobQueueFull as e:
+            return jsonify({'error': str(e)}), 503
+        except Exception as e:
+            return jsonify({'error': f'Processing failed: {str(e)}'}), 500
 
-            # Create blind version for fair screening
-            blind_resume, removed_info = create_blind_version(resume_text)
+    return jsonify({'error': 'Invalid file type'}), 400
 
-            # Analyze with Watson (use blind version if bias score is high)
-            if bias_analysis['overall_bias_score'] > 30:
-                analysis_resume_text = blind_resume
-            else:
-                analysis_resume_text = resume_text
+@app.route('/api/upload/stream', methods=['POST'])
+def upload_resume_stream():
+    """Upload a resume and stream an event as each processing stage finishes"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
 
-            analysis_result = analyze_resume_with_watson(analysis_resume_text)
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
 
-            from services.profile_verification import enrich_candidate_profiles
-            from services.jd_matching import match_job_description
-            from services.hr_integration import send_candidate_to_hr
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type'}), 400
 
-            # Enrich candidate profiles with LinkedIn/GitHub data
-            profile_enrichment = enrich_candidate_profiles(resume_text)
+    try:
+        job_description = request_job_description()
+        file_id, filename, file_path, content_hash = save_uploaded_resume(file)
+        job_id = job_queue.submit(
+            process_resume, file_path, filename, file_id, job_description,
+            content_hash=content_hash
+        )
+    except UnknownJobDescription as e:
+        return jsonify({'error': str(e)}), 404
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
 
-            # Get job description from request form (optional)
-            job_description = request.form.get('job_description', None)
-            jd_match_result = None
-            if job_description:
-                jd_match_result = match_job_description(job_description, resume_text)
-
-            # Prepare candidate data dictionary
-            candidate_data = {
-                'id': file_id,
-                'filename': filename,
-                'upload_date': datetime.now().isoformat(),
-                'resume_text': resume_text,
-                'blind_resume_text': blind_resume,
-                'analysis_result': analysis_result,
-                'bias_analysis': bias_analysis,
-                'removed_personal_info': removed_info,
-                'profile_enrichment': profile_enrichment,
-            'jd_match_result': jd_match_result,
-            'advanced_ranking': None
-            }
-
-            # Example: Send shortlisted candidate to HR system (e.g., Workday)
-            # This can be conditional or triggered by a separate API in real use
-            try:
-                hr_api_key = os.getenv('HR_API_KEY')
-                hr_api_url = os.getenv('HR_API_URL')
-                hr_system = os.getenv('HR_SYSTEM', 'workday')  # default to workday
-                hr_response = send_candidate_to_hr(hr_system, candidate_data, api_key=hr_api_key, api_url=hr_api_url)
-                if not hr_response.get('success', False):
-                    app.logger.error(f"Failed to send candidate to HR system: {hr_response.get('error')}")
-            except Exception as e:
-                app.logger.error(f"Exception during HR system integration: {str(e)}")
+    return stream_job_events(job_id)
 
-            save_candidate(candidate_data)
+@app.route('/api/upload/batch', methods=['POST'])
+def upload_resume_batch():
+    """Handle bulk upload of a ZIP archive or many resume files"""
+    files = [f for f in request.files.getlist('files') + request.files.getlist('file') if f.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
 
-            return jsonify({
-                'success': True,
-                'candidate_id': file_id,
-                'analysis': analysis_result,
-                'bias_analysis': bias_analysis,
-                'fair_screening_available': True
-            })
+    try:
+        job_description = request_job_description()
+    except UnknownJobDescription as e:
+        return jsonify({'error': str(e)}), 404
+    upload_folder = app.config['UPLOAD_FOLDER']
+    max_files = app.config['MAX_BATCH_FILES']
+    max_file_size = app.config['MAX_RESUME_FILE_SIZE']
+
+    items = []
+    try:
+        for file in files:
+            filename = secure_filename(file.filename)
+            if filename.lower().endswith('.zip'):
+                items.extend(iter_zip_resumes(
+                    file.stream, upload_folder, app.config['ALLOWED_EXTENSIONS'],
+                    max_files - len(items), max_file_size
+                ))
+            elif allowed_file(filename):
+                file_id = str(uuid.uuid4())
+                file_extension = filename.rsplit('.', 1)[1].lower()
+                file_path = os.path.join(upload_folder, f"{file_id}.{file_extension}")
+                try:
+                    _, content_hash = save_stream(file.stream, file_path, max_file_size)
+                    items.append({
+                        'filename': filename,
+                        'candidate_id': file_id,
+                        'file_path': file_path,
+                        'content_hash': content_hash
+                    })
+                except FileTooLarge as e:
+                    items.append({'filename': filename, 'status': 'skipped', 'error': str(e)})
+            else:
+                items.append({'filename': filename, 'status': 'skipped', 'error': 'Invalid file type'})
 
-        except Exception as e:
-            return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+            if len(items) > max_files:
+                raise BatchTooLarge(f"Batch exceeds the limit of {max_files} files")
 
-    return jsonify({'error': 'Invalid file type'}), 400
+        batch_id = batch_registry.create_batch(items, process_resume, job_description)
+        batch = batch_registry.get_batch(batch_id)
+        return jsonify({
+            'success': True,
+            'batch_id': batch_id,
+            'total_files': batch['total_files'],
+            'files': batch['files'],
+            'status_url': f'/api/batches/{batch_id}'
+        }), 202
+
+    # A rejected batch leaves no files behind that no job will ever process
+    except BatchTooLarge as e:
+        discard_batch_items(items)
+        return jsonify({'error': str(e)}), 413
+    except zipfile.BadZipFile:
+        discard_batch_items(items)
+        return jsonify({'error': 'Invalid ZIP archive'}), 400
+    except Exception as e:
+        discard_batch_items(items)
+        return jsonify({'error': f'Batch upload failed: {str(e)}'}), 500
+
+@app.route('/api/batches/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """Get per-file status and results of a bulk upload"""
+    batch = batch_registry.get_batch(batch_id)
+    if not batch:
+        return jsonify({'error': 'Batch not found'}), 404
+
+    return jsonify({'batch': batch})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Get status and per-stage progress of an asynchronous upload job"""
+    queue = find_job_queue(job_id)
+    job = queue.get_job(job_id, include_result=False) if queue else None
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    job['total_stages'] = len(PIPELINE_STAGES)
+    job['result_url'] = f'/api/jobs/{job_id}/result'
+    return jsonify({'job': job})
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def get_job_events(job_id):
+    """Stream the stage events of an asynchronous upload job (Server-Sent Events)"""
+    queue = find_job_queue(job_id)
+    if not queue:
+        return jsonify({'error': 'Job not found'}), 404
+
+    # Resume after the last event a reconnecting EventSource has already seen
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    start = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+    return stream_job_events(job_id, start=start, queue=queue)
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Get the final result of an asynchronous upload job"""
+    queue = find_job_queue(job_id)
+    job = queue.get_job(job_id) if queue else None
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    if job['status'] == 'failed':
+        return jsonify({'error': f"Processing failed: {job['error']}", 'status': job['status']}), 500
+    if job['status'] != 'completed':
+        return jsonify({'status': job['status'], 'current_stage': job['current_stage']}), 202
+
+    return jsonify(job['result'])
 
 @app.route('/api/candidates', methods=['GET'])
 def get_candidates():
@@ -148,11 +351,67 @@ def get_candidate(candidate_id):
     except Exception as e:
         return jsonify({'error': f'Failed to fetch candidate: {str(e)}'}), 500
 
+def stored_resume_path(candidate):
+    """Path of the uploaded file behind a candidate; deduplicated records use the referenced upload"""
+    extension = candidate['filename'].rsplit('.', 1)[-1].lower()
+    for file_id in (candidate['id'], candidate.get('analysis_ref')):
+        if file_id:
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{file_id}.{extension}")
+            if os.path.exists(file_path):
+                return file_path
+    return None
+
+@app.route('/api/candidates/<candidate_id>/reanalyze', methods=['POST'])
+def reanalyze_candidate(candidate_id):
+    """Re-run the analysis pipeline for a stored candidate, reusing its cached resume text"""
+    try:
+        candidate = get_candidate_by_id(candidate_id)
+        if not candidate:
+            return jsonify({'error': 'Candidate not found'}), 404
+
+        file_path = stored_resume_path(candidate)
+        content_hash = candidate.get('content_hash')
+        if file_path is None and (not content_hash or read_cached_text(content_hash) is None):
+            return jsonify({'error': 'Resume file is no longer available'}), 404
+
+        job_description = request_job_description(request.get_json(silent=True))
+
+        if is_async_request():
+            job_id = job_queue.submit(
+                process_resume, file_path, candidate['filename'], candidate_id, job_description,
+                content_hash=content_hash, reuse_analysis=False
+            )
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'candidate_id': candidate_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}',
+                'events_url': f'/api/jobs/{job_id}/events'
+            }), 202
+
+        return jsonify(process_resume(
+            file_path, candidate['filename'], candidate_id, job_description,
+            content_hash=content_hash, reuse_analysis=False
+        ))
+
+    except UnknownJobDescription as e:
+        return jsonify({'error': str(e)}), 404
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': f'Reanalysis failed: {str(e)}'}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'service': 'Resume Screener API'})
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Pipeline, route and integration metrics in Prometheus text format"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
 @app.route('/api/chat', methods=['POST'])
 def chat_with_watson():
     """Chatbot-style interaction endpoint"""
@@ -186,12 +445,228 @@ def hr_chat():
     except Exception as e:
         return jsonify({'error': f'HR chatbot failed: {str(e)}'}), 500
 
+@app.route('/api/bias-lexicons', methods=['GET'])
+def get_bias_lexicons():
+    """Version stamp of the bias lexicons this worker is using"""
+    return jsonify(get_lexicon_info())
+
+@app.route('/api/bias-lexicons/reload', methods=['POST'])
+def reload_bias_lexicons_endpoint():
+    """Reload the BIAS_LEXICON_PATH file and swap it in without restarting the worker"""
+    try:
+        info = reload_bias_lexicons()
+        return jsonify({'success': True, 'lexicons': info})
+    except (OSError, ValueError, re.error) as e:
+        return jsonify({'error': f'Failed to load bias lexicons: {str(e)}'}), 400
+
+@app.route('/api/reports/bias', methods=['GET'])
+def get_bias_report():
+    """Corpus-level bias score distributions across all stored candidates"""
+    try:
+        report = build_bias_report(
+            rescan=request.args.get('rescan', '').lower() in ('1', 'true', 'yes'),
+            include_candidates=request.args.get('include_candidates', '').lower() in ('1', 'true', 'yes')
+        )
+        return jsonify(report)
+    except Exception as e:
+        return jsonify({'error': f'Failed to build bias report: {str(e)}'}), 500
+
+def job_description_payload(parsed):
+    return {
+        'jd_id': parsed.jd_id,
+        'requirements': list(parsed.requirements),
+        'skills': list(parsed.skills),
+        'keywords': list(parsed.keywords)
+    }
+
+@app.route('/api/job-descriptions', methods=['POST'])
+def register_job_description():
+    """Store a job description once and return the id later requests can use instead of its text"""
+    data = request.get_json(silent=True) or {}
+    text = data.get('job_description', request.form.get('job_description'))
+    if not isinstance(text, str) or not text.strip():
+        return jsonify({'error': 'job_description text is required'}), 400
+    is_open, title = data.get('open'), data.get('title')
+    if is_open is not None and not isinstance(is_open, bool):
+        return jsonify({'error': 'open must be a boolean'}), 400
+    if title is not None and not isinstance(title, str):
+        return jsonify({'error': 'title must be text'}), 400
+    try:
+        parsed = jd_registry.register(text)
+        if is_open is not None or title is not None:
+            update_job_description(parsed.jd_id, is_open, title)
+        return jsonify({'success': True, **job_description_payload(parsed)})
+    except Exception as e:
+        return jsonify({'error': f'Failed to register job description: {str(e)}'}), 500
+
+@app.route('/api/job-descriptions/<jd_id>', methods=['PATCH'])
+def update_requisition(jd_id):
+    """Open or close a registered job description as a requisition, or retitle it"""
+    data = request.get_json(silent=True) or {}
+    is_open, title = data.get('open'), data.get('title')
+    if is_open is not None and not isinstance(is_open, bool):
+        return jsonify({'error': 'open must be a boolean'}), 400
+    if title is not None and not isinstance(title, str):
+        return jsonify({'error': 'title must be text'}), 400
+    try:
+        if not update_job_description(jd_id, is_open, title):
+            return jsonify({'error': 'Job description not found'}), 404
+        return jsonify({'success': True, 'jd_id': jd_id, 'open': is_open, 'title': title})
+    except Exception as e:
+        return jsonify({'error': f'Failed to update job description: {str(e)}'}), 500
+
+@app.route('/api/roles', methods=['GET'])
+def list_open_roles():
+    """Open requisitions resumes are matched against"""
+    try:
+        return jsonify({'roles': [{'jd_id': jd_id, 'title': title} for jd_id, title in get_open_job_descriptions()]})
+    except Exception as e:
+        return jsonify({'error': f'Failed to list open roles: {str(e)}'}), 500
+
+@app.route('/api/roles/match', methods=['POST'])
+def match_open_roles():
+    """Best-fit open roles for an uploaded resume, a stored candidate or resume text"""
+    data = request.get_json(silent=True) or {}
+    limit = request.args.get('limit', data.get('limit', DEFAULT_ROLE_MATCHES), type=int)
+    if limit is None or not 0 <= limit <= MAX_ROLE_MATCHES:
+        return jsonify({'error': f'limit must be an integer between 0 and {MAX_ROLE_MATCHES}'}), 400
+
+    try:
+        file = request.files.get('file')
+        candidate_id = data.get('candidate_id', request.form.get('candidate_id'))
+        if file and file.filename:
+            if not allowed_file(file.filename):
+                return jsonify({'error': 'Invalid file type'}), 400
+            _, _, file_path, content_hash = save_uploaded_resume(file)
+            try:
+                resume_text = extract_text_cached(file_path, content_hash)
+            finally:
+                os.remove(file_path)
+        elif candidate_id:
+            candidate = get_candidate_by_id(candidate_id)
+            if not candidate:
+                return jsonify({'error': 'Candidate not found'}), 404
+            resume_text = candidate.get('resume_text') or ''
+        else:
+            resume_text = data.get('resume_text', request.form.get('resume_text'))
+            if not isinstance(resume_text, str) or not resume_text.strip():
+                return jsonify({'error': 'Provide a file, candidate_id or resume_text'}), 400
+
+        return jsonify(match_resume_to_roles(resume_text, limit))
+    except Exception as e:
+        return jsonify({'error': f'Role matching failed: {str(e)}'}), 500
+
+@app.route('/api/job-descriptions/<jd_id>', methods=['GET'])
+def get_registered_job_description(jd_id):
+    """Parsed requirements, skills and keywords of a registered job description"""
+    parsed = jd_registry.get(jd_id)
+    if parsed is None:
+        return jsonify({'error': 'Job description not found'}), 404
+    return jsonify({**job_description_payload(parsed), 'job_description': parsed.text})
+
+@app.route('/api/job-descriptions/<jd_id>/leaderboard', methods=['GET'])
+def get_job_description_leaderboard(jd_id):
+    """A page of the candidates screened against a job description, best first"""
+    try:
+        if jd_registry.get(jd_id) is None:
+            return jsonify({'error': 'Job description not found'}), 404
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', DEFAULT_WINDOW_SIZE, type=int)
+        if offset is None or offset < 0:
+            return jsonify({'error': 'offset must be a non-negative integer'}), 400
+        if limit is None or not 0 <= limit <= MAX_WINDOW_SIZE:
+            return jsonify({'error': f'limit must be an integer between 0 and {MAX_WINDOW_SIZE}'}), 400
+
+        return jsonify(leaderboards.window(jd_id, offset, limit))
+    except Exception as e:
+        return jsonify({'error': f'Failed to get leaderboard: {str(e)}'}), 500
+
+@app.route('/api/job-descriptions/<jd_id>/leaderboard/<candidate_id>', methods=['GET'])
+def get_leaderboard_position(jd_id, candidate_id):
+    """A candidate's rank and percentile among those screened against a job description"""
+    try:
+        position = leaderboards.position(jd_id, candidate_id)
+        if position is None:
+            return jsonify({'error': 'Candidate not on this leaderboard'}), 404
+        return jsonify(position)
+    except Exception as e:
+        return jsonify({'error': f'Failed to get leaderboard position: {str(e)}'}), 500
+
+@app.route('/api/rankings', methods=['POST'])
+def rank_candidates_endpoint():
+    """Rank stored candidates, or the given subset, for one job description"""
+    try:
+        data = request.get_json(silent=True) or {}
+        candidate_ids = data.get('candidate_ids')
+        if candidate_ids is not None and not (
+            isinstance(candidate_ids, list) and all(isinstance(i, str) for i in candidate_ids)
+        ):
+            return jsonify({'error': 'candidate_ids must be a list of candidate ids'}), 400
+        limit = data.get('limit', DEFAULT_LEADERBOARD_SIZE)
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            return jsonify({'error': 'limit must be a non-negative integer or null'}), 400
+
+        weights = data.get('weights')
+        if weights is not None and not isinstance(weights, dict):
+            return jsonify({'error': 'weights must be an object'}), 400
+
+        return jsonify(rank_candidates(request_job_description(data), candidate_ids, limit, weights))
+    except UnknownJobDescription as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Ranking failed: {str(e)}'}), 500
+
+@app.route('/api/shortlist', methods=['POST'])
+def shortlist_candidates_endpoint():
+    """Shortlist stored candidates for a job description locally, then LLM-match only the shortlist"""
+    try:
+        data = request.get_json(silent=True) or {}
+        candidate_ids = data.get('candidate_ids')
+        if candidate_ids is not None and not (
+            isinstance(candidate_ids, list) and all(isinstance(i, str) for i in candidate_ids)
+        ):
+            return jsonify({'error': 'candidate_ids must be a list of candidate ids'}), 400
+        shortlist_size = data.get('shortlist_size', DEFAULT_SHORTLIST_SIZE)
+        if isinstance(shortlist_size, bool) or not isinstance(shortlist_size, int) \
+                or not 0 <= shortlist_size <= MAX_SHORTLIST_SIZE:
+            return jsonify({'error': f'shortlist_size must be an integer between 0 and {MAX_SHORTLIST_SIZE}'}), 400
+        explain = data.get('explain', True)
+        if not isinstance(explain, bool):
+            return jsonify({'error': 'explain must be a boolean'}), 400
+
+        return jsonify(shortlist_candidates(request_job_description(data), candidate_ids, shortlist_size, explain))
+    except UnknownJobDescription as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Shortlisting failed: {str(e)}'}), 500
+
+@app.route('/api/search', methods=['GET'])
+def search_candidates_endpoint():
+    """Search every stored candidate with a boolean skill query"""
+    try:
+        query = request.args.get('q', '')
+        k = request.args.get('k', DEFAULT_SEARCH_RESULTS, type=int)
+        if k is None or not 0 <= k <= MAX_SEARCH_RESULTS:
+            return jsonify({'error': f'k must be an integer between 0 and {MAX_SEARCH_RESULTS}'}), 400
+        min_years = request.args.get('min_years', type=float)
+        if 'min_years' in request.args and min_years is None:
+            return jsonify({'error': 'min_years must be a number'}), 400
+
+        return jsonify(search_candidates(query, min_years=min_years, limit=k))
+    except QuerySyntaxError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Search failed: {str(e)}'}), 500
+
 @app.route('/api/bias-analysis/<candidate_id>', methods=['GET'])
 def get_bias_analysis(candidate_id):
     """Get bias analysis for a specific candidate"""
     try:
-        candidates = get_all_candidates()
-        candidate = next((c for c in candidates if c['id'] == candidate_id), None)
+        candidate = get_candidate_by_id(candidate_id)
 
         if not candidate:
             return jsonify({'error': 'Candidate not found'}), 404
@@ -208,8 +683,7 @@ def get_bias_analysis(candidate_id):
 def get_blind_resume(candidate_id):
     """Get blind version of resume for fair screening"""
     try:
-        candidates = get_all_candidates()
-        candidate = next((c for c in candidates if c['id'] == candidate_id), None)
+        candidate = get_candidate_by_id(candidate_id)
 
         if not candidate:
             return jsonify({'error': 'Candidate not found'}), 404
@@ -0,0 +1,79 @@
+"""
+Rank a synthetic requisition with the batch engine, re-rank it with custom
+weights from the stored component scores, and compare both with scoring each
+candidate through AdvancedRankingService.
+
+Usage: python benchmarks/bench_batch_ranking.py [candidates]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import database
+from services.advanced_ranking import advanced_ranking_service
+from services.batch_ranking import rank_candidates, batch_ranking_engine
+
+JOB_DESCRIPTION = """Requirements: Python, SQL and Docker experience
+Must have kubernetes cluster operations
+Required strong communication with stakeholders"""
+
+PHRASES = [
+    'led teams', 'mentored staff', 'promoted within 2 years', 'managed projects', 'python', 'java', 'sql',
+    'aws', 'docker', 'kubernetes', 'react', 'machine learning', 'devops', 'teamwork', 'communication',
+    'problem solving', 'quality', 'honest', 'learn', 'research', 'design', 'data science', 'fast track'
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    random.seed(7)
+    folder = tempfile.mkdtemp()
+    database.DB_PATH = os.path.join(folder, 'candidates.db')
+    database.init_database()
+
+    features = []
+    conn = database.sqlite3.connect(database.DB_PATH)
+    rows = []
+    for i in range(count):
+        text = ' '.join(random.sample(PHRASES, random.randint(1, 12)))
+        vector = advanced_ranking_service.extract_features(text)
+        features.append(vector)
+        encoded, components = batch_ranking_engine.encode_candidate(vector)
+        rows.append((f'c{i}', f'c{i}.pdf', '2024-01-01', text, '{}', encoded, components, batch_ranking_engine.version))
+    conn.executemany('''
+    INSERT INTO candidates (id, filename, upload_date, resume_text, analysis_result,
+                            ranking_features, ranking_components, ranking_features_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+    try:
+        start = time.perf_counter()
+        report = rank_candidates(JOB_DESCRIPTION, limit=100)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rank_candidates(JOB_DESCRIPTION, limit=100, weights={'skill_coverage': 0.8, 'trajectory': {'rapid_growth': 0}})
+        reweighted = time.perf_counter() - start
+
+        sample = features[:2000]
+        start = time.perf_counter()
+        for vector in sample:
+            advanced_ranking_service.generate_advanced_ranking(vector, JOB_DESCRIPTION)
+        per_candidate = (time.perf_counter() - start) / len(sample)
+
+        print(f"candidates:                {report['total_candidates']}")
+        print(f"batch leaderboard:         {batch:.2f} s (database read included)")
+        print(f"custom weights:            {reweighted:.2f} s (database read included)")
+        print(f"per-candidate loop (est.): {per_candidate * count:.2f} s")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the per-term bias lexicon scans with the single-pass LexiconMatcher.
+
+Usage: python benchmarks/bench_bias_lexicons.py [resume_kb] [repeats]
+"""
+import os
+import re
+import sys
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.bias_detection import BiasDetector, DEFAULT_LEXICONS
+
+# Scans performed by the previous BiasDetector: one substring test or count per term
+# plus an uncompiled findall per pattern
+LEGACY_PATTERNS = [
+    r'\b\d{1,2}\s*(?:years?|yrs?|yo)\b',
+    r'\b(?:young|old|senior|junior|experienced|inexperienced)\b',
+    r'\b(?:fresh|recent|new)\s*(?:graduate|grad)\b',
+    r'\b(?:mid|late|early)\s*\d{1,2}s\b',
+    r'\b(?:from|in|at)\s+(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',
+    r'\b(?:asian|african|european|american|middle eastern)\b',
+    r'\b(?:ranked|top|best|leading|premier)\s+(?:university|college|school|institution)\b',
+    r'\b(?:tier|elite|prestigious|ivy)\b'
+]
+
+
+def legacy_scan(text):
+    text = text.lower()
+    hits = 0
+    for category in ('gender_male', 'gender_female', 'gender_neutral'):
+        hits += sum(1 for term in DEFAULT_LEXICONS[category]['terms'] if term in text)
+    for category in ('age', 'location', 'education'):
+        hits += sum(text.count(term) for term in DEFAULT_LEXICONS[category]['terms'])
+    for pattern in LEGACY_PATTERNS:
+        hits += len(re.findall(pattern, text, re.IGNORECASE))
+    return hits
+
+
+SAMPLE = (
+    "Senior software engineer from Berlin with 8 years experience leading teams at Acme. "
+    "Built data pipelines in Python and Go; mentored junior developers and recent graduates. "
+    "BSc Computer Science, Stanford University. Worked with international customers in Europe.\n"
+)
+
+
+def main():
+    resume_kb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    text = SAMPLE * (resume_kb * 1024 // len(SAMPLE) + 1)
+    detector = BiasDetector()
+
+    for name, func in (('per-term', legacy_scan), ('single-pass', detector.matcher.scan)):
+        seconds = min(timeit.repeat(lambda: func(text), number=repeats, repeat=3)) / repeats
+        print(f"{name:12} {seconds * 1000:8.2f} ms per {len(text) // 1024} KB resume")
+
+
+if __name__ == '__main__':
+    main()
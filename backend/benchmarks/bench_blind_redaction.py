@@ -0,0 +1,48 @@
+"""
+Compare the previous replace-per-match blind resume redaction with the single-pass one.
+
+Usage: python benchmarks/bench_blind_redaction.py [lines] [repeats]
+"""
+import os
+import re
+import sys
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.bias_detection import create_blind_version
+
+
+def legacy_blind(resume_text):
+    """Previous implementation: one str.replace over the whole text per match"""
+    blind_text = resume_text
+    for pattern in (r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b', r'\b[A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+\b',
+                    r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b'):
+        for match in re.findall(pattern, blind_text):
+            if match not in ['This Is', 'That Is', 'It Is']:
+                blind_text = blind_text.replace(match, '[NAME REMOVED]')
+    for email in re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', blind_text):
+        blind_text = blind_text.replace(email, '[EMAIL REMOVED]')
+    phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b'
+    for phone in re.findall(phone_pattern, blind_text):
+        blind_text = blind_text.replace(''.join(phone), '[PHONE REMOVED]')
+    for address in re.findall(r'\b\d+\s+[A-Za-z0-9\s,.-]+\b', blind_text):
+        if len(address.split()) > 3:
+            blind_text = blind_text.replace(address, '[ADDRESS REMOVED]')
+    return blind_text
+
+
+LINE = "Reference: Maria Lopez, maria.lopez{i}@example.com, 555-010-{i:04d}; led the Data Platform team.\n"
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    text = ''.join(LINE.format(i=i % 10000) for i in range(lines))
+
+    for name, func in (('replace', legacy_blind), ('single-pass', create_blind_version)):
+        seconds = min(timeit.repeat(lambda: func(text), number=repeats, repeat=3)) / repeats
+        print(f"{name:12} {seconds * 1000:9.2f} ms per {len(text) // 1024} KB resume")
+
+
+if __name__ == '__main__':
+    main()
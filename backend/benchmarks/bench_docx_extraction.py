@@ -0,0 +1,50 @@
+"""
+Compare DOCX text extraction through python-docx with the streaming extractor.
+
+Usage: python benchmarks/bench_docx_extraction.py [paragraphs] [repeats]
+"""
+import os
+import sys
+import tempfile
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from services.resume_parser import extract_text_from_docx
+
+
+def python_docx_extract(file_path):
+    """Previous implementation: build the full object model and read body paragraphs"""
+    doc = Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def write_resume(path, paragraphs):
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe - jane@example.com"
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Built service {i} in Python and Kubernetes, cutting latency by {i % 50}%")
+    table = doc.add_table(rows=10, cols=3)
+    for i, cell in enumerate(table._cells):
+        cell.text = f"Skill {i}"
+    doc.save(path)
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'resume.docx')
+        write_resume(path, paragraphs)
+
+        for name, func in (('python-docx', python_docx_extract), ('iterparse', extract_text_from_docx)):
+            seconds = min(timeit.repeat(lambda: func(path), number=repeats, repeat=3)) / repeats
+            print(f"{name:12} {seconds * 1000:8.2f} ms/doc  {len(func(path)):7} chars")
+
+
+if __name__ == '__main__':
+    main()
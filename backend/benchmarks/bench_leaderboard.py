@@ -0,0 +1,50 @@
+"""
+Insert candidates one by one into a job description leaderboard and compare
+the cost of placing each arrival with re-sorting the whole board.
+
+Usage: python benchmarks/bench_leaderboard.py [candidates]
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.leaderboard import JDLeaderboard, leaderboard_score
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    random.seed(5)
+    arrivals = [(f'c{i}', random.uniform(0, 100), random.uniform(0, 100)) for i in range(count)]
+
+    board = JDLeaderboard('bench')
+    start = time.perf_counter()
+    for candidate_id, match_score, advanced_score in arrivals:
+        board.add(candidate_id, None, '2024-01-01', match_score, advanced_score)
+    per_insert = (time.perf_counter() - start) / count
+
+    sample = [candidate_id for candidate_id, _, _ in random.sample(arrivals, 1000)]
+    start = time.perf_counter()
+    for candidate_id in sample:
+        board.position(candidate_id)
+    per_position = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    for _ in range(10):
+        board.window(offset=count // 2, limit=50)
+    per_window = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    sorted(arrivals, key=lambda a: (-leaderboard_score(a[1], a[2]), a[0]))
+    full_sort = time.perf_counter() - start
+
+    print(f"candidates:              {count}")
+    print(f"insert per arrival:      {per_insert * 1e6:.1f}us")
+    print(f"rank and percentile:     {per_position * 1e6:.1f}us")
+    print(f"50-entry window:         {per_window * 1e6:.1f}us")
+    print(f"full re-sort:            {full_sort * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
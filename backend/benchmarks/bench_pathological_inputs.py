@@ -0,0 +1,65 @@
+"""
+Time every regex-heavy analyzer on adversarial inputs at two sizes and flag
+anything that grows faster than linearly.
+
+Usage: python benchmarks/bench_pathological_inputs.py [kb]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.advanced_ranking import AdvancedRankingService
+from services.bias_detection import analyze_resume_bias, create_blind_version
+from services.parsed_resume import ParsedResume
+from services.profile_verification import extract_links
+
+_ranking = AdvancedRankingService()
+
+
+def _parse_all(text):
+    resume = ParsedResume(text)
+    return resume.tokens, resume.sections, resume.date_ranges, resume.links, resume.relevant_text()
+
+
+ANALYZERS = {
+    'bias': analyze_resume_bias,
+    'blind': create_blind_version,
+    'ranking': lambda text: _ranking.generate_advanced_ranking(text, text),
+    'links': extract_links,
+    'parse': _parse_all
+}
+
+# Repeated units aimed at the quantifiers in each analyzer's patterns
+ADVERSARIAL_UNITS = [
+    'a', 'A', '1', ' ', '\t', '\n', '-', '.', '@', 'a@', 'a.', 'a-', '1 ', '1 a', '1 a,', 'Aa ', 'Aa\n',
+    'Aa A. ', '(555', '+1 ', 'jan', 'jan 2019 ', 'http://a', 'www.', 'skills:', 'skills: ', 'required ',
+    'must have ', 'led teams ', 'promoted within 1 year ', 'a' * 39 + ' ', '1' + ' a' * 9,
+    'A' + 'a' * 30 + ' ', '1 aaaa,bbbb.cc-dd '
+]
+
+
+def time_call(func, text):
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 100) * 1024
+    worst = []
+    for name, func in ANALYZERS.items():
+        for unit in ADVERSARIAL_UNITS:
+            small = time_call(func, unit * (size // len(unit)))
+            large = time_call(func, unit * (4 * size // len(unit)))
+            worst.append((large, name, unit, small))
+
+    print(f"{'analyzer':8} {'input unit':26} {size // 1024:>6} KB {4 * size // 1024:>6} KB  growth")
+    for large, name, unit, small in sorted(worst, reverse=True)[:15]:
+        growth = large / max(small, 1e-6)
+        flag = '  <-- super-linear' if growth > 8 else ''
+        print(f"{name:8} {unit!r:26} {small * 1000:7.1f}ms {large * 1000:7.1f}ms  x{growth:.1f}{flag}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare the per-analysis keyword and pattern scans the ranking analyses used to
+run with one RankingFeatureExtractor call, and time re-scoring cached features.
+
+Usage: python benchmarks/bench_ranking_features.py [resume_kb] [repeats]
+"""
+import os
+import re
+import sys
+import timeit
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.advanced_ranking import AdvancedRankingService
+
+service = AdvancedRankingService()
+
+
+def legacy_scan(text):
+    """One lowercase copy and substring loop per analysis, uncompiled pattern searches"""
+    hits = 0
+    for keywords in service.culture_keywords.values():
+        resume_lower = text.lower()
+        hits += sum(1 for keyword in keywords if keyword in resume_lower)
+    resume_lower = text.lower()
+    for patterns in service.trajectory_patterns.values():
+        hits += sum(1 for pattern in patterns if re.search(pattern, resume_lower, re.IGNORECASE))
+    resume_lower = text.lower()
+    for skills in service.skill_categories.values():
+        hits += sum(1 for skill in skills if skill in resume_lower)
+    return hits
+
+
+SAMPLE = (
+    "Senior engineer who led teams of eight and mentored staff across three offices. "
+    "Promoted within 2 years; managed projects in Python, SQL and Docker on AWS. "
+    "Known for teamwork, communication and problem solving in data science work.\n"
+)
+
+
+def main():
+    size = (int(sys.argv[1]) if len(sys.argv) > 1 else 20) * 1024
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    text = SAMPLE * (size // len(SAMPLE))
+    features = service.extract_features(text)
+
+    legacy = timeit.timeit(lambda: legacy_scan(text), number=repeats) / repeats
+    single = timeit.timeit(lambda: service.extract_features(text), number=repeats) / repeats
+    rescore = timeit.timeit(lambda: service.generate_advanced_ranking(features), number=repeats) / repeats
+
+    print(f"resume size:        {len(text) // 1024} KB")
+    print(f"per-analysis scans: {legacy * 1000:.2f} ms")
+    print(f"feature extraction: {single * 1000:.2f} ms ({legacy / single:.1f}x)")
+    print(f"re-score features:  {rescore * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Match resumes against a synthetic set of open requisitions in one vectorised
+pass and compare with running the skill gap analysis once per role.
+
+Usage: python benchmarks/bench_role_matching.py [open roles]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import database
+from services.advanced_ranking import advanced_ranking_service
+from services.jd_registry import jd_registry
+from services.role_matching import RoleMatcher
+
+SKILLS = ['python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'node.js',
+          'communication', 'leadership', 'teamwork', 'machine learning', 'data science', 'devops']
+WORDS = 'build scalable services platform customers product design testing analytics team growth'.split()
+
+RESUME = ("Senior engineer with Python, SQL, Docker and Kubernetes in production. Led platform teams, "
+          "mentored engineers and improved communication across product and design. ") * 20
+
+
+def job_description(i):
+    lines = [f"Role {i}: " + ' '.join(random.choices(WORDS, k=40))]
+    for _ in range(random.randint(3, 8)):
+        lines.append(f"Requirements: {' and '.join(random.sample(SKILLS, 2))} experience")
+    lines.append(f"Must have {random.choice(SKILLS)} {random.choice(WORDS)} skills")
+    return '\n'.join(lines)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    random.seed(13)
+    folder = tempfile.mkdtemp()
+    database.DB_PATH = os.path.join(folder, 'candidates.db')
+    database.init_database()
+
+    try:
+        texts = [job_description(i) for i in range(count)]
+        for i, text in enumerate(texts):
+            database.update_job_description(jd_registry.register(text).jd_id, True, f'Role {i}')
+
+        matcher = RoleMatcher()
+        start = time.perf_counter()
+        matcher.open_roles()
+        build = time.perf_counter() - start
+
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            report = matcher.match(RESUME)
+        per_match = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for text in texts:
+            advanced_ranking_service.analyze_skill_gaps(
+                RESUME, advanced_ranking_service._extract_job_requirements(text)
+            )
+        per_role_loop = time.perf_counter() - start
+
+        print(f"open roles:              {report['open_roles']}")
+        print(f"compile open roles:      {build * 1000:.1f}ms (once per change)")
+        print(f"match one resume:        {per_match * 1000:.1f}ms")
+        print(f"gap analysis per role:   {per_role_loop * 1000:.1f}ms")
+        print(f"best fit:                {report['matches'][0]['title']} ({report['matches'][0]['fit_score']})")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Shortlist a synthetic candidate pool for one job description with the offline
+TF-IDF pre-filter: time loading the stored term vectors and scoring the pool.
+
+Usage: python benchmarks/bench_semantic_prefilter.py [candidates]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import database
+from services.semantic_prefilter import (
+    encode_text_vector, load_text_matrix, cosine_similarities, shortlist_candidates, TEXT_VECTOR_VERSION
+)
+
+JOB_DESCRIPTION = """Senior backend engineer. Requirements: Python, Django and PostgreSQL,
+Kubernetes and AWS deployments, mentoring junior engineers."""
+
+WORDS = (
+    'python java javascript react django flask postgresql mysql kubernetes docker aws azure gcp terraform '
+    'led managed built designed shipped mentored engineers team services apis platform data pipelines '
+    'analytics marketing sales customer support finance accounting design research teaching nursing'
+).split()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(9)
+    folder = tempfile.mkdtemp()
+    database.DB_PATH = os.path.join(folder, 'candidates.db')
+    database.init_database()
+
+    conn = database.sqlite3.connect(database.DB_PATH)
+    rows = []
+    for i in range(count):
+        text = ' '.join(random.choices(WORDS, k=random.randint(150, 400)))
+        rows.append((f'c{i}', f'c{i}.pdf', '2024-01-01', text, '{}', encode_text_vector(text), TEXT_VECTOR_VERSION))
+    conn.executemany('''
+    INSERT INTO candidates (id, filename, upload_date, resume_text, analysis_result, text_vector, text_vector_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+    try:
+        start = time.perf_counter()
+        _, matrix = load_text_matrix()
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cosine_similarities(matrix, JOB_DESCRIPTION)
+        score = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = shortlist_candidates(JOB_DESCRIPTION, shortlist_size=20, explain=False)
+        total = time.perf_counter() - start
+
+        print(f"candidates:              {report['total_candidates']}")
+        print(f"stored terms:            {len(matrix[1])}")
+        print(f"load term vectors:       {load:.2f}s")
+        print(f"score pool:              {score * 1000:.1f}ms")
+        print(f"shortlist without LLM:   {total:.2f}s")
+        print(f"LLM calls avoided:       {report['total_candidates'] - report['shortlist_size']}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Search a synthetic candidate pool through the skill index: time the first
+query (which loads the index from the database), warm boolean queries, and a
+query right after new candidates were saved.
+
+Usage: python benchmarks/bench_skill_search.py [candidates]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import database
+from services.skill_index import SkillIndex, candidate_search_fields
+
+SKILLS = [
+    'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'node.js', 'go', 'rust',
+    'php', 'communication', 'leadership', 'teamwork', 'machine learning', 'data science', 'devops',
+    'cybersecurity', 'cloud computing', 'terraform', 'postgresql', 'spark', 'kafka'
+] + [f'skill {i}' for i in range(2000)]
+
+QUERIES = [
+    'kubernetes AND python',
+    'kubernetes AND python AND NOT php',
+    '(go OR rust) AND docker',
+    'machine learning OR data science',
+    'skill 17 AND skill 1200',
+    'NOT java'
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(11)
+    folder = tempfile.mkdtemp()
+    database.DB_PATH = os.path.join(folder, 'candidates.db')
+    database.init_database()
+
+    # Popular skills are drawn far more often than the long tail
+    weights = [50] * 24 + [1] * 2000
+    conn = database.sqlite3.connect(database.DB_PATH)
+    for start in range(0, count, 50000):
+        candidates, postings = [], []
+        for i in range(start, min(start + 50000, count)):
+            skills = set(random.choices(SKILLS, weights, k=random.randint(3, 12)))
+            candidates.append((f'c{i}', f'c{i}.pdf', '2024-01-01', '', '{}',
+                               random.randint(0, 20), random.randint(0, 100)))
+            postings.extend((f'c{i}', skill) for skill in skills)
+        conn.executemany('''
+        INSERT INTO candidates (id, filename, upload_date, resume_text, analysis_result,
+                                years_experience, relevance_score, skills_indexed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+        ''', candidates)
+        conn.executemany('INSERT INTO candidate_skills (candidate_id, skill) VALUES (?, ?)', postings)
+    conn.commit()
+    conn.close()
+
+    try:
+        index = SkillIndex()
+        start = time.perf_counter()
+        index.search('python')
+        load = time.perf_counter() - start
+
+        print(f"candidates:              {count}")
+        print(f"index load:              {load:.2f}s ({index.stats()['skills']} skills)")
+        for query in QUERIES:
+            index.search(query, min_years=5, limit=50)
+            runs = 20
+            start = time.perf_counter()
+            for _ in range(runs):
+                found = index.search(query, min_years=5, limit=50)
+            elapsed = (time.perf_counter() - start) / runs
+            print(f"{query:<40} {elapsed * 1000:7.2f}ms  {found['total_matches']} matches")
+
+        analysis = {'key_skills': ['Kubernetes', 'Python'], 'years_experience': 9, 'relevance_score': 100}
+        skills, years, relevance = candidate_search_fields(analysis)
+        database.save_candidate({
+            'id': 'new', 'filename': 'new.pdf', 'upload_date': '2024-01-02', 'resume_text': '',
+            'analysis_result': analysis, 'skills': skills, 'years_experience': years, 'relevance_score': relevance
+        })
+        start = time.perf_counter()
+        found = index.search('kubernetes AND python', min_years=5)
+        print(f"query after a save:      {(time.perf_counter() - start) * 1000:.2f}ms "
+              f"({found['total_matches']} matches)")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,98 @@
 import re
-from typing import Dict, List, Tuple
+import hashlib
+from collections import namedtuple
+from typing import Dict, List, Tuple, Union
 from datetime import datetime
 import json
 
+from services.parsed_resume import ParsedResume, parse_resume
+
+# Job descriptions are scanned up to this many characters
+MAX_JOB_DESCRIPTION_CHARS = 20000
+
+# Requirement lines in job descriptions. ``[^\n]*`` instead of a lazy ``(.*?)(?:\n|$)``
+# reads each line once without re-testing the terminator at every character
+_REQUIREMENT_PATTERNS = [
+    re.compile(r'(?:requirements?|qualifications?|skills?|experience?)\s*:\s*([^\n]*)', re.IGNORECASE),
+    re.compile(r'(?:must\s+have|required|essential)\s+([^\n]*)', re.IGNORECASE)
+]
+_REQUIREMENT_SEPARATORS = re.compile(r'[•·\-\*\n]')
+
+# Points per matched culture keyword and per matched trajectory pattern; every
+# dimension and component score is capped at 100
+CULTURE_KEYWORD_POINTS = 20
+TRAJECTORY_PATTERN_POINTS = {'rapid_growth': 25, 'steady_progression': 20, 'leadership_potential': 15}
+TRAJECTORY_WEIGHTS = {'rapid_growth': 0.4, 'steady_progression': 0.3, 'leadership_potential': 0.3}
+
+# Weight of each skill category in overall coverage, keyed like skill_analysis
+SKILL_COVERAGE_WEIGHTS = {'technical': 0.5, 'soft_skills': 0.3, 'domain': 0.2}
+
+# Weight of each analysis in the overall advanced score
+SCORE_WEIGHTS = {'culture_fit': 0.3, 'career_trajectory': 0.3, 'skill_coverage': 0.4}
+
+# Lowest overall score of each tier, best first
+RANKING_TIERS = [
+    (80, "Elite Candidate"),
+    (70, "High Potential"),
+    (60, "Strong Candidate"),
+    (50, "Qualified Candidate"),
+    (40, "Potential with Development"),
+    (0, "Needs Significant Development")
+]
+
+# Keyword presence and pattern presence of one resume, in RankingFeatureExtractor.feature_names
+# order, plus which of the requested company values the resume mentions
+RankingFeatures = namedtuple('RankingFeatures', ['vector', 'company_hits'])
+
+
+class RankingFeatureExtractor:
+    """
+    Computes every keyword and pattern the ranking analyses score in one go.
+
+    The resume is lowercased once and each feature is a presence test on that text:
+    keywords keep the analyses' substring semantics (``lead`` is found in
+    ``leadership``) and patterns are compiled once at construction. Presence tests
+    stop at the first hit, which in CPython beats a single combined alternation
+    that has to visit every position.
+    """
+
+    def __init__(self, keywords: List[str], patterns: Dict[str, List[str]]):
+        """
+        Args:
+            keywords: Literal keywords, matched case-insensitively as substrings
+            patterns: Group name -> lowercase regex fragments
+        """
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.patterns = [(group, pattern) for group, group_patterns in patterns.items() for pattern in group_patterns]
+        self.feature_names = (
+            [f'keyword:{keyword}' for keyword in self.keywords] +
+            [f'pattern:{group}:{pattern}' for group, pattern in self.patterns]
+        )
+        self._keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._pattern_groups = {}
+        for i, (group, _) in enumerate(self.patterns):
+            self._pattern_groups.setdefault(group, []).append(len(self.keywords) + i)
+        self._compiled_patterns = [re.compile(pattern) for _, pattern in self.patterns]
+        # Stored vectors are only comparable when extracted with the same feature names
+        self.version = hashlib.sha256('\n'.join(self.feature_names).encode('utf-8')).hexdigest()[:12]
+
+    def extract(self, resume_text: Union[str, ParsedResume], company_values: List[str] = None) -> RankingFeatures:
+        """Feature vector of a resume; ``company_hits`` follows the order of ``company_values``"""
+        resume_lower = parse_resume(resume_text).lower
+        vector = tuple(int(keyword in resume_lower) for keyword in self.keywords) + tuple(
+            int(pattern.search(resume_lower) is not None) for pattern in self._compiled_patterns
+        )
+        company_hits = tuple(int(value.lower() in resume_lower) for value in company_values or ())
+        return RankingFeatures(vector, company_hits)
+
+    def found_keywords(self, features: RankingFeatures, keywords: List[str]) -> List[str]:
+        """The given keywords present in the resume, in the given order"""
+        return [keyword for keyword in keywords if features.vector[self._keyword_index[keyword]]]
+
+    def pattern_hits(self, features: RankingFeatures, group: str) -> int:
+        """Number of patterns of ``group`` that match the resume"""
+        return sum(features.vector[i] for i in self._pattern_groups.get(group, ()))
+
 class AdvancedRankingService:
     def __init__(self):
         # Culture fit indicators
@@ -43,27 +133,43 @@ class AdvancedRankingService:
             'domain_expertise': ['machine learning', 'data science', 'cybersecurity', 'cloud computing', 'devops']
         }
 
-    def analyze_culture_fit(self, resume_text: str, company_values: List[str] = None) -> Dict:
-        """Analyze culture fit based on resume content and company values"""
-        resume_lower = resume_text.lower()
+        self.feature_extractor = RankingFeatureExtractor(
+            [keyword for keywords in self.culture_keywords.values() for keyword in keywords] +
+            [skill for skills in self.skill_categories.values() for skill in skills],
+            self.trajectory_patterns
+        )
+
+    def extract_features(self, resume_text: Union[str, ParsedResume], company_values: List[str] = None) -> RankingFeatures:
+        """Scan a resume once for everything the culture, trajectory and skill analyses score"""
+        return self.feature_extractor.extract(resume_text, company_values)
+
+    def _features(self, resume, company_values: List[str] = None) -> RankingFeatures:
+        if isinstance(resume, RankingFeatures):
+            return resume
+        return self.extract_features(resume, company_values)
+
+    def analyze_culture_fit(self, resume_text: Union[str, ParsedResume, RankingFeatures],
+                            company_values: List[str] = None) -> Dict:
+        """
+        Analyze culture fit based on resume content and company values.
+
+        Precomputed features must have been extracted with the same ``company_values``.
+        """
+        features = self._features(resume_text, company_values)
 
         culture_scores = {}
         total_indicators = 0
 
         # Analyze predefined culture dimensions
         for dimension, keywords in self.culture_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in resume_lower)
-            culture_scores[dimension] = min(100, matches * 20)  # Scale to 0-100
+            matches = len(self.feature_extractor.found_keywords(features, keywords))
+            culture_scores[dimension] = min(100, matches * CULTURE_KEYWORD_POINTS)  # Scale to 0-100
             total_indicators += matches
 
         # Company-specific values analysis
         company_fit_score = 0
         if company_values:
-            company_matches = 0
-            for value in company_values:
-                if value.lower() in resume_lower:
-                    company_matches += 1
-            company_fit_score = (company_matches / len(company_values)) * 100 if company_values else 0
+            company_fit_score = (sum(features.company_hits) / len(company_values)) * 100
 
         overall_culture_score = sum(culture_scores.values()) / len(culture_scores)
 
@@ -75,41 +181,29 @@ class AdvancedRankingService:
             'recommendations': self._generate_culture_recommendations(culture_scores)
         }
 
-    def predict_career_trajectory(self, resume_text: str, current_experience: int = 0) -> Dict:
+    def predict_career_trajectory(self, resume_text: Union[str, ParsedResume, RankingFeatures],
+                                  current_experience: int = 0) -> Dict:
         """Predict career trajectory and growth potential"""
-        resume_lower = resume_text.lower()
+        features = self._features(resume_text)
 
         trajectory_scores = {}
 
-        # Analyze rapid growth indicators
-        rapid_growth_matches = 0
-        for pattern in self.trajectory_patterns['rapid_growth']:
-            if re.search(pattern, resume_lower, re.IGNORECASE):
-                rapid_growth_matches += 1
-
-        # Analyze steady progression
-        steady_progression_matches = 0
-        for pattern in self.trajectory_patterns['steady_progression']:
-            if re.search(pattern, resume_lower, re.IGNORECASE):
-                steady_progression_matches += 1
-
-        # Analyze leadership potential
-        leadership_matches = 0
-        for pattern in self.trajectory_patterns['leadership_potential']:
-            if re.search(pattern, resume_lower, re.IGNORECASE):
-                leadership_matches += 1
+        # Count matching growth, progression and leadership patterns
+        rapid_growth_matches = self.feature_extractor.pattern_hits(features, 'rapid_growth')
+        steady_progression_matches = self.feature_extractor.pattern_hits(features, 'steady_progression')
+        leadership_matches = self.feature_extractor.pattern_hits(features, 'leadership_potential')
 
         # Calculate trajectory scores
-        trajectory_scores['rapid_growth'] = min(100, rapid_growth_matches * 25)
-        trajectory_scores['steady_progression'] = min(100, steady_progression_matches * 20)
-        trajectory_scores['leadership_potential'] = min(100, leadership_matches * 15)
+        trajectory_scores['rapid_growth'] = min(100, rapid_growth_matches * TRAJECTORY_PATTERN_POINTS['rapid_growth'])
+        trajectory_scores['steady_progression'] = min(
+            100, steady_progression_matches * TRAJECTORY_PATTERN_POINTS['steady_progression']
+        )
+        trajectory_scores['leadership_potential'] = min(
+            100, leadership_matches * TRAJECTORY_PATTERN_POINTS['leadership_potential']
+        )
 
         # Overall trajectory score
-        overall_trajectory = (
-            trajectory_scores['rapid_growth'] * 0.4 +
-            trajectory_scores['steady_progression'] * 0.3 +
-            trajectory_scores['leadership_potential'] * 0.3
-        )
+        overall_trajectory = sum(trajectory_scores[component] * weight for component, weight in TRAJECTORY_WEIGHTS.items())
 
         # Predict senior role potential
         senior_potential = self._calculate_senior_potential(current_experience, trajectory_scores)
@@ -122,29 +216,16 @@ class AdvancedRankingService:
             'recommendations': self._generate_trajectory_recommendations(trajectory_scores)
         }
 
-    def analyze_skill_gaps(self, resume_text: str, job_requirements: List[str] = None) -> Dict:
+    def analyze_skill_gaps(self, resume_text: Union[str, ParsedResume, RankingFeatures],
+                           job_requirements: List[str] = None) -> Dict:
         """Analyze skill gaps between resume and job requirements"""
-        resume_lower = resume_text.lower()
+        features = self._features(resume_text)
 
         skill_analysis = {}
 
-        # Analyze technical skills
-        technical_skills = []
-        for skill in self.skill_categories['technical']:
-            if skill in resume_lower:
-                technical_skills.append(skill)
-
-        # Analyze soft skills
-        soft_skills = []
-        for skill in self.skill_categories['soft_skills']:
-            if skill in resume_lower:
-                soft_skills.append(skill)
-
-        # Analyze domain expertise
-        domain_skills = []
-        for skill in self.skill_categories['domain_expertise']:
-            if skill in resume_lower:
-                domain_skills.append(skill)
+        technical_skills = self.feature_extractor.found_keywords(features, self.skill_categories['technical'])
+        soft_skills = self.feature_extractor.found_keywords(features, self.skill_categories['soft_skills'])
+        domain_skills = self.feature_extractor.found_keywords(features, self.skill_categories['domain_expertise'])
 
         skill_analysis['technical'] = {
             'found': technical_skills,
@@ -170,10 +251,8 @@ class AdvancedRankingService:
                 if not found and len(requirement.split()) > 1:  # Only check meaningful requirements
                     job_gaps.append(requirement)
 
-        overall_skill_coverage = (
-            skill_analysis['technical']['coverage'] * 0.5 +
-            skill_analysis['soft_skills']['coverage'] * 0.3 +
-            skill_analysis['domain']['coverage'] * 0.2
+        overall_skill_coverage = sum(
+            skill_analysis[category]['coverage'] * weight for category, weight in SKILL_COVERAGE_WEIGHTS.items()
         )
 
         return {
@@ -184,25 +263,36 @@ class AdvancedRankingService:
             'recommendations': self._generate_skill_recommendations(skill_analysis, job_gaps)
         }
 
-    def generate_advanced_ranking(self, resume_text: str, job_description: str = None,
-                                company_values: List[str] = None, current_experience: int = 0) -> Dict:
-        """Generate comprehensive advanced ranking analysis"""
+    def generate_advanced_ranking(self, resume_text: Union[str, ParsedResume, RankingFeatures],
+                                  job_description=None, company_values: List[str] = None,
+                                  current_experience: int = 0) -> Dict:
+        """
+        Generate comprehensive advanced ranking analysis.
+
+        The resume is scanned once; pass previously extracted features (with the same
+        ``company_values``) to re-score without rescanning. ``job_description`` is its
+        text or a ParsedJobDescription from the JD registry, whose requirements were
+        extracted when it was registered.
+        """
+        features = self._features(resume_text, company_values)
 
         # Extract job requirements from job description
         job_requirements = []
-        if job_description:
+        if isinstance(job_description, str):
             job_requirements = self._extract_job_requirements(job_description)
+        elif job_description is not None:
+            job_requirements = list(job_description.requirements)
 
         # Perform all analyses
-        culture_fit = self.analyze_culture_fit(resume_text, company_values)
-        career_trajectory = self.predict_career_trajectory(resume_text, current_experience)
-        skill_gaps = self.analyze_skill_gaps(resume_text, job_requirements)
+        culture_fit = self.analyze_culture_fit(features, company_values)
+        career_trajectory = self.predict_career_trajectory(features, current_experience)
+        skill_gaps = self.analyze_skill_gaps(features, job_requirements)
 
         # Calculate overall advanced ranking score
         overall_score = (
-            culture_fit['overall_score'] * 0.3 +
-            career_trajectory['overall_trajectory_score'] * 0.3 +
-            skill_gaps['overall_skill_coverage'] * 0.4
+            culture_fit['overall_score'] * SCORE_WEIGHTS['culture_fit'] +
+            career_trajectory['overall_trajectory_score'] * SCORE_WEIGHTS['career_trajectory'] +
+            skill_gaps['overall_skill_coverage'] * SCORE_WEIGHTS['skill_coverage']
         )
 
         # Generate ranking tier
@@ -222,24 +312,20 @@ class AdvancedRankingService:
     def _extract_job_requirements(self, job_description: str) -> List[str]:
         """Extract key requirements from job description"""
         requirements = []
+        job_description = job_description[:MAX_JOB_DESCRIPTION_CHARS]
 
         # Look for common requirement patterns
-        patterns = [
-            r'(?:requirements?|qualifications?|skills?|experience?)\s*:\s*(.*?)(?:\n|$)',
-            r'(?:must\s+have|required|essential)\s+(.*?)(?:\n|$)'
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, job_description, re.IGNORECASE | re.MULTILINE)
+        for pattern in _REQUIREMENT_PATTERNS:
+            matches = pattern.findall(job_description)
             for match in matches:
                 # Split by common delimiters and clean up
-                items = re.split(r'[•·\-\*\n]', match)
+                items = _REQUIREMENT_SEPARATORS.split(match)
                 for item in items:
                     item = item.strip()
                     if len(item) > 10 and not any(word in item.lower() for word in ['and', 'or', 'the', 'with']):
                         requirements.append(item)
 
-        return list(set(requirements))  # Remove duplicates
+        return list(dict.fromkeys(requirements))  # Remove duplicates, keeping document order
 
     def _calculate_senior_potential(self, experience: int, trajectory_scores: Dict) -> float:
         """Calculate potential for senior roles"""
@@ -269,18 +355,10 @@ class AdvancedRankingService:
     def _calculate_ranking_tier(self, overall_score: float, culture_fit: Dict,
                               career_trajectory: Dict, skill_gaps: Dict) -> str:
         """Calculate ranking tier based on all factors"""
-        if overall_score >= 80:
-            return "Elite Candidate"
-        elif overall_score >= 70:
-            return "High Potential"
-        elif overall_score >= 60:
-            return "Strong Candidate"
-        elif overall_score >= 50:
-            return "Qualified Candidate"
-        elif overall_score >= 40:
-            return "Potential with Development"
-        else:
-            return "Needs Significant Development"
+        for threshold, tier in RANKING_TIERS:
+            if overall_score >= threshold:
+                return tier
+        return RANKING_TIERS[-1][1]
 
     def _identify_key_strengths(self, culture_fit: Dict, career_trajectory: Dict, skill_gaps: Dict) -> List[str]:
         """Identify key strengths across all analysis areas"""
@@ -357,7 +435,9 @@ class AdvancedRankingService:
 
         for category, analysis in skill_analysis.items():
             if analysis['coverage'] < 60:
-                missing_count = len(self.skill_categories[category]) - len(analysis['found'])
+                # skill_analysis reports domain expertise under the shorter 'domain' key
+                skills = self.skill_categories['domain_expertise' if category == 'domain' else category]
+                missing_count = len(skills) - len(analysis['found'])
                 recommendations.append(f"Develop {missing_count} additional {category} skills")
 
         if job_gaps:
@@ -382,8 +462,12 @@ class AdvancedRankingService:
 
         return unique_recommendations
 
-def analyze_advanced_ranking(resume_text: str, job_description: str = None,
+# Shared service so the feature scans are compiled once per process
+advanced_ranking_service = AdvancedRankingService()
+
+def analyze_advanced_ranking(resume_text: Union[str, ParsedResume, RankingFeatures], job_description: str = None,
                            company_values: List[str] = None, current_experience: int = 0) -> Dict:
     """Main function to perform advanced ranking analysis"""
-    service = AdvancedRankingService()
-    return service.generate_advanced_ranking(resume_text, job_description, company_values, current_experience)
+    return advanced_ranking_service.generate_advanced_ranking(
+        resume_text, job_description, company_values, current_experience
+    )
@@ -0,0 +1,178 @@
+import os
+import threading
+import uuid
+import zipfile
+import logging
+from datetime import datetime
+from werkzeug.utils import secure_filename
+
+from services.job_queue import batch_job_queue
+from services.file_store import save_stream, FileTooLarge
+
+logger = logging.getLogger(__name__)
+
+class BatchTooLarge(Exception):
+    """Raised when an upload batch exceeds the configured file or size limits"""
+
+
+def _file_extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def iter_zip_resumes(archive_stream, upload_folder, allowed_extensions, max_files, max_member_bytes):
+    """
+    Stream the resume members of a ZIP archive to disk one at a time.
+
+    Only the central directory is held in memory; each member is decompressed
+    straight into its own file under ``upload_folder``.
+
+    Yields:
+        dict: Batch item with filename, candidate_id and file_path, or an error
+    """
+    with zipfile.ZipFile(archive_stream) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        if len(members) > max_files:
+            raise BatchTooLarge(f"Archive contains {len(members)} files, limit is {max_files}")
+
+        for info in members:
+            filename = secure_filename(os.path.basename(info.filename))
+            extension = _file_extension(filename)
+            if not filename or extension not in allowed_extensions:
+                yield {'filename': filename, 'status': 'skipped', 'error': 'Invalid file type'}
+                continue
+            if info.file_size > max_member_bytes:
+                yield {'filename': filename, 'status': 'skipped', 'error': 'File too large'}
+                continue
+
+            file_id = str(uuid.uuid4())
+            file_path = os.path.join(upload_folder, f"{file_id}.{extension}")
+            try:
+                with archive.open(info) as member:
+                    _, content_hash = save_stream(member, file_path, max_member_bytes)
+            except (FileTooLarge, zipfile.BadZipFile, OSError) as e:
+                yield {'filename': filename, 'status': 'skipped', 'error': str(e)}
+                continue
+
+            yield {
+                'filename': filename,
+                'candidate_id': file_id,
+                'file_path': file_path,
+                'content_hash': content_hash
+            }
+
+
+def discard_batch_items(items):
+    """Delete the files of batch items saved before the batch was rejected"""
+    for item in items:
+        file_path = item.get('file_path')
+        if file_path:
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                logger.warning(f"Failed to remove batch file {file_path}: {str(e)}")
+
+
+class BatchRegistry:
+    """Tracks upload batches and feeds their files through the batch job queue"""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def create_batch(self, items, process_func, job_description=None):
+        """
+        Register saved files as a batch and start dispatching them to the job queue.
+
+        Args:
+            items (list): Batch items from ``iter_zip_resumes`` or saved multipart files
+            process_func (callable): Pipeline function, called as
+                ``process_func(file_path, filename, candidate_id, job_description,
+                content_hash=..., on_progress=...)``
+            job_description (str): Optional job description shared by every file
+
+        Returns:
+            str: Batch id
+        """
+        batch_id = str(uuid.uuid4())
+        batch_items = []
+        for item in items:
+            entry = {
+                'filename': item['filename'],
+                'candidate_id': item.get('candidate_id'),
+                'job_id': None,
+                'status': item.get('status', 'pending'),
+                'error': item.get('error')
+            }
+            batch_items.append((entry, item.get('file_path'), item.get('content_hash')))
+
+        with self._lock:
+            self._batches[batch_id] = {
+                'id': batch_id,
+                'created_at': datetime.now().isoformat(),
+                'items': [entry for entry, _, _ in batch_items]
+            }
+
+        dispatcher = threading.Thread(
+            target=self._dispatch,
+            args=(batch_items, process_func, job_description),
+            name=f'batch-{batch_id[:8]}',
+            daemon=True
+        )
+        dispatcher.start()
+        return batch_id
+
+    def _dispatch(self, batch_items, process_func, job_description):
+        """Submit pending files, waiting for queue capacity so concurrency stays bounded"""
+        for entry, file_path, content_hash in batch_items:
+            if entry['status'] != 'pending':
+                continue
+            try:
+                job_id = self.queue.submit(
+                    process_func, file_path, entry['filename'], entry['candidate_id'],
+                    job_description, content_hash=content_hash, block=True
+                )
+                with self._lock:
+                    entry['job_id'] = job_id
+                    entry['status'] = 'queued'
+            except Exception as e:
+                logger.error(f"Failed to queue batch file {entry['filename']}: {str(e)}")
+                with self._lock:
+                    entry['status'] = 'failed'
+                    entry['error'] = str(e)
+
+    def get_batch(self, batch_id):
+        """Return the batch with per-file status and results, or None if unknown"""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            items = [dict(entry) for entry in batch['items']]
+            created_at = batch['created_at']
+
+        summary = {}
+        for item in items:
+            if item['job_id']:
+                job = self.queue.get_job(item['job_id'])
+                if job:
+                    item['status'] = job['status']
+                    item['current_stage'] = job['current_stage']
+                    item['result'] = job['result']
+                    item['error'] = job['error']
+                else:
+                    item['status'] = 'expired'
+            summary[item['status']] = summary.get(item['status'], 0) + 1
+
+        finished = sum(summary.get(status, 0) for status in ('completed', 'failed', 'skipped', 'expired'))
+        return {
+            'id': batch_id,
+            'created_at': created_at,
+            'total_files': len(items),
+            'finished': finished == len(items),
+            'summary': summary,
+            'files': items
+        }
+
+
+# Global instance shared by the batch upload endpoints
+batch_registry = BatchRegistry(batch_job_queue)
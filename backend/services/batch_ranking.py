@@ -0,0 +1,345 @@
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from services.advanced_ranking import (
+    advanced_ranking_service,
+    AdvancedRankingService,
+    RankingFeatures,
+    CULTURE_KEYWORD_POINTS,
+    TRAJECTORY_PATTERN_POINTS,
+    TRAJECTORY_WEIGHTS,
+    SKILL_COVERAGE_WEIGHTS,
+    SCORE_WEIGHTS,
+    RANKING_TIERS
+)
+from services.database import get_ranking_vectors, save_ranking_vectors, get_resume_texts
+from services.jd_registry import jd_registry
+
+# Bump whenever component scoring changes so stored component scores are recomputed
+RANKING_SCORE_VERSION = '1'
+
+# Leaderboard entries returned when the caller does not ask for a limit
+DEFAULT_LEADERBOARD_SIZE = 100
+
+# skill_analysis keys of AdvancedRankingService.skill_categories
+_SKILL_CATEGORY_KEYS = {'technical': 'technical', 'soft_skills': 'soft_skills', 'domain': 'domain_expertise'}
+
+# Group of component scores each top-level score weight applies to
+WEIGHT_GROUPS = {'culture_fit': 'culture', 'career_trajectory': 'trajectory', 'skill_coverage': 'skills'}
+
+_TIER_THRESHOLDS = np.array([threshold for threshold, _ in reversed(RANKING_TIERS)], dtype=float)
+_TIER_NAMES = [tier for _, tier in reversed(RANKING_TIERS)]
+
+
+def encode_features(features: RankingFeatures) -> str:
+    """Compact '0'/'1' string of a feature vector, as stored in the database"""
+    return ''.join('1' if flag else '0' for flag in features.vector)
+
+
+def decode_feature_matrix(encoded: List[str], width: int) -> np.ndarray:
+    """(candidates, width) 0/1 matrix from stored feature strings of equal width"""
+    if not encoded:
+        return np.zeros((0, width), dtype=np.float64)
+    raw = np.frombuffer(''.join(encoded).encode('ascii'), dtype=np.uint8)
+    return (raw.reshape(len(encoded), width) - ord('0')).astype(np.float64)
+
+
+def encode_components(components: np.ndarray) -> bytes:
+    """Packed little-endian float64 component scores of one candidate, as stored in the database"""
+    return np.asarray(components, dtype='<f8').tobytes()
+
+
+def decode_component_matrix(encoded: List[bytes], width: int) -> np.ndarray:
+    """(candidates, width) component score matrix from stored packed scores"""
+    if not encoded:
+        return np.zeros((0, width), dtype=np.float64)
+    return np.frombuffer(b''.join(encoded), dtype='<f8').reshape(len(encoded), width)
+
+
+class BatchRankingEngine:
+    """
+    Scores candidates with the AdvancedRankingService formulas, in two steps.
+
+    Component scores (each culture dimension, trajectory component and skill
+    category) are capped counts of feature flags, so they are one matrix product
+    with a 0/1 membership matrix built from the service's keywords, skills and
+    patterns. They do not depend on any weight and are stored per candidate.
+    Group and overall scores are weighted averages of the components, so
+    re-weighting a pool only needs the stored component matrix.
+    """
+
+    def __init__(self, service: AdvancedRankingService = advanced_ranking_service):
+        self.service = service
+        extractor = service.feature_extractor
+        width = len(extractor.feature_names)
+        feature_index = {name: i for i, name in enumerate(extractor.feature_names)}
+
+        culture_dimensions = list(service.culture_keywords)
+        trajectory_components = list(TRAJECTORY_WEIGHTS)
+        skill_categories = list(SKILL_COVERAGE_WEIGHTS)
+        skills = [service.skill_categories[_SKILL_CATEGORY_KEYS[category]] for category in skill_categories]
+
+        groups = [
+            [[f'keyword:{keyword}' for keyword in service.culture_keywords[d]] for d in culture_dimensions],
+            [[f'pattern:{c}:{pattern}' for pattern in service.trajectory_patterns[c]] for c in trajectory_components],
+            [[f'keyword:{skill}' for skill in category] for category in skills]
+        ]
+        columns = [names for group in groups for names in group]
+        self._membership = np.zeros((width, len(columns)))
+        for j, names in enumerate(columns):
+            for name in names:
+                self._membership[feature_index[name], j] = 1
+
+        # Component score = min(100, hits / divisor * points): culture and trajectory
+        # components score points per hit, skill coverage is the percentage of the category found
+        self._divisors = np.array(
+            [1] * (len(culture_dimensions) + len(trajectory_components)) + [len(category) for category in skills],
+            dtype=float
+        )
+        self._points = np.array(
+            [CULTURE_KEYWORD_POINTS] * len(culture_dimensions) +
+            [TRAJECTORY_PATTERN_POINTS[c] for c in trajectory_components] +
+            [100] * len(skills),
+            dtype=float
+        )
+
+        self.component_names = (
+            [f'culture:{d}' for d in culture_dimensions] +
+            [f'trajectory:{c}' for c in trajectory_components] +
+            [f'skills:{c}' for c in skill_categories]
+        )
+        self.default_weights = {
+            **SCORE_WEIGHTS,
+            'culture': {d: 1 for d in culture_dimensions},
+            'trajectory': dict(TRAJECTORY_WEIGHTS),
+            'skills': dict(SKILL_COVERAGE_WEIGHTS)
+        }
+        self._group_slices = {}
+        offset = 0
+        for group, size in (('culture', len(culture_dimensions)), ('trajectory', len(trajectory_components)),
+                            ('skills', len(skill_categories))):
+            self._group_slices[group] = slice(offset, offset + size)
+            offset += size
+
+        self._skill_features = {skill: feature_index[f'keyword:{skill}'] for category in skills for skill in category}
+        self.width = width
+        self.version = f"{extractor.version}.{RANKING_SCORE_VERSION}"
+
+    def component_matrix(self, features: np.ndarray) -> np.ndarray:
+        """(candidates, len(component_names)) component scores of a 0/1 feature matrix"""
+        return np.minimum(100, (features @ self._membership) / self._divisors * self._points)
+
+    def encode_candidate(self, features: RankingFeatures):
+        """Stored (features, components) encodings of one candidate's extracted features"""
+        encoded = encode_features(features)
+        components = self.component_matrix(decode_feature_matrix([encoded], self.width))[0]
+        return encoded, encode_components(components)
+
+    def resolve_weights(self, weights: Dict = None) -> Dict:
+        """
+        Merge custom weights over the defaults.
+
+        Top-level keys weight culture_fit, career_trajectory and skill_coverage; the
+        nested ``culture``, ``trajectory`` and ``skills`` dicts weight the components
+        within each score. Omitted keys keep their default weight and every set of
+        weights is normalised to sum to 1 when scoring.
+
+        Raises:
+            ValueError: On unknown keys, negative or non-numeric weights, or a set of
+                weights that sums to zero
+        """
+        resolved = {
+            key: dict(value) if isinstance(value, dict) else value for key, value in self.default_weights.items()
+        }
+        for key, value in (weights or {}).items():
+            if key in WEIGHT_GROUPS:
+                resolved[key] = _check_weight(key, value)
+            elif key in self._group_slices:
+                if not isinstance(value, dict):
+                    raise ValueError(f"Weights for {key} must be an object")
+                for name, weight in value.items():
+                    if name not in resolved[key]:
+                        raise ValueError(f"Unknown {key} weight: {name}")
+                    resolved[key][name] = _check_weight(f"{key}.{name}", weight)
+            else:
+                raise ValueError(f"Unknown weight: {key}")
+
+        for group in self._group_slices:
+            if sum(resolved[group].values()) == 0:
+                raise ValueError(f"Weights for {group} must not all be zero")
+        if sum(resolved[score] for score in WEIGHT_GROUPS) == 0:
+            raise ValueError("Score weights must not all be zero")
+        return resolved
+
+    def score_components(self, components: np.ndarray, weights: Dict = None) -> Dict[str, np.ndarray]:
+        """
+        Weighted group and overall scores of a component matrix.
+
+        Args:
+            components: (candidates, len(component_names)) component scores
+            weights: Weights as returned by ``resolve_weights``; defaults when omitted
+
+        Returns:
+            dict: culture_fit, career_trajectory, skill_coverage and overall score columns
+        """
+        weights = weights or self.default_weights
+        scores = {}
+        for score, group in WEIGHT_GROUPS.items():
+            group_weights = np.array(list(weights[group].values()), dtype=float)
+            scores[score] = components[:, self._group_slices[group]] @ group_weights / group_weights.sum()
+
+        score_weights = np.array([weights[score] for score in WEIGHT_GROUPS], dtype=float)
+        scores['overall'] = np.column_stack([scores[score] for score in WEIGHT_GROUPS]) @ score_weights / score_weights.sum()
+        return scores
+
+    def score_matrix(self, features: np.ndarray, weights: Dict = None) -> Dict[str, np.ndarray]:
+        """Weighted scores of a 0/1 feature matrix"""
+        return self.score_components(self.component_matrix(features), weights)
+
+    def job_gap_counts(self, features: np.ndarray, job_description) -> np.ndarray:
+        """
+        Number of job requirements each candidate shows no skill for, as in
+        ``AdvancedRankingService.analyze_skill_gaps``.
+
+        Args:
+            features: (candidates, width) 0/1 feature matrix
+            job_description: Job description text or ParsedJobDescription
+        """
+        parsed = jd_registry.register(job_description)
+        if parsed is None or not parsed.requirement_skills or not len(features):
+            return np.zeros(len(features), dtype=int)
+
+        # (width, requirements) flags of skills mentioned by each requirement
+        mentions = np.zeros((self.width, len(parsed.requirement_skills)))
+        for j, (_, skills) in enumerate(parsed.requirement_skills):
+            for skill in skills:
+                mentions[self._skill_features[skill], j] = 1
+        return ((features @ mentions) == 0).sum(axis=1)
+
+    @staticmethod
+    def tiers(scores: np.ndarray) -> List[str]:
+        """Ranking tier of each overall score"""
+        return [_TIER_NAMES[i] for i in np.searchsorted(_TIER_THRESHOLDS, scores, side='right') - 1]
+
+    @staticmethod
+    def order(overall: np.ndarray, limit: int = None) -> np.ndarray:
+        """Row indices by overall score, best first and ties in row order, at most ``limit``"""
+        if limit is not None and limit < len(overall):
+            top = np.argpartition(-overall, limit)[:limit]
+            return top[np.lexsort((top, -overall[top]))]
+        return np.lexsort((np.arange(len(overall)), -overall))
+
+    def rank(self, features: np.ndarray, job_description=None, limit: int = None,
+             weights: Dict = None) -> Dict:
+        """
+        Score and order a feature matrix.
+
+        Returns:
+            dict: ``order`` (row indices, best first, at most ``limit``), the score
+            columns and per-row job gap counts
+        """
+        scores = self.score_matrix(features, weights)
+        scores['job_gaps'] = self.job_gap_counts(features, job_description)
+        scores['order'] = self.order(scores['overall'], limit)
+        return scores
+
+
+def _check_weight(name, value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value) or value < 0:
+        raise ValueError(f"Weight {name} must be a non-negative number")
+    return value
+
+
+batch_ranking_engine = BatchRankingEngine()
+
+
+def load_ranking_matrices(candidate_ids: List[str] = None):
+    """
+    Stored feature vectors and component scores of the given candidates, or of every candidate.
+
+    Candidates stored without them, or under another ranking version, are
+    recomputed from the resume text and written back.
+
+    Returns:
+        tuple: (rows, features, components) with rows of (candidate id, filename)
+    """
+    extractor = advanced_ranking_service.feature_extractor
+    engine = batch_ranking_engine
+    rows = get_ranking_vectors(candidate_ids)
+
+    stale = [row[0] for row in rows if row[2] != engine.version or row[3] is None or row[4] is None]
+    refreshed = {}
+    if stale:
+        texts = get_resume_texts(stale)
+        encoded = [encode_features(extractor.extract(texts.get(candidate_id) or '')) for candidate_id in stale]
+        components = engine.component_matrix(decode_feature_matrix(encoded, engine.width))
+        refreshed = {
+            candidate_id: (features, encode_components(row))
+            for candidate_id, features, row in zip(stale, encoded, components)
+        }
+        save_ranking_vectors([
+            (candidate_id, features, packed, engine.version) for candidate_id, (features, packed) in refreshed.items()
+        ])
+
+    stored = [refreshed.get(row[0], (row[3], row[4])) for row in rows]
+    features = decode_feature_matrix([features for features, _ in stored], engine.width)
+    components = decode_component_matrix([packed for _, packed in stored], len(engine.component_names))
+    return [(candidate_id, filename) for candidate_id, filename, *_ in rows], features, components
+
+
+def rank_candidates(job_description=None, candidate_ids: List[str] = None,
+                    limit: int = DEFAULT_LEADERBOARD_SIZE, weights: Dict = None) -> Dict:
+    """
+    Leaderboard of stored candidates for one job description.
+
+    Scores come from the stored component scores, so custom weights re-rank the
+    pool without re-running any analysis.
+
+    Args:
+        job_description: Job description text or ParsedJobDescription whose
+            requirements are checked for gaps
+        candidate_ids (list): Candidates to rank, or None for every stored candidate
+        limit (int): Leaderboard entries to return, or None for all
+        weights (dict): Custom weights, see ``BatchRankingEngine.resolve_weights``
+
+    Returns:
+        dict: Candidates ranked by overall advanced score, best first
+
+    Raises:
+        ValueError: If ``weights`` is invalid
+    """
+    engine = batch_ranking_engine
+    weights = engine.resolve_weights(weights)
+    job_description = jd_registry.register(job_description)
+    rows, features, components = load_ranking_matrices(candidate_ids)
+
+    ranked = engine.score_components(components, weights)
+    order = engine.order(ranked['overall'], limit)
+    job_gaps = engine.job_gap_counts(features[order], job_description)
+    tiers = engine.tiers(ranked['overall'][order])
+
+    leaderboard = []
+    for position, (i, tier, gaps) in enumerate(zip(order, tiers, job_gaps), start=1):
+        candidate_id, filename = rows[i]
+        leaderboard.append({
+            'rank': position,
+            'candidate_id': candidate_id,
+            'filename': filename,
+            'overall_advanced_score': float(ranked['overall'][i]),
+            'ranking_tier': tier,
+            'culture_fit_score': float(ranked['culture_fit'][i]),
+            'career_trajectory_score': float(ranked['career_trajectory'][i]),
+            'skill_coverage': float(ranked['skill_coverage'][i]),
+            'job_specific_gaps': int(gaps)
+        })
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'ranking_version': engine.version,
+        'jd_id': job_description.jd_id if job_description else None,
+        'weights': weights,
+        'total_candidates': len(rows),
+        'leaderboard': leaderboard
+    }
@@ -1,47 +1,185 @@
+import os
 import re
-from typing import Dict, List, Tuple
-
-class BiasDetector:
-    def __init__(self):
-        # Gender-related terms
-        self.gender_terms = {
-            'male': ['he', 'him', 'his', 'man', 'men', 'boy', 'boys', 'male', 'masculine', 'gentleman', 'mr', 'sir'],
-            'female': ['she', 'her', 'hers', 'woman', 'women', 'girl', 'girls', 'female', 'feminine', 'lady', 'ms', 'mrs', 'miss'],
-            'neutral': ['they', 'them', 'their', 'person', 'people', 'individual', 'candidate', 'applicant']
-        }
-
-        # Age-related patterns
-        self.age_patterns = [
-            r'\b\d{1,2}\s*(?:years?|yrs?|yo)\b',
-            r'\b(?:young|old|senior|junior|experienced|inexperienced)\b',
-            r'\b(?:fresh|recent|new)\s*(?:graduate|grad)\b',
-            r'\b(?:mid|late|early)\s*\d{1,2}s\b'
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Tuple, Union
+
+from services.parsed_resume import ParsedResume, parse_resume
+
+# Bump whenever scoring or redaction output changes so cached analyses are recomputed
+BIAS_ANALYZER_VERSION = '3'
+
+# Optional JSON file overriding categories of DEFAULT_LEXICONS, in the same category -> {terms, patterns} shape
+BIAS_LEXICON_PATH = os.getenv('BIAS_LEXICON_PATH')
+
+logger = logging.getLogger(__name__)
+
+# Overall bias score above which screening uses the blind resume
+BLIND_SCREENING_THRESHOLD = 30
+
+# Each category score is capped at MAX_CATEGORY_SCORE; age, location and education
+# scores are their indicator count times a weight, gender scores scale the imbalance
+MAX_CATEGORY_SCORE = 50
+GENDER_IMBALANCE_WEIGHT = 10
+INDICATOR_WEIGHTS = {
+    'age_indicators': 5,
+    'location_indicators': 3,
+    'education_indicators': 4
+}
+
+# Indicator counts stored with every bias analysis, in report matrix column order
+INDICATOR_COUNTS = [
+    ('gender_bias', 'male_terms'),
+    ('gender_bias', 'female_terms'),
+    ('gender_bias', 'neutral_terms'),
+    ('age_bias', 'age_indicators'),
+    ('location_bias', 'location_indicators'),
+    ('education_bias', 'education_indicators')
+]
+
+class LexiconMatcher:
+    """
+    Finds every lexicon hit in a single pass over the text.
+
+    All categories are compiled into one alternation with a named group per category,
+    so the regex engine walks the text once instead of once per term or pattern.
+    Hits respect word boundaries. Matching runs on the resume's lowercased text
+    without ``re.IGNORECASE``, which lets the engine skip impossible start positions;
+    spans therefore index ``ParsedResume.lower``.
+    """
+
+    def __init__(self, lexicons: Dict[str, Dict[str, List[str]]]):
+        """
+        Args:
+            lexicons: Category -> {'terms': literal terms, 'patterns': lowercase regex
+                fragments}; category names must be valid regex group names
+        """
+        self.categories = list(lexicons)
+        branches = []
+        for category, lexicon in lexicons.items():
+            # Longest terms first so multi-word terms win over their prefixes
+            terms = sorted((term.lower() for term in lexicon.get('terms', [])), key=len, reverse=True)
+            alternatives = [r'\s+'.join(map(re.escape, term.split())) for term in terms]
+            alternatives.extend(lexicon.get('patterns', []))
+            branches.append(f"(?P<{category}>{'|'.join(alternatives)})")
+        # A lookbehind instead of a leading \b keeps the first-character scan fast
+        self.pattern = re.compile(r'(?<!\w)(?:' + '|'.join(branches) + r')\b')
+
+    def scan(self, text: Union[str, ParsedResume]) -> Dict[str, List[Tuple[str, Tuple[int, int]]]]:
+        """Return category -> list of (matched text, span) for every hit in ``text``"""
+        hits = {category: [] for category in self.categories}
+        for match in self.pattern.finditer(parse_resume(text).lower):
+            hits[match.lastgroup].append((match.group(), match.span()))
+        return hits
+
+    def counts(self, text: Union[str, ParsedResume]) -> Dict[str, int]:
+        """Return category -> number of hits in ``text``"""
+        return {category: len(found) for category, found in self.scan(text).items()}
+
+
+# Personal identifiers removed from blind resumes. One alternation finds them all;
+# where candidates start at the same offset the earlier branch wins, and the scan
+# resumes after each match so redactions never overlap. Every repetition is bounded
+# and addresses stay on one line, so long lines cannot trigger heavy backtracking.
+_PII_PATTERN = re.compile(
+    r'(?P<emails>\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b)'
+    r'|(?P<phones>(?:\+?1[-.\s]?)?\(?\b[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b)'
+    r'|(?P<addresses>\b\d{1,6}(?:[ \t]+[A-Za-z0-9,.-]{1,40}){3,8}\b)'  # a number and 3+ words
+    r'|(?P<names>\b[A-Z][a-z]+\s+(?:[A-Z][a-z]+\s+[A-Z][a-z]+|[A-Z]\.\s*[A-Z][a-z]+|[A-Z][a-z]+)\b)'
+)
+
+_PII_PLACEHOLDERS = {
+    'names': '[NAME REMOVED]',
+    'emails': '[EMAIL REMOVED]',
+    'phones': '[PHONE REMOVED]',
+    'addresses': '[ADDRESS REMOVED]'
+}
+
+# Capitalised phrases the name pattern matches that are not names
+_NAME_EXCEPTIONS = {'This Is', 'That Is', 'It Is'}
+
+# Term lists and regex fragments scanned by BiasDetector, one matcher category each
+DEFAULT_LEXICONS = {
+    'gender_male': {
+        'terms': ['he', 'him', 'his', 'man', 'men', 'boy', 'boys', 'male', 'masculine', 'gentleman', 'mr', 'sir']
+    },
+    'gender_female': {
+        'terms': ['she', 'her', 'hers', 'woman', 'women', 'girl', 'girls', 'female', 'feminine', 'lady', 'ms', 'mrs', 'miss']
+    },
+    'gender_neutral': {
+        'terms': ['they', 'them', 'their', 'person', 'people', 'individual', 'candidate', 'applicant']
+    },
+    'age': {
+        'terms': ['young', 'old', 'senior', 'junior', 'experienced', 'inexperienced'],
+        'patterns': [
+            r'\d{1,2}\s*(?:years?|yrs?|yo)',
+            r'(?:fresh|recent|new)\s*(?:graduate|grad)',
+            r'(?:mid|late|early)\s*\d{1,2}s'
         ]
-
-        # Location/cultural bias terms
-        self.location_bias_terms = [
+    },
+    'location': {
+        'terms': [
             'international', 'domestic', 'local', 'foreign', 'overseas',
-            'immigrant', 'migrant', 'expat', 'native', 'citizen'
-        ]
-
-        # Education bias terms
-        self.education_bias_terms = [
-            'ivy league', 'top-tier', 'prestigious', 'elite',
+            'immigrant', 'migrant', 'expat', 'native', 'citizen',
+            'asian', 'african', 'european', 'american', 'middle eastern'
+        ],
+        # A preposition followed by a place name; the lookahead leaves the name
+        # unconsumed so hits inside it are still found
+        'patterns': [r'(?:from|in|at)(?=\s+[a-z])']
+    },
+    'education': {
+        'terms': [
+            'ivy league', 'top-tier', 'prestigious', 'elite', 'tier',
             'ivy', 'harvard', 'stanford', 'mit', 'oxford', 'cambridge'
-        ]
+        ],
+        'patterns': [r'(?:ranked|top|best|leading|premier)\s+(?:university|college|school|institution)']
+    }
+}
+
+def load_lexicons(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """Read and validate a lexicon file, raising ValueError if it is malformed"""
+    with open(path, 'r', encoding='utf-8') as file:
+        lexicons = json.load(file)
+
+    if not isinstance(lexicons, dict) or not lexicons:
+        raise ValueError("Lexicon file must map category names to term lists")
+    for category, lexicon in lexicons.items():
+        if not category.isidentifier():
+            raise ValueError(f"Invalid lexicon category name: {category}")
+        if not isinstance(lexicon, dict) or set(lexicon) - {'terms', 'patterns'}:
+            raise ValueError(f"Lexicon {category} must only have 'terms' and 'patterns' lists")
+        for key, values in lexicon.items():
+            if not isinstance(values, list) or not all(isinstance(value, str) and value for value in values):
+                raise ValueError(f"Lexicon {category}.{key} must be a list of non-empty strings")
+    return lexicons
+
+def lexicon_version(lexicons: Dict) -> str:
+    """Content hash of a lexicon set, identical across workers that load the same file"""
+    return hashlib.sha256(json.dumps(lexicons, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+class BiasDetector:
+    def __init__(self, lexicons: Dict[str, Dict[str, List[str]]] = None):
+        self.lexicons = lexicons or DEFAULT_LEXICONS
+        self.matcher = LexiconMatcher(self.lexicons)
+        self.version = lexicon_version(self.lexicons)
+        self.loaded_at = datetime.now().isoformat()
 
-    def analyze_bias(self, text: str) -> Dict:
+    def analyze_bias(self, text: Union[str, ParsedResume]) -> Dict:
         """Analyze text for potential bias indicators"""
-        text_lower = text.lower()
+        counts = self.count_indicators(text)
 
         bias_analysis = {
-            'gender_bias': self._detect_gender_bias(text_lower),
-            'age_bias': self._detect_age_bias(text_lower),
-            'location_bias': self._detect_location_bias(text_lower),
-            'education_bias': self._detect_education_bias(text_lower),
+            'gender_bias': self._detect_gender_bias(counts),
+            'age_bias': self._detect_age_bias(counts),
+            'location_bias': self._detect_location_bias(counts),
+            'education_bias': self._detect_education_bias(counts),
             'overall_bias_score': 0,
             'bias_recommendations': [],
-            'bias_free_score': 100
+            'bias_free_score': 100,
+            'lexicon_version': self.version
         }
 
         # Calculate overall bias score
@@ -60,11 +198,24 @@ class BiasDetector:
 
         return bias_analysis
 
-    def _detect_gender_bias(self, text: str) -> Dict:
-        """Detect gender-related bias in text"""
-        male_count = sum(1 for term in self.gender_terms['male'] if term in text)
-        female_count = sum(1 for term in self.gender_terms['female'] if term in text)
-        neutral_count = sum(1 for term in self.gender_terms['neutral'] if term in text)
+    def count_indicators(self, text: Union[str, ParsedResume]) -> Dict[str, int]:
+        """Raw indicator counts that the bias scores are computed from, keyed as in INDICATOR_COUNTS"""
+        hits = self.matcher.scan(text)
+        return {
+            # Each distinct gender term counts once, however often it appears
+            'male_terms': len({term for term, _ in hits['gender_male']}),
+            'female_terms': len({term for term, _ in hits['gender_female']}),
+            'neutral_terms': len({term for term, _ in hits['gender_neutral']}),
+            'age_indicators': len(hits['age']),
+            'location_indicators': len(hits['location']),
+            'education_indicators': len(hits['education'])
+        }
+
+    def _detect_gender_bias(self, counts: Dict) -> Dict:
+        """Detect gender-related bias from the indicator counts"""
+        male_count = counts['male_terms']
+        female_count = counts['female_terms']
+        neutral_count = counts['neutral_terms']
 
         total_gender_terms = male_count + female_count
         bias_score = 0
@@ -76,7 +227,7 @@ class BiasDetector:
             else:
                 imbalance_ratio = female_count / (male_count + 1)
 
-            bias_score = min(50, imbalance_ratio * 10)  # Scale to 0-50
+            bias_score = min(MAX_CATEGORY_SCORE, imbalance_ratio * GENDER_IMBALANCE_WEIGHT)
 
         return {
             'score': bias_score,
@@ -86,20 +237,11 @@ class BiasDetector:
             'recommendation': 'Use gender-neutral language' if bias_score > 10 else None
         }
 
-    def _detect_age_bias(self, text: str) -> Dict:
-        """Detect age-related bias in text"""
-        age_indicators = 0
+    def _detect_age_bias(self, counts: Dict) -> Dict:
+        """Detect age-related bias from the indicator counts"""
+        age_indicators = counts['age_indicators']
 
-        for pattern in self.age_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            age_indicators += len(matches)
-
-        # Additional age-related terms
-        age_terms = ['young', 'old', 'senior', 'junior', 'experienced', 'inexperienced', 'fresh graduate']
-        for term in age_terms:
-            age_indicators += text.count(term)
-
-        bias_score = min(50, age_indicators * 5)  # Scale to 0-50
+        bias_score = min(MAX_CATEGORY_SCORE, age_indicators * INDICATOR_WEIGHTS['age_indicators'])
 
         return {
             'score': bias_score,
@@ -107,24 +249,11 @@ class BiasDetector:
             'recommendation': 'Focus on skills and experience rather than age' if bias_score > 10 else None
         }
 
-    def _detect_location_bias(self, text: str) -> Dict:
-        """Detect location/cultural bias in text"""
-        location_indicators = 0
+    def _detect_location_bias(self, counts: Dict) -> Dict:
+        """Detect location/cultural bias from the indicator counts"""
+        location_indicators = counts['location_indicators']
 
-        for term in self.location_bias_terms:
-            location_indicators += text.count(term)
-
-        # Check for specific location mentions
-        location_patterns = [
-            r'\b(?:from|in|at)\s+(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',  # City/Country names
-            r'\b(?:asian|african|european|american|middle eastern)\b'
-        ]
-
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            location_indicators += len(matches)
-
-        bias_score = min(50, location_indicators * 3)  # Scale to 0-50
+        bias_score = min(MAX_CATEGORY_SCORE, location_indicators * INDICATOR_WEIGHTS['location_indicators'])
 
         return {
             'score': bias_score,
@@ -132,24 +261,11 @@ class BiasDetector:
             'recommendation': 'Consider remote work capabilities' if bias_score > 10 else None
         }
 
-    def _detect_education_bias(self, text: str) -> Dict:
-        """Detect education/institution bias in text"""
-        education_indicators = 0
+    def _detect_education_bias(self, counts: Dict) -> Dict:
+        """Detect education/institution bias from the indicator counts"""
+        education_indicators = counts['education_indicators']
 
-        for term in self.education_bias_terms:
-            education_indicators += text.count(term)
-
-        # Check for university rankings or prestige indicators
-        prestige_patterns = [
-            r'\b(?:ranked|top|best|leading|premier)\s+(?:university|college|school|institution)\b',
-            r'\b(?:tier|elite|prestigious|ivy)\b'
-        ]
-
-        for pattern in prestige_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            education_indicators += len(matches)
-
-        bias_score = min(50, education_indicators * 4)  # Scale to 0-50
+        bias_score = min(MAX_CATEGORY_SCORE, education_indicators * INDICATOR_WEIGHTS['education_indicators'])
 
         return {
             'score': bias_score,
@@ -182,57 +298,92 @@ class BiasDetector:
 
         return recommendations
 
-    def create_blind_resume(self, resume_text: str) -> Tuple[str, Dict]:
-        """Create a blind version of the resume by removing personal identifiers"""
-        blind_text = resume_text
-
-        # Remove names (common patterns)
-        name_patterns = [
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # First Last
-            r'\b[A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+\b',  # First M. Last
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b'  # First Middle Last
-        ]
-
-        removed_info = {'names': [], 'emails': [], 'phones': [], 'addresses': []}
-
-        for pattern in name_patterns:
-            matches = re.findall(pattern, blind_text)
-            for match in matches:
-                if match not in ['This Is', 'That Is', 'It Is']:  # Avoid common phrases
-                    removed_info['names'].append(match)
-                    blind_text = blind_text.replace(match, '[NAME REMOVED]')
-
-        # Remove email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, blind_text)
-        for email in emails:
-            removed_info['emails'].append(email)
-            blind_text = blind_text.replace(email, '[EMAIL REMOVED]')
-
-        # Remove phone numbers
-        phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b'
-        phones = re.findall(phone_pattern, blind_text)
-        for phone in phones:
-            phone_str = ''.join(phone)
-            removed_info['phones'].append(phone_str)
-            blind_text = blind_text.replace(phone_str, '[PHONE REMOVED]')
-
-        # Remove addresses (basic pattern)
-        address_pattern = r'\b\d+\s+[A-Za-z0-9\s,.-]+\b'
-        addresses = re.findall(address_pattern, blind_text)
-        for address in addresses:
-            if len(address.split()) > 3:  # Likely an address if more than 3 words
-                removed_info['addresses'].append(address)
-                blind_text = blind_text.replace(address, '[ADDRESS REMOVED]')
-
-        return blind_text, removed_info
-
-def analyze_resume_bias(resume_text: str) -> Dict:
+    def create_blind_resume(self, resume_text: Union[str, ParsedResume]) -> Tuple[str, Dict]:
+        """
+        Create a blind version of the resume by removing personal identifiers.
+
+        All identifiers are found in one scan and the blind text is assembled once.
+        ``removed_info['spans']`` lists each redaction with its offsets in the original
+        text (``start``/``end``) and of its placeholder in the blind text.
+        """
+        text = parse_resume(resume_text).text
+        removed_info = {'names': [], 'emails': [], 'phones': [], 'addresses': [], 'spans': []}
+
+        pieces = []
+        position = 0  # end of the last redaction in the original text
+        blind_length = 0
+        for match in _PII_PATTERN.finditer(text):
+            kind = match.lastgroup
+            value = match.group()
+            if kind == 'names' and value in _NAME_EXCEPTIONS:
+                continue
+
+            start, end = match.span()
+            pieces.append(text[position:start])
+            blind_length += start - position
+            placeholder = _PII_PLACEHOLDERS[kind]
+            pieces.append(placeholder)
+
+            removed_info[kind].append(value)
+            removed_info['spans'].append({
+                'type': kind,
+                'start': start,
+                'end': end,
+                'blind_start': blind_length,
+                'blind_end': blind_length + len(placeholder)
+            })
+            blind_length += len(placeholder)
+            position = end
+
+        pieces.append(text[position:])
+        return ''.join(pieces), removed_info
+
+def _build_detector(path: str = None) -> BiasDetector:
+    # Categories missing from the file keep their default lexicons
+    return BiasDetector({**DEFAULT_LEXICONS, **load_lexicons(path)} if path else None)
+
+# Shared detector; replaced wholesale on reload so readers never see a half-built one
+_detector_lock = threading.Lock()
+try:
+    _detector = _build_detector(BIAS_LEXICON_PATH)
+except (OSError, ValueError, re.error) as e:
+    logger.error(f"Failed to load bias lexicons from {BIAS_LEXICON_PATH}, using defaults: {str(e)}")
+    _detector = BiasDetector()
+
+def get_bias_detector() -> BiasDetector:
+    """Return the current shared detector"""
+    return _detector
+
+def reload_bias_lexicons(path: str = None) -> Dict:
+    """
+    Compile lexicons from ``path`` (``BIAS_LEXICON_PATH`` or the defaults if omitted)
+    and atomically swap them in. The current detector stays active if loading fails.
+
+    Returns:
+        dict: Version stamp and load time of the active lexicons
+    """
+    global _detector
+    # Compile outside the lock; in-flight analyses keep using the detector they started with
+    detector = _build_detector(path or BIAS_LEXICON_PATH)
+    with _detector_lock:
+        _detector = detector
+    logger.info(f"Loaded bias lexicons version {detector.version}")
+    return get_lexicon_info()
+
+def get_lexicon_info() -> Dict:
+    """Version stamp, load time and categories of the active lexicons"""
+    detector = _detector
+    return {
+        'version': detector.version,
+        'loaded_at': detector.loaded_at,
+        'categories': {category: len(lexicon.get('terms', [])) + len(lexicon.get('patterns', []))
+                       for category, lexicon in detector.lexicons.items()}
+    }
+
+def analyze_resume_bias(resume_text: Union[str, ParsedResume]) -> Dict:
     """Main function to analyze resume for bias"""
-    detector = BiasDetector()
-    return detector.analyze_bias(resume_text)
+    return get_bias_detector().analyze_bias(resume_text)
 
-def create_blind_version(resume_text: str) -> Tuple[str, Dict]:
+def create_blind_version(resume_text: Union[str, ParsedResume]) -> Tuple[str, Dict]:
     """Main function to create blind resume version"""
-    detector = BiasDetector()
-    return detector.create_blind_resume(resume_text)
+    return get_bias_detector().create_blind_resume(resume_text)
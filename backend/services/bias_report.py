@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from services.bias_detection import (
+    get_bias_detector,
+    INDICATOR_COUNTS,
+    INDICATOR_WEIGHTS,
+    GENDER_IMBALANCE_WEIGHT,
+    MAX_CATEGORY_SCORE,
+    BLIND_SCREENING_THRESHOLD
+)
+from services.database import get_bias_indicator_counts, get_resume_texts
+
+# Score columns produced by score_indicator_matrix
+SCORE_CATEGORIES = ['gender', 'age', 'location', 'education']
+
+REPORT_PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+
+# Ten equal-width bins over the 0-MAX_CATEGORY_SCORE score range
+HISTOGRAM_BIN_EDGES = np.linspace(0, MAX_CATEGORY_SCORE, 11)
+
+_COUNT_KEYS = [key for _, key in INDICATOR_COUNTS]
+
+
+def score_indicator_matrix(counts: np.ndarray) -> np.ndarray:
+    """
+    Vectorised BiasDetector scoring.
+
+    Args:
+        counts: (candidates, len(INDICATOR_COUNTS)) matrix of indicator counts
+
+    Returns:
+        np.ndarray: (candidates, len(SCORE_CATEGORIES)) matrix of category scores
+    """
+    column = {key: counts[:, i] for i, key in enumerate(_COUNT_KEYS)}
+    male, female = column['male_terms'], column['female_terms']
+
+    imbalance = np.where(male > female, male / (female + 1), female / (male + 1))
+    gender = np.where(male + female > 0, np.minimum(MAX_CATEGORY_SCORE, imbalance * GENDER_IMBALANCE_WEIGHT), 0)
+    scaled = [
+        np.minimum(MAX_CATEGORY_SCORE, column[key] * INDICATOR_WEIGHTS[key])
+        for key in ('age_indicators', 'location_indicators', 'education_indicators')
+    ]
+    return np.column_stack([gender] + scaled)
+
+
+def _distribution(values: np.ndarray) -> Dict:
+    """Summary statistics, percentiles and histogram of one score column"""
+    counts, _ = np.histogram(values, bins=HISTOGRAM_BIN_EDGES)
+    if not len(values):
+        return {
+            'mean': None, 'std': None, 'min': None, 'max': None,
+            'percentiles': {f'p{p}': None for p in REPORT_PERCENTILES},
+            'histogram': {'bin_edges': HISTOGRAM_BIN_EDGES.tolist(), 'counts': counts.tolist()}
+        }
+
+    percentiles = np.percentile(values, REPORT_PERCENTILES)
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'percentiles': {f'p{p}': float(v) for p, v in zip(REPORT_PERCENTILES, percentiles)},
+        'histogram': {'bin_edges': HISTOGRAM_BIN_EDGES.tolist(), 'counts': counts.tolist()}
+    }
+
+
+def build_bias_report(rescan: bool = False, include_candidates: bool = False) -> Dict:
+    """
+    Corpus-level bias report over every stored candidate.
+
+    Indicator counts come from the stored analyses and are scored as one matrix.
+    Candidates analysed with other lexicons, or without a stored analysis, are
+    rescanned with the current lexicons; ``rescan`` forces that for everyone.
+
+    Args:
+        rescan (bool): Recount every resume with the current lexicons
+        include_candidates (bool): Add per-candidate scores to the report
+
+    Returns:
+        dict: Aggregate distributions, plus per-candidate scores if requested
+    """
+    detector = get_bias_detector()
+    rows = get_bias_indicator_counts(INDICATOR_COUNTS)
+    candidate_ids = [row[0] for row in rows]
+    versions = [row[1] for row in rows]
+    counts = np.array([row[2:] for row in rows], dtype=float).reshape(len(rows), len(INDICATOR_COUNTS))
+
+    stale = np.isnan(counts).any(axis=1)
+    stale |= np.array([version != detector.version for version in versions], dtype=bool)
+    if rescan:
+        stale[:] = True
+
+    stale_rows = np.flatnonzero(stale)
+    if len(stale_rows):
+        texts = get_resume_texts(candidate_ids[i] for i in stale_rows)
+        for i in stale_rows:
+            found = detector.count_indicators(texts.get(candidate_ids[i]) or '')
+            counts[i] = [found[key] for key in _COUNT_KEYS]
+
+    scores = score_indicator_matrix(counts)
+    overall = scores.mean(axis=1) if len(rows) else np.zeros(0)
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'lexicon_version': detector.version,
+        'total_candidates': len(rows),
+        'rescanned_candidates': int(len(stale_rows)),
+        'blind_screening_threshold': BLIND_SCREENING_THRESHOLD,
+        'above_blind_threshold': int((overall > BLIND_SCREENING_THRESHOLD).sum()),
+        'overall': _distribution(overall),
+        'categories': {category: _distribution(scores[:, i]) for i, category in enumerate(SCORE_CATEGORIES)},
+        'indicator_totals': {key: int(total) for key, total in zip(_COUNT_KEYS, counts.sum(axis=0))}
+    }
+
+    if include_candidates:
+        report['candidates'] = [
+            {
+                'id': candidate_id,
+                'overall_bias_score': float(overall[i]),
+                'scores': {category: float(scores[i, j]) for j, category in enumerate(SCORE_CATEGORIES)}
+            }
+            for i, candidate_id in enumerate(candidate_ids)
+        ]
+
+    return report
@@ -2,10 +2,73 @@ import sqlite3
 import json
 import os
 from datetime import datetime
+from services.metrics import timed, DB_OPERATION_SECONDS
 
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'candidates.db')
 
+# Columns added after the original schema; stored as JSON text unless noted
+CANDIDATE_EXTRA_COLUMNS = {
+    'blind_resume_text': 'TEXT',
+    'bias_analysis': 'TEXT',
+    'removed_personal_info': 'TEXT',
+    'profile_enrichment': 'TEXT',
+    'jd_match_result': 'TEXT',
+    'advanced_ranking': 'TEXT',
+    'content_hash': 'TEXT',
+    'analysis_version': 'TEXT',
+    'analysis_ref': 'TEXT',
+    # Ranking feature presence flags as a '0'/'1' string, component scores as packed
+    # float64s, and the feature set and scoring version both follow
+    'ranking_features': 'TEXT',
+    'ranking_features_version': 'TEXT',
+    'ranking_components': 'BLOB',
+    'jd_id': 'TEXT',
+    # Search fields mirrored from analysis_result; skills_indexed marks rows whose
+    # skills are in candidate_skills
+    'years_experience': 'REAL',
+    'relevance_score': 'REAL',
+    'skills_indexed': 'INTEGER',
+    # Hashed term vector of the resume text as packed int32 indices then float32
+    # weights, and the vectorizer version it was built with
+    'text_vector': 'BLOB',
+    'text_vector_version': 'TEXT'
+}
+
+# Requisition fields of a stored job description; open roles have is_open = 1
+JOB_DESCRIPTION_EXTRA_COLUMNS = {
+    'title': 'TEXT',
+    'is_open': 'INTEGER'
+}
+
+# Columns written by save_candidate, in parameter order; created_at is only set on insert
+SAVED_CANDIDATE_COLUMNS = [
+    'id', 'filename', 'upload_date', 'resume_text', 'analysis_result',
+    'blind_resume_text', 'bias_analysis', 'removed_personal_info', 'profile_enrichment',
+    'jd_match_result', 'advanced_ranking', 'content_hash', 'analysis_version', 'analysis_ref',
+    'ranking_features', 'ranking_features_version', 'ranking_components', 'jd_id',
+    'years_experience', 'relevance_score', 'skills_indexed', 'text_vector', 'text_vector_version'
+]
+
+# Analysis fields a deduplicated record inherits from the candidate it references
+SHARED_ANALYSIS_FIELDS = [
+    'resume_text', 'blind_resume_text', 'analysis_result', 'bias_analysis',
+    'removed_personal_info', 'profile_enrichment'
+]
+
+JSON_FIELDS = [
+    'analysis_result', 'bias_analysis', 'removed_personal_info',
+    'profile_enrichment', 'jd_match_result', 'advanced_ranking'
+]
+
+def _ensure_columns(cursor, table, columns):
+    """Add any missing columns to an existing table"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, column_type in columns.items():
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+
 def init_database():
     """Initialize the database with required tables"""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
@@ -24,117 +87,601 @@ def init_database():
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
     ''')
+    _ensure_columns(cursor, 'candidates', CANDIDATE_EXTRA_COLUMNS)
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_candidates_content_hash
+    ON candidates (content_hash, analysis_version)
+    ''')
+    
+    # Skill inverted index postings, and a log of the candidates whose postings changed
+    # so in-memory indexes can catch up incrementally
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS candidate_skills (
+        candidate_id TEXT NOT NULL,
+        skill TEXT NOT NULL,
+        PRIMARY KEY (candidate_id, skill)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skill_index_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        candidate_id TEXT NOT NULL
+    )
+    ''')
+    
+    # Every candidate save and delete, so per-process caches such as the
+    # leaderboards can replay changes made by other workers
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS candidate_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        candidate_id TEXT NOT NULL
+    )
+    ''')
+    
+    # Job descriptions, stored once under their content hash
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_descriptions (
+        id TEXT PRIMARY KEY,
+        text TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    _ensure_columns(cursor, 'job_descriptions', JOB_DESCRIPTION_EXTRA_COLUMNS)
     
     conn.commit()
     conn.close()
 
+def _to_json(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+def _from_json(value):
+    if value and value.strip():
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return {"error": "Invalid analysis data"}
+    return {}
+
+@timed(DB_OPERATION_SECONDS, operation='save_candidate')
 def save_candidate(candidate_data):
     """Save candidate data to database"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    # Convert analysis_result to JSON string if it's a dict
-    analysis_result = candidate_data.get('analysis_result', {})
-    if isinstance(analysis_result, dict):
-        analysis_result = json.dumps(analysis_result)
+    # Records that reference an existing analysis only store their own metadata
+    analysis_ref = candidate_data.get('analysis_ref')
+    if analysis_ref:
+        shared = {field: None for field in SHARED_ANALYSIS_FIELDS}
+    else:
+        shared = {
+            'resume_text': candidate_data.get('resume_text', ''),
+            'blind_resume_text': candidate_data.get('blind_resume_text'),
+            'analysis_result': _to_json(candidate_data.get('analysis_result', {})),
+            'bias_analysis': _to_json(candidate_data.get('bias_analysis')),
+            'removed_personal_info': _to_json(candidate_data.get('removed_personal_info')),
+            'profile_enrichment': _to_json(candidate_data.get('profile_enrichment'))
+        }
     
-    cursor.execute('''
-    INSERT INTO candidates (id, filename, upload_date, resume_text, analysis_result)
-    VALUES (?, ?, ?, ?, ?)
+    # Upserting lets a candidate be re-analysed under the same id while keeping
+    # its created_at, which orders the candidate list and picks dedup heirs
+    cursor.execute(f'''
+    INSERT INTO candidates ({', '.join(SAVED_CANDIDATE_COLUMNS)})
+    VALUES ({', '.join('?' * len(SAVED_CANDIDATE_COLUMNS))})
+    ON CONFLICT(id) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in SAVED_CANDIDATE_COLUMNS[1:])}
     ''', (
         candidate_data['id'],
         candidate_data['filename'],
         candidate_data['upload_date'],
-        candidate_data.get('resume_text', ''),
-        analysis_result
+        shared['resume_text'],
+        shared['analysis_result'],
+        shared['blind_resume_text'],
+        shared['bias_analysis'],
+        shared['removed_personal_info'],
+        shared['profile_enrichment'],
+        _to_json(candidate_data.get('jd_match_result')),
+        _to_json(candidate_data.get('advanced_ranking')),
+        candidate_data.get('content_hash'),
+        candidate_data.get('analysis_version'),
+        analysis_ref,
+        candidate_data.get('ranking_features'),
+        candidate_data.get('ranking_features_version'),
+        candidate_data.get('ranking_components'),
+        candidate_data.get('jd_id'),
+        candidate_data.get('years_experience'),
+        candidate_data.get('relevance_score'),
+        1 if candidate_data.get('skills') is not None else None,
+        candidate_data.get('text_vector'),
+        candidate_data.get('text_vector_version')
     ))
+    if candidate_data.get('skills') is not None:
+        _replace_skills(cursor, candidate_data['id'], candidate_data['skills'])
+    cursor.execute('INSERT INTO candidate_log (candidate_id) VALUES (?)', (candidate_data['id'],))
     
     conn.commit()
     conn.close()
 
+def _replace_skills(cursor, candidate_id, skills):
+    """Replace a candidate's skill postings and log the change"""
+    cursor.execute('DELETE FROM candidate_skills WHERE candidate_id = ?', (candidate_id,))
+    cursor.executemany('''
+    INSERT OR IGNORE INTO candidate_skills (candidate_id, skill) VALUES (?, ?)
+    ''', [(candidate_id, skill) for skill in skills])
+    cursor.execute('INSERT INTO skill_index_log (candidate_id) VALUES (?)', (candidate_id,))
+
+# Resolves deduplicated records to the analysis of the candidate they reference
+_CANDIDATE_SELECT = '''
+SELECT c.id, c.filename, c.upload_date, c.created_at,
+       c.jd_match_result, c.advanced_ranking, c.content_hash, c.analysis_version, c.analysis_ref, c.jd_id,
+       COALESCE(src.resume_text, c.resume_text) AS resume_text,
+       COALESCE(src.analysis_result, c.analysis_result) AS analysis_result,
+       COALESCE(src.blind_resume_text, c.blind_resume_text) AS blind_resume_text,
+       COALESCE(src.bias_analysis, c.bias_analysis) AS bias_analysis,
+       COALESCE(src.removed_personal_info, c.removed_personal_info) AS removed_personal_info,
+       COALESCE(src.profile_enrichment, c.profile_enrichment) AS profile_enrichment
+FROM candidates c
+LEFT JOIN candidates src ON src.id = c.analysis_ref
+'''
+
+def _row_to_candidate(row, summary=False):
+    """Convert a candidate row to a dict, parsing the JSON columns"""
+    resume_text = row['resume_text']
+    candidate = {
+        'id': row['id'],
+        'filename': row['filename'],
+        'upload_date': row['upload_date'],
+        'resume_text': resume_text[:200] + '...' if summary and resume_text and len(resume_text) > 200 else resume_text,
+        'created_at': row['created_at'],
+        'content_hash': row['content_hash'],
+        'analysis_ref': row['analysis_ref'],
+        'jd_id': row['jd_id']
+    }
+    for field in JSON_FIELDS:
+        value = row[field]
+        candidate[field] = _from_json(value) if field == 'analysis_result' or value else None
+    if summary:
+        candidate['blind_resume_available'] = bool(row['blind_resume_text'])
+    else:
+        candidate['blind_resume_text'] = row['blind_resume_text']
+    return candidate
+
+@timed(DB_OPERATION_SECONDS, operation='get_all_candidates')
 def get_all_candidates():
     """Retrieve all candidates from database"""
     conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
-    cursor.execute('''
-    SELECT id, filename, upload_date, resume_text, analysis_result, created_at
-    FROM candidates
-    ORDER BY created_at DESC
+    cursor.execute(_CANDIDATE_SELECT + '''
+    ORDER BY c.created_at DESC
     ''')
     
-    candidates = []
-    for row in cursor.fetchall():
-        # Parse analysis_result from JSON string if it exists
-        analysis_result = row[4]
-        if analysis_result and analysis_result.strip():
-            try:
-                analysis_result = json.loads(analysis_result)
-            except json.JSONDecodeError:
-                analysis_result = {"error": "Invalid analysis data"}
-        else:
-            analysis_result = {}
-        
-        candidates.append({
-            'id': row[0],
-            'filename': row[1],
-            'upload_date': row[2],
-            'resume_text': row[3][:200] + '...' if row[3] and len(row[3]) > 200 else row[3],
-            'analysis_result': analysis_result,
-            'created_at': row[5]
-        })
+    candidates = [_row_to_candidate(row, summary=True) for row in cursor.fetchall()]
     
     conn.close()
     return candidates
 
+@timed(DB_OPERATION_SECONDS, operation='get_candidate_by_id')
 def get_candidate_by_id(candidate_id):
     """Retrieve specific candidate by ID"""
     conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
-    cursor.execute('''
-    SELECT id, filename, upload_date, resume_text, analysis_result, created_at
-    FROM candidates
-    WHERE id = ?
+    cursor.execute(_CANDIDATE_SELECT + '''
+    WHERE c.id = ?
     ''', (candidate_id,))
     
     row = cursor.fetchone()
+    conn.close()
     if not row:
-        conn.close()
         return None
     
-    # Parse analysis_result from JSON string
-    analysis_result = row[4]
-    if analysis_result and analysis_result.strip():
-        try:
-            analysis_result = json.loads(analysis_result)
-        except json.JSONDecodeError:
-            analysis_result = {"error": "Invalid analysis data"}
+    return _row_to_candidate(row)
+
+@timed(DB_OPERATION_SECONDS, operation='find_analysis_by_hash')
+def find_analysis_by_hash(content_hash, analysis_version):
+    """Find the original candidate analysed from identical file bytes with the same analyzer versions"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute(_CANDIDATE_SELECT + '''
+    WHERE c.content_hash = ? AND c.analysis_version = ? AND c.analysis_ref IS NULL
+    ORDER BY c.created_at ASC
+    LIMIT 1
+    ''', (content_hash, analysis_version))
+    
+    row = cursor.fetchone()
+    conn.close()
+    if not row:
+        return None
+    
+    return _row_to_candidate(row)
+
+@timed(DB_OPERATION_SECONDS, operation='get_bias_indicator_counts')
+def get_bias_indicator_counts(count_fields):
+    """
+    Read stored bias indicator counts for every candidate without parsing JSON in Python.
+
+    Args:
+        count_fields (list): (section, key) pairs inside the bias_analysis JSON
+
+    Returns:
+        list: (candidate id, lexicon version, *counts) tuples; values are None when
+        the candidate has no valid stored analysis
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    analysis = 'COALESCE(src.bias_analysis, c.bias_analysis)'
+    paths = ['$.lexicon_version'] + [f'$.{section}.{key}' for section, key in count_fields]
+    columns = ', '.join(
+        f"CASE WHEN json_valid({analysis}) THEN json_extract({analysis}, '{path}') END" for path in paths
+    )
+    cursor.execute(f'''
+    SELECT c.id, {columns}
+    FROM candidates c
+    LEFT JOIN candidates src ON src.id = c.analysis_ref
+    ORDER BY c.created_at ASC
+    ''')
+    rows = cursor.fetchall()
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='get_resume_texts')
+def get_resume_texts(candidate_ids):
+    """Return {candidate id: resume text} for the given candidates"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    texts = {}
+    candidate_ids = list(candidate_ids)
+    # Stay under SQLite's bound-parameter limit
+    for i in range(0, len(candidate_ids), 500):
+        chunk = candidate_ids[i:i + 500]
+        cursor.execute(f'''
+        SELECT c.id, COALESCE(src.resume_text, c.resume_text)
+        FROM candidates c
+        LEFT JOIN candidates src ON src.id = c.analysis_ref
+        WHERE c.id IN ({', '.join('?' * len(chunk))})
+        ''', chunk)
+        texts.update(cursor.fetchall())
+    
+    conn.close()
+    return texts
+
+@timed(DB_OPERATION_SECONDS, operation='get_ranking_vectors')
+def get_ranking_vectors(candidate_ids=None):
+    """
+    Read stored ranking feature vectors and component scores.
+
+    Args:
+        candidate_ids (list): Candidates to read, or None for every candidate
+
+    Returns:
+        list: (candidate id, filename, ranking version, features, components) tuples in
+        upload order; the last three are None for candidates stored without them
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    query = '''
+    SELECT id, filename, ranking_features_version, ranking_features, ranking_components
+    FROM candidates
+    '''
+    if candidate_ids is None:
+        cursor.execute(query + 'ORDER BY created_at ASC')
+        rows = cursor.fetchall()
     else:
-        analysis_result = {}
+        rows = []
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[i:i + 500]
+            cursor.execute(query + f'WHERE id IN ({", ".join("?" * len(chunk))})', chunk)
+            rows.extend(cursor.fetchall())
     
-    candidate = {
-        'id': row[0],
-        'filename': row[1],
-        'upload_date': row[2],
-        'resume_text': row[3],
-        'analysis_result': analysis_result,
-        'created_at': row[5]
-    }
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='save_ranking_vectors')
+def save_ranking_vectors(updates):
+    """Store recomputed ranking data from (candidate id, features, components, ranking version) tuples"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
     
+    cursor.executemany('''
+    UPDATE candidates SET ranking_features = ?, ranking_components = ?, ranking_features_version = ? WHERE id = ?
+    ''', [(features, components, version, candidate_id) for candidate_id, features, components, version in updates])
+    
+    conn.commit()
     conn.close()
-    return candidate
 
+@timed(DB_OPERATION_SECONDS, operation='get_text_vectors')
+def get_text_vectors(candidate_ids=None):
+    """
+    Read stored resume text vectors.
+
+    Args:
+        candidate_ids (list): Candidates to read, or None for every candidate
+
+    Returns:
+        list: (candidate id, filename, vectorizer version, vector) tuples; the last
+        two are None for candidates stored without a vector
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    query = 'SELECT id, filename, text_vector_version, text_vector FROM candidates '
+    if candidate_ids is None:
+        cursor.execute(query + 'ORDER BY created_at ASC')
+        rows = cursor.fetchall()
+    else:
+        rows = []
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[i:i + 500]
+            cursor.execute(query + f'WHERE id IN ({", ".join("?" * len(chunk))})', chunk)
+            rows.extend(cursor.fetchall())
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='save_text_vectors')
+def save_text_vectors(updates):
+    """Store recomputed text vectors from (candidate id, vector, vectorizer version) tuples"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.executemany('''
+    UPDATE candidates SET text_vector = ?, text_vector_version = ? WHERE id = ?
+    ''', [(vector, version, candidate_id) for candidate_id, vector, version in updates])
+    
+    conn.commit()
+    conn.close()
+
+@timed(DB_OPERATION_SECONDS, operation='get_unindexed_candidates')
+def get_unindexed_candidates():
+    """Candidates saved before skill indexing, as (id, analysis_result, advanced_ranking) JSON rows"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+    SELECT c.id, COALESCE(src.analysis_result, c.analysis_result), c.advanced_ranking
+    FROM candidates c
+    LEFT JOIN candidates src ON src.id = c.analysis_ref
+    WHERE c.skills_indexed IS NULL
+    ''')
+    rows = cursor.fetchall()
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='save_candidate_skills')
+def save_candidate_skills(updates):
+    """Index skills of existing candidates from (id, skills, years experience, relevance score) tuples"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    for candidate_id, skills, years_experience, relevance_score in updates:
+        cursor.execute('''
+        UPDATE candidates SET years_experience = ?, relevance_score = ?, skills_indexed = 1 WHERE id = ?
+        ''', (years_experience, relevance_score, candidate_id))
+        _replace_skills(cursor, candidate_id, skills)
+    
+    conn.commit()
+    conn.close()
+
+@timed(DB_OPERATION_SECONDS, operation='get_skill_index_snapshot')
+def get_skill_index_snapshot(candidate_ids=None):
+    """
+    Search fields and skill postings of indexed candidates.
+
+    Args:
+        candidate_ids (list): Candidates to read, or None for every candidate
+
+    Returns:
+        tuple: ({candidate id: (years experience, relevance score)}, [(candidate id, skill)])
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    fields = {}
+    postings = []
+    # One read transaction, so postings and fields come from the same state of the database
+    cursor.execute('BEGIN')
+    if candidate_ids is None:
+        cursor.execute('SELECT id, years_experience, relevance_score FROM candidates WHERE skills_indexed = 1')
+        fields = {row[0]: row[1:] for row in cursor.fetchall()}
+        cursor.execute('SELECT candidate_id, skill FROM candidate_skills')
+        postings = cursor.fetchall()
+    else:
+        candidate_ids = list(candidate_ids)
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+            SELECT id, years_experience, relevance_score FROM candidates
+            WHERE skills_indexed = 1 AND id IN ({placeholders})
+            ''', chunk)
+            fields.update((row[0], row[1:]) for row in cursor.fetchall())
+            cursor.execute(f'SELECT candidate_id, skill FROM candidate_skills WHERE candidate_id IN ({placeholders})', chunk)
+            postings.extend(cursor.fetchall())
+    
+    conn.rollback()
+    conn.close()
+    return fields, postings
+
+def _log_changes(log_table, after_seq):
+    """(latest sequence number, distinct candidate ids logged after ``after_seq``) of a change log"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute(f'SELECT seq, candidate_id FROM {log_table} WHERE seq > ? ORDER BY seq', (after_seq,))
+    rows = cursor.fetchall()
+    
+    conn.close()
+    latest = rows[-1][0] if rows else after_seq
+    return latest, list(dict.fromkeys(candidate_id for _, candidate_id in rows))
+
+@timed(DB_OPERATION_SECONDS, operation='get_skill_index_changes')
+def get_skill_index_changes(after_seq=0):
+    """(latest change sequence number, ids of candidates whose postings changed after ``after_seq``)"""
+    return _log_changes('skill_index_log', after_seq)
+
+@timed(DB_OPERATION_SECONDS, operation='get_candidate_changes')
+def get_candidate_changes(after_seq=0):
+    """(latest change sequence number, ids of candidates saved or deleted after ``after_seq``)"""
+    return _log_changes('candidate_log', after_seq)
+
+@timed(DB_OPERATION_SECONDS, operation='get_candidate_filenames')
+def get_candidate_filenames(candidate_ids):
+    """Return {candidate id: filename} for the given candidates"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    filenames = {}
+    candidate_ids = list(candidate_ids)
+    for i in range(0, len(candidate_ids), 500):
+        chunk = candidate_ids[i:i + 500]
+        cursor.execute(f'''
+        SELECT id, filename FROM candidates WHERE id IN ({', '.join('?' * len(chunk))})
+        ''', chunk)
+        filenames.update(cursor.fetchall())
+    
+    conn.close()
+    return filenames
+
+@timed(DB_OPERATION_SECONDS, operation='save_job_description')
+def save_job_description(jd_id, text):
+    """Store a job description under its id unless it is already stored"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+    INSERT OR IGNORE INTO job_descriptions (id, text) VALUES (?, ?)
+    ''', (jd_id, text))
+    
+    conn.commit()
+    conn.close()
+
+@timed(DB_OPERATION_SECONDS, operation='update_job_description')
+def update_job_description(jd_id, is_open=None, title=None):
+    """Open or close a stored job description as a requisition and/or set its title; False if it is not stored"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+    UPDATE job_descriptions
+    SET is_open = COALESCE(?, is_open), title = COALESCE(?, title)
+    WHERE id = ?
+    ''', (None if is_open is None else int(is_open), title, jd_id))
+    updated = cursor.rowcount > 0
+    
+    conn.commit()
+    conn.close()
+    return updated
+
+@timed(DB_OPERATION_SECONDS, operation='get_open_job_descriptions')
+def get_open_job_descriptions():
+    """(id, title) of every open requisition, oldest first"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT id, title FROM job_descriptions WHERE is_open = 1 ORDER BY created_at ASC, id ASC')
+    rows = cursor.fetchall()
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='get_job_description')
+def get_job_description(jd_id):
+    """Text of a stored job description, or None"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT text FROM job_descriptions WHERE id = ?', (jd_id,))
+    row = cursor.fetchone()
+    
+    conn.close()
+    return row[0] if row else None
+
+@timed(DB_OPERATION_SECONDS, operation='get_leaderboard_entries')
+def get_leaderboard_entries(jd_id):
+    """(id, filename, upload_date, match score, advanced score) of every candidate screened against a job description"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+    SELECT id, filename, upload_date,
+           json_extract(jd_match_result, '$.match_score'),
+           json_extract(advanced_ranking, '$.overall_advanced_score')
+    FROM candidates
+    WHERE jd_id = ?
+    ''', (jd_id,))
+    rows = cursor.fetchall()
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='get_leaderboard_rows')
+def get_leaderboard_rows(candidate_ids):
+    """{candidate id: (jd_id, filename, upload_date, match score, advanced score)} for stored candidates"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    rows = {}
+    candidate_ids = list(candidate_ids)
+    # Stay under SQLite's bound-parameter limit
+    for i in range(0, len(candidate_ids), 500):
+        chunk = candidate_ids[i:i + 500]
+        cursor.execute(f'''
+        SELECT id, jd_id, filename, upload_date,
+               json_extract(jd_match_result, '$.match_score'),
+               json_extract(advanced_ranking, '$.overall_advanced_score')
+        FROM candidates
+        WHERE id IN ({', '.join('?' * len(chunk))})
+        ''', chunk)
+        rows.update((row[0], row[1:]) for row in cursor.fetchall())
+    
+    conn.close()
+    return rows
+
+@timed(DB_OPERATION_SECONDS, operation='delete_candidate')
 def delete_candidate(candidate_id):
     """Delete candidate from database"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # Hand the shared analysis over to the oldest record that references this one
+    cursor.execute('''
+    SELECT id FROM candidates WHERE analysis_ref = ? ORDER BY created_at ASC LIMIT 1
+    ''', (candidate_id,))
+    heir = cursor.fetchone()
+    if heir:
+        cursor.execute(f'''
+        UPDATE candidates
+        SET ({', '.join(SHARED_ANALYSIS_FIELDS)}) = (
+            SELECT {', '.join(SHARED_ANALYSIS_FIELDS)} FROM candidates WHERE id = ?
+        ), analysis_ref = NULL
+        WHERE id = ?
+        ''', (candidate_id, heir[0]))
+        cursor.execute('''
+        UPDATE candidates SET analysis_ref = ? WHERE analysis_ref = ?
+        ''', (heir[0], candidate_id))
+    
     cursor.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+    deleted = cursor.rowcount > 0
+    if deleted:
+        _replace_skills(cursor, candidate_id, [])
+        cursor.execute('INSERT INTO candidate_log (candidate_id) VALUES (?)', (candidate_id,))
     
     conn.commit()
     conn.close()
-    return cursor.rowcount > 0
-
-# Initialize database when this module is imported
-init_database()
+    return deleted
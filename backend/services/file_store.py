@@ -0,0 +1,47 @@
+import os
+import hashlib
+
+# Copy buffer used when streaming uploads and archive members to disk
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class FileTooLarge(Exception):
+    """Raised when a streamed file exceeds its size limit"""
+
+
+def save_stream(source, destination_path, max_bytes=None):
+    """
+    Stream ``source`` to ``destination_path`` in chunks, hashing the bytes on the way.
+
+    Args:
+        source: Readable binary file object
+        destination_path (str): Where to write the file
+        max_bytes (int): Abort and remove the partial file past this many bytes
+
+    Returns:
+        tuple: (bytes written, SHA-256 hex digest of the content)
+    """
+    digest = hashlib.sha256()
+    written = 0
+    with open(destination_path, 'wb') as destination:
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if max_bytes is not None and written > max_bytes:
+                destination.close()
+                os.remove(destination_path)
+                raise FileTooLarge(f"File exceeds the {max_bytes} byte limit")
+            digest.update(chunk)
+            destination.write(chunk)
+    return written, digest.hexdigest()
+
+
+def hash_file(file_path):
+    """Return the SHA-256 hex digest of a file on disk"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
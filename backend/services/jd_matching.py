@@ -1,14 +1,121 @@
 import os
 import json
+import time
+import atexit
+import logging
+import threading
+from collections import deque
 from ibm_watson import NaturalLanguageUnderstandingV1
 from ibm_watson.natural_language_understanding_v1 import Features, SemanticRolesOptions
 from ibm_cloud_sdk_core.authenticators import IAMAuthenticator
 from dotenv import load_dotenv
 from ibm_watson import AssistantV2
 from ibm_cloud_sdk_core.authenticators import IAMAuthenticator as AssistantIAMAuthenticator
+from ibm_cloud_sdk_core import ApiException
+from ibm_cloud_sdk_core.http_adapter import SSLHTTPAdapter
+
+from services.metrics import LLM_CALLS, LLM_FALLBACKS, LLM_SESSIONS_CREATED
+from services.parsed_resume import parse_resume
+from services.jd_registry import jd_registry
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Idle assistant sessions kept for reuse, and how many are opened ahead of the first match
+JD_SESSION_POOL_SIZE = int(os.getenv('JD_SESSION_POOL_SIZE', '8'))
+JD_SESSION_PREWARM = int(os.getenv('JD_SESSION_PREWARM', '2'))
+
+# Assistant sessions expire after 5 idle minutes by default; retire them a minute earlier
+JD_SESSION_TTL = float(os.getenv('JD_SESSION_TTL', '240'))
+
+# Keep-alive connections to the assistant service, sized for the pipeline stage workers
+JD_MATCHER_CONNECTIONS = int(os.getenv('JD_MATCHER_CONNECTIONS', '16'))
+JD_MATCHER_TIMEOUT = float(os.getenv('JD_MATCHER_TIMEOUT', '30'))
+
+
+class AssistantSessionPool:
+    """
+    Reusable Watson assistant sessions.
+
+    A session is taken for one message and handed back afterwards, so matches
+    no longer pay a create and a delete round-trip each. Sessions idle for
+    longer than ``ttl`` are retired before the service expires them, and
+    sessions a failed request may have broken are deleted instead of reused.
+    """
+
+    def __init__(self, assistant, assistant_id, max_idle=JD_SESSION_POOL_SIZE, ttl=JD_SESSION_TTL,
+                 clock=time.monotonic):
+        self.assistant = assistant
+        self.assistant_id = assistant_id
+        self.max_idle = max_idle
+        self.ttl = ttl
+        self.clock = clock
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def _create(self):
+        session_id = self.assistant.create_session(assistant_id=self.assistant_id).get_result()['session_id']
+        LLM_SESSIONS_CREATED.inc(service='jd_match')
+        return session_id
+
+    def _delete(self, session_id):
+        try:
+            self.assistant.delete_session(assistant_id=self.assistant_id, session_id=session_id)
+        except Exception as e:
+            logger.warning(f"Failed to delete assistant session: {str(e)}")
+
+    def acquire(self):
+        """An idle session still within its TTL, or a new one"""
+        expired = []
+        session_id = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if self.clock() - last_used < self.ttl:
+                    session_id = candidate
+                    break
+                expired.append(candidate)
+            # Everything left is older than what was just examined
+            while self._idle and self.clock() - self._idle[0][1] >= self.ttl:
+                expired.append(self._idle.popleft()[0])
+        for stale in expired:
+            self._delete(stale)
+        return session_id if session_id is not None else self._create()
+
+    def release(self, session_id, healthy=True):
+        """Return a session for reuse, or delete it if it may be broken or the pool is full"""
+        if healthy:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append((session_id, self.clock()))
+                    return
+        self._delete(session_id)
+
+    def prewarm(self, count=JD_SESSION_PREWARM):
+        """Open sessions ahead of demand until ``count`` are idle"""
+        try:
+            while True:
+                with self._lock:
+                    if len(self._idle) >= min(count, self.max_idle):
+                        return
+                self.release(self._create())
+        except Exception as e:
+            logger.warning(f"Failed to prewarm assistant sessions: {str(e)}")
+
+    def close(self):
+        """Delete every idle session"""
+        with self._lock:
+            idle = [session_id for session_id, _ in self._idle]
+            self._idle.clear()
+        for session_id in idle:
+            self._delete(session_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._idle)
+
+
 class JDMatcher:
     def __init__(self):
         self.api_key = os.getenv('WATSONX_API_KEY')
@@ -18,26 +125,70 @@ class JDMatcher:
         if not all([self.api_key, self.url, self.project_id]):
             raise Exception("Watsonx.ai credentials not configured. Please set WATSONX_API_KEY, WATSONX_URL, and WATSONX_PROJECT_ID environment variables.")
         
+        # One authenticator caches its IAM token across requests
         self.authenticator = AssistantIAMAuthenticator(self.api_key)
         self.assistant = AssistantV2(
             version='2023-06-15',
             authenticator=self.authenticator
         )
         self.assistant.set_service_url(self.url)
+        self.assistant.set_http_config({'timeout': JD_MATCHER_TIMEOUT})
+        # Let every stage worker hold its own keep-alive connection
+        self.assistant.http_adapter = SSLHTTPAdapter(
+            pool_connections=1, pool_maxsize=JD_MATCHER_CONNECTIONS
+        )
+        self.assistant.http_client.mount('https://', self.assistant.http_adapter)
+        self.assistant.http_client.mount('http://', self.assistant.http_adapter)
+        self.sessions = AssistantSessionPool(self.assistant, self.project_id)
+
+    def _message(self, text):
+        """Send one message on a pooled session; a session the service already expired is replaced once"""
+        for attempt in range(2):
+            session_id = self.sessions.acquire()
+            healthy = False
+            expired = False
+            try:
+                response = self.assistant.message(
+                    assistant_id=self.project_id,
+                    session_id=session_id,
+                    input={
+                        'message_type': 'text',
+                        'text': text,
+                        'options': {
+                            'return_context': True
+                        }
+                    }
+                )
+                healthy = True
+                return response.get_result()
+            except ApiException as e:
+                if e.status_code == 404:
+                    expired = True
+                    if attempt == 0:
+                        continue
+                raise
+            finally:
+                # A session the service already expired is simply dropped; deleting it would be a wasted call
+                if not expired:
+                    self.sessions.release(session_id, healthy)
     
     def match_jd_resume(self, job_description, resume_text):
         """
         Perform semantic similarity matching between job description and resume text.
         Returns match score (0-100) and explanation.
+
+        ``job_description`` is its text or a ParsedJobDescription, whose prompt text
+        was trimmed when it was registered.
         """
+        job_description = jd_registry.register(job_description)
         prompt = f"""
         You are an expert HR recruiter. Compare the following job description and resume text.
 
         JOB DESCRIPTION:
-        {job_description[:2000]}
+        {job_description.prompt_text}
 
         RESUME TEXT:
-        {resume_text[:4000]}
+        {parse_resume(resume_text).relevant_text(4000)}
 
         Please provide:
         1. A match score (0-100) indicating how well the resume fits the job description.
@@ -50,49 +201,52 @@ class JDMatcher:
         }}
         """
         try:
-            # Create session
-            session_response = self.assistant.create_session(
-                assistant_id=self.project_id
-            )
-            session_id = session_response.get_result()['session_id']
-            
-            # Send message to Watson
-            response = self.assistant.message(
-                assistant_id=self.project_id,
-                session_id=session_id,
-                input={
-                    'message_type': 'text',
-                    'text': prompt,
-                    'options': {
-                        'return_context': True
-                    }
-                }
-            )
-            
-            # Get the response
-            result = response.get_result()
+            result = self._message(prompt)
             assistant_response = result['output']['generic'][0]['text']
             
             # Parse JSON response
-            match_result = json.loads(assistant_response)
-            
-            # Clean up session
-            self.assistant.delete_session(
-                assistant_id=self.project_id,
-                session_id=session_id
-            )
-            
-            return match_result
+            return json.loads(assistant_response)
         except Exception as e:
             raise Exception(f"JD matching failed: {str(e)}")
 
+    def close(self):
+        self.sessions.close()
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_jd_matcher():
+    """
+    Process-wide JDMatcher, created on first use.
+
+    The client, its IAM token, its keep-alive connections and its session pool
+    are shared by every match. A few sessions are opened in the background as
+    soon as the client exists.
+
+    Raises:
+        Exception: If Watsonx.ai credentials are not configured
+    """
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                matcher = JDMatcher()
+                # Off the shared stage pool, so prewarming never delays pipeline stages
+                threading.Thread(target=matcher.sessions.prewarm, name='jd-session-prewarm', daemon=True).start()
+                atexit.register(matcher.close)
+                _matcher = matcher
+    return _matcher
+
 def match_job_description(job_description, resume_text):
+    LLM_CALLS.inc(service='jd_match')
     try:
-        matcher = JDMatcher()
-        return matcher.match_jd_resume(job_description, resume_text)
+        return get_jd_matcher().match_jd_resume(job_description, resume_text)
     except Exception as e:
         # Fallback mock
-        print(f"JD matching failed, using mock data: {str(e)}")
+        logger.warning(f"JD matching failed, using mock data: {str(e)}")
+        LLM_FALLBACKS.inc(service='jd_match')
         return {
             "match_score": 80,
             "explanation": "Candidate has relevant skills and experience matching the job description."
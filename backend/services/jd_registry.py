@@ -0,0 +1,164 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Optional
+
+from services.advanced_ranking import advanced_ranking_service
+from services.database import save_job_description, get_job_description
+
+# Parsed job descriptions kept in memory; least recently used ones are evicted first
+JD_CACHE_SIZE = int(os.getenv('JD_CACHE_SIZE', '256'))
+JD_CACHE_MAX_CHARS = int(os.getenv('JD_CACHE_MAX_CHARS', str(4 * 1024 * 1024)))
+
+# Characters of the job description sent to the LLM matcher
+JD_PROMPT_CHARS = 2000
+
+
+class UnknownJobDescription(Exception):
+    """Raised when a job description id was never registered"""
+
+
+# A job description parsed once and shared by every ranking and matching call.
+# ``requirement_skills`` pairs each multi-word requirement (lowercased) with the
+# skills it mentions; ``skills`` and ``keywords`` are the skill and culture
+# keywords the job description itself contains.
+ParsedJobDescription = namedtuple('ParsedJobDescription', [
+    'jd_id', 'text', 'prompt_text', 'requirements', 'requirement_skills', 'skills', 'keywords'
+])
+
+
+def job_description_hash(text: str) -> str:
+    """Content hash identifying a job description; surrounding whitespace is ignored"""
+    return hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+
+def parse_job_description(text: str, jd_id: str = None) -> ParsedJobDescription:
+    """Extract requirements, skills and keywords of a job description"""
+    service = advanced_ranking_service
+    extractor = service.feature_extractor
+    text = text.strip()
+
+    requirements = tuple(service._extract_job_requirements(text))
+    skills = [skill for category in service.skill_categories.values() for skill in category]
+    requirement_skills = tuple(
+        (requirement.lower(), tuple(skill for skill in skills if skill in requirement.lower()))
+        for requirement in requirements if len(requirement.split()) > 1
+    )
+
+    features = extractor.extract(text)
+    culture_keywords = list(dict.fromkeys(k for keywords in service.culture_keywords.values() for k in keywords))
+    return ParsedJobDescription(
+        jd_id=jd_id or job_description_hash(text),
+        text=text,
+        prompt_text=text[:JD_PROMPT_CHARS],
+        requirements=requirements,
+        requirement_skills=requirement_skills,
+        skills=tuple(extractor.found_keywords(features, skills)),
+        keywords=tuple(extractor.found_keywords(features, culture_keywords))
+    )
+
+
+class JDRegistry:
+    """
+    Job descriptions stored once and parsed once per process.
+
+    Each job description is saved under its content hash, which doubles as its
+    id, and its parse is memoised in an LRU bounded by entry count and total text
+    size. Evicted entries are re-parsed from the database on their next use.
+    """
+
+    def __init__(self, max_entries: int = JD_CACHE_SIZE, max_chars: int = JD_CACHE_MAX_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, jd_id):
+        with self._lock:
+            parsed = self._entries.get(jd_id)
+            if parsed is not None:
+                self._entries.move_to_end(jd_id)
+                self._hits += 1
+            else:
+                self._misses += 1
+            return parsed
+
+    def _remember(self, parsed):
+        with self._lock:
+            if parsed.jd_id in self._entries:
+                return self._entries[parsed.jd_id]
+            self._entries[parsed.jd_id] = parsed
+            self._chars += len(parsed.text)
+            while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.text)
+            return parsed
+
+    def register(self, job_description) -> Optional[ParsedJobDescription]:
+        """
+        Store and parse a job description, or return its memoised parse.
+
+        Args:
+            job_description: Job description text, or an already parsed one
+
+        Returns:
+            ParsedJobDescription: None for empty text
+
+        Raises:
+            ValueError: If ``job_description`` is neither text nor parsed
+        """
+        if job_description is None or isinstance(job_description, ParsedJobDescription):
+            return job_description
+        if not isinstance(job_description, str):
+            raise ValueError("Job description must be text")
+        if not job_description.strip():
+            return None
+
+        jd_id = job_description_hash(job_description)
+        parsed = self._lookup(jd_id)
+        if parsed is None:
+            parsed = parse_job_description(job_description, jd_id)
+            save_job_description(jd_id, parsed.text)
+            parsed = self._remember(parsed)
+        return parsed
+
+    def get(self, jd_id: str) -> Optional[ParsedJobDescription]:
+        """Parsed job description by id, or None if it was never registered"""
+        parsed = self._lookup(jd_id)
+        if parsed is None:
+            text = get_job_description(jd_id)
+            if text is None:
+                return None
+            parsed = self._remember(parse_job_description(text, jd_id))
+        return parsed
+
+    def resolve(self, jd_id: str = None, text: str = None) -> Optional[ParsedJobDescription]:
+        """
+        Job description of a request: the registered ``jd_id`` if given, else ``text``.
+
+        Raises:
+            UnknownJobDescription: If ``jd_id`` was never registered
+        """
+        if jd_id:
+            parsed = self.get(jd_id)
+            if parsed is None:
+                raise UnknownJobDescription(f"Unknown job description: {jd_id}")
+            return parsed
+        return self.register(text)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'characters': self._chars,
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+# Global registry shared by the API and the resume pipeline
+jd_registry = JDRegistry()
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds its maximum number of pending jobs"""
+
+
+class JobQueue:
+    """Bounded worker pool that runs resume processing jobs off the request thread"""
+
+    def __init__(self, max_workers=4, max_pending=100, retention_seconds=3600):
+        """
+        Args:
+            max_workers (int): Number of jobs processed concurrently
+            max_pending (int): Maximum queued plus running jobs before submissions are rejected
+            retention_seconds (int): How long finished jobs stay available for polling
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._changed = threading.Condition(self._lock)
+        self._active = 0
+
+    def submit(self, func, *args, block=False, timeout=None, **kwargs):
+        """
+        Queue ``func(*args, on_progress=..., **kwargs)`` for background execution.
+
+        Args:
+            block (bool): Wait for a free slot instead of raising ``JobQueueFull``
+            timeout (float): Maximum seconds to wait when ``block`` is set
+
+        Returns:
+            str: Job id to poll with ``get_job``
+        """
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._prune_finished()
+            if block:
+                self._not_full.wait_for(lambda: self._active < self.max_pending, timeout)
+            if self._active >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({self.max_pending} pending jobs)")
+            self._active += 1
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'current_stage': None,
+                'stages': [],
+                'result': None,
+                'error': None,
+                '_events': [],
+                '_finished_monotonic': None
+            }
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get_job(self, job_id, include_result=True):
+        """Return a snapshot of the job state, or None if the job is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {k: v for k, v in job.items() if not k.startswith('_')}
+            snapshot['stages'] = list(job['stages'])
+        if not include_result:
+            snapshot.pop('result', None)
+        return snapshot
+
+    def iter_events(self, job_id, start=0, heartbeat_seconds=15):
+        """
+        Yield job events as they happen, blocking between them.
+
+        Each event is ``(index, name, data)``: one per completed pipeline stage with the
+        stage's partial result, then a final ``completed`` event carrying the result or a
+        ``failed`` event carrying the error. ``(None, None, None)`` is yielded whenever
+        ``heartbeat_seconds`` pass without news so streaming callers can keep the
+        connection alive. Iteration stops after the final event or if the job expires.
+
+        Args:
+            start (int): Index of the first event to yield, for resuming a stream
+        """
+        index = start
+        while True:
+            with self._lock:
+                # Every stage and the final outcome append an event, so waiting on the
+                # event count covers progress and completion alike
+                self._changed.wait_for(
+                    lambda: job_id not in self._jobs or len(self._jobs[job_id]['_events']) > index,
+                    heartbeat_seconds
+                )
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                new_events = job['_events'][index:]
+                finished = job['_finished_monotonic'] is not None
+
+            if not new_events:
+                yield None, None, None
+            for name, data in new_events:
+                yield index, name, data
+                index += 1
+            if finished and index >= len(job['_events']):
+                return
+
+    def stats(self):
+        """Return queue occupancy counters"""
+        with self._lock:
+            counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'jobs': counts
+            }
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, status='running', started_at=datetime.now().isoformat())
+
+        def on_progress(stage, partial_result=None):
+            with self._lock:
+                job = self._jobs[job_id]
+                job['current_stage'] = stage
+                job['stages'].append({'stage': stage, 'completed_at': datetime.now().isoformat()})
+                job['_events'].append((stage, partial_result))
+                self._changed.notify_all()
+
+        try:
+            result = func(*args, on_progress=on_progress, **kwargs)
+            self._finish(job_id, status='completed', result=result)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self._finish(job_id, status='failed', error=str(e))
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            job['finished_at'] = datetime.now().isoformat()
+            if job['status'] == 'completed':
+                job['_events'].append(('completed', job['result']))
+            else:
+                job['_events'].append(('failed', {'error': job['error']}))
+            job['_finished_monotonic'] = time.monotonic()
+            self._active -= 1
+            self._not_full.notify()
+            self._changed.notify_all()
+
+    def _prune_finished(self):
+        """Drop finished jobs older than the retention window (caller holds the lock)"""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['_finished_monotonic'] is not None and job['_finished_monotonic'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Global instance shared by the interactive upload endpoints
+job_queue = JobQueue(
+    max_workers=int(os.getenv('UPLOAD_WORKERS', '4')),
+    max_pending=int(os.getenv('UPLOAD_QUEUE_SIZE', '100')),
+    retention_seconds=int(os.getenv('JOB_RETENTION_SECONDS', '3600'))
+)
+
+# Bulk uploads get their own workers and bound, so a large batch never fills
+# the queue that single and streaming uploads are rejected from
+batch_job_queue = JobQueue(
+    max_workers=int(os.getenv('BATCH_UPLOAD_WORKERS', '2')),
+    max_pending=int(os.getenv('BATCH_QUEUE_SIZE', '20')),
+    retention_seconds=int(os.getenv('JOB_RETENTION_SECONDS', '3600'))
+)
+
+
+def find_job_queue(job_id):
+    """The queue holding ``job_id``, or None if neither queue knows it"""
+    for queue in (job_queue, batch_job_queue):
+        if queue.get_job(job_id, include_result=False) is not None:
+            return queue
+    return None
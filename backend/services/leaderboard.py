@@ -0,0 +1,190 @@
+import os
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from services.database import get_leaderboard_entries, get_leaderboard_rows, get_candidate_changes
+
+# Share of each score in a candidate's leaderboard score
+LEADERBOARD_WEIGHTS = {'match_score': 0.5, 'overall_advanced_score': 0.5}
+
+# Job description leaderboards kept in memory; least recently used ones are reloaded on demand
+LEADERBOARD_CACHE_SIZE = int(os.getenv('LEADERBOARD_CACHE_SIZE', '64'))
+
+# Rank window returned when the caller does not ask for a limit
+DEFAULT_WINDOW_SIZE = 50
+MAX_WINDOW_SIZE = 500
+
+
+def _score(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else 0.0
+
+
+def leaderboard_score(match_score, advanced_score) -> float:
+    """Weighted leaderboard score from a JD match score and an overall advanced score; missing scores count as 0"""
+    return (LEADERBOARD_WEIGHTS['match_score'] * _score(match_score) +
+            LEADERBOARD_WEIGHTS['overall_advanced_score'] * _score(advanced_score))
+
+
+class JDLeaderboard:
+    """
+    Candidates screened against one job description, kept in rank order.
+
+    Sort keys live in a list ordered with ``bisect``: finding a candidate's
+    position is a binary search, and an arrival is inserted where it belongs
+    instead of re-sorting the board. Ties go to the earlier upload.
+    """
+
+    def __init__(self, jd_id: str):
+        self.jd_id = jd_id
+        self._keys = []
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, candidate_id, filename, upload_date, match_score, advanced_score) -> int:
+        """Insert or re-score a candidate and return their 1-based rank"""
+        self.remove(candidate_id)
+        score = leaderboard_score(match_score, advanced_score)
+        key = (-score, upload_date or '', candidate_id)
+        bisect.insort(self._keys, key)
+        self._entries[candidate_id] = {
+            'key': key,
+            'candidate_id': candidate_id,
+            'filename': filename,
+            'match_score': match_score,
+            'overall_advanced_score': advanced_score,
+            'leaderboard_score': score
+        }
+        return bisect.bisect_left(self._keys, key) + 1
+
+    def remove(self, candidate_id) -> bool:
+        entry = self._entries.pop(candidate_id, None)
+        if entry is None:
+            return False
+        del self._keys[bisect.bisect_left(self._keys, entry['key'])]
+        return True
+
+    def _percentile(self, rank):
+        # Share of the other candidates ranked below; the leader is at 100
+        total = len(self._keys)
+        return 100.0 if total <= 1 else round((total - rank) / (total - 1) * 100, 2)
+
+    def _public(self, entry, rank):
+        result = {field: value for field, value in entry.items() if field != 'key'}
+        result['rank'] = rank
+        result['percentile'] = self._percentile(rank)
+        return result
+
+    def position(self, candidate_id) -> Optional[Dict]:
+        """Rank, percentile and scores of a candidate, or None if they are not on the board"""
+        entry = self._entries.get(candidate_id)
+        if entry is None:
+            return None
+        return self._public(entry, bisect.bisect_left(self._keys, entry['key']) + 1)
+
+    def window(self, offset: int = 0, limit: int = DEFAULT_WINDOW_SIZE) -> List[Dict]:
+        """Entries ranked ``offset + 1`` to ``offset + limit``"""
+        return [
+            self._public(self._entries[key[2]], rank)
+            for rank, key in enumerate(self._keys[offset:offset + limit], start=offset + 1)
+        ]
+
+
+class LeaderboardRegistry:
+    """
+    Per job description leaderboards, loaded from the database on first use and
+    updated in place as the pipeline saves candidates.
+
+    Before every read the registry replays the database's candidate change log,
+    so candidates saved or deleted by any process reach the loaded boards.
+    """
+
+    def __init__(self, max_boards: int = LEADERBOARD_CACHE_SIZE):
+        self.max_boards = max_boards
+        self._boards = OrderedDict()
+        self._seq = None
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        """Re-place candidates saved or deleted since the last sync (caller holds the lock)"""
+        seq, changed = get_candidate_changes(self._seq or 0)
+        # Boards load the current state, so changes before the first sync need no replay
+        if changed and self._seq is not None and self._boards:
+            rows = get_leaderboard_rows(changed)
+            for candidate_id in changed:
+                for board in self._boards.values():
+                    board.remove(candidate_id)
+                row = rows.get(candidate_id)
+                if row is not None and row[0] in self._boards:
+                    self._boards[row[0]].add(candidate_id, *row[1:])
+        self._seq = seq
+
+    def _board(self, jd_id) -> JDLeaderboard:
+        self._sync()
+        board = self._boards.get(jd_id)
+        if board is not None:
+            self._boards.move_to_end(jd_id)
+            return board
+        board = JDLeaderboard(jd_id)
+        for candidate_id, filename, upload_date, match_score, advanced_score in get_leaderboard_entries(jd_id):
+            board.add(candidate_id, filename, upload_date, match_score, advanced_score)
+        self._boards[jd_id] = board
+        while len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+        return board
+
+    def record(self, candidate_data) -> Optional[Dict]:
+        """
+        Place a saved candidate on the leaderboard of their job description.
+
+        Args:
+            candidate_data (dict): Candidate as passed to ``save_candidate``
+
+        Returns:
+            dict: The candidate's rank, percentile and board size, or None
+                without a job description
+        """
+        candidate_id = candidate_data['id']
+        jd_id = candidate_data.get('jd_id')
+        with self._lock:
+            # A re-analysed candidate leaves the board of their previous job description
+            for board in self._boards.values():
+                if board.jd_id != jd_id:
+                    board.remove(candidate_id)
+            if not jd_id:
+                return None
+            board = self._board(jd_id)
+            board.add(
+                candidate_id,
+                candidate_data.get('filename'),
+                candidate_data.get('upload_date'),
+                (candidate_data.get('jd_match_result') or {}).get('match_score'),
+                (candidate_data.get('advanced_ranking') or {}).get('overall_advanced_score')
+            )
+            return {**board.position(candidate_id), 'total_candidates': len(board)}
+
+    def window(self, jd_id: str, offset: int = 0, limit: int = DEFAULT_WINDOW_SIZE) -> Dict:
+        """A page of a job description's leaderboard, best first"""
+        with self._lock:
+            board = self._board(jd_id)
+            return {
+                'jd_id': jd_id,
+                'total_candidates': len(board),
+                'offset': offset,
+                'limit': limit,
+                'leaderboard': board.window(offset, limit)
+            }
+
+    def position(self, jd_id: str, candidate_id: str) -> Optional[Dict]:
+        """A candidate's rank and percentile on a job description's leaderboard, or None"""
+        with self._lock:
+            board = self._board(jd_id)
+            position = board.position(candidate_id)
+            return None if position is None else {**position, 'jd_id': jd_id, 'total_candidates': len(board)}
+
+
+# Global registry shared by the API and the resume pipeline
+leaderboards = LeaderboardRegistry()
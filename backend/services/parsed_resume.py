@@ -0,0 +1,126 @@
+import os
+import re
+from collections import namedtuple
+from functools import cached_property
+
+# Resume text beyond this many characters is ignored, bounding the work every analyzer
+# does on one upload; a 100-page PDF extracts to well under this
+MAX_RESUME_CHARS = int(os.getenv('MAX_RESUME_CHARS', '500000'))
+
+# Section headings, mapped to the canonical section they start
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'],
+    'education': ['education', 'academic background', 'qualifications'],
+    'skills': ['skills', 'technical skills', 'core skills', 'key skills', 'core competencies', 'technologies'],
+    'projects': ['projects', 'personal projects', 'key projects'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'licenses and certifications'],
+    'awards': ['awards', 'honors', 'achievements'],
+    'publications': ['publications'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies']
+}
+
+# Order in which sections are handed to the LLM when the budget cannot fit them all
+RELEVANT_SECTIONS = ('skills', 'experience', 'projects', 'education', 'certifications', 'summary')
+
+_HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# A heading is a line holding only the heading, or the heading followed by a colon and inline content
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(' + '|'.join(sorted(map(re.escape, _HEADING_SECTION), key=len, reverse=True)) + r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+_LINK_PATTERN = re.compile(r'(?:https?://|www\.)[^\s<>"\'()\[\]]+', re.IGNORECASE)
+
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DATE = rf'(?:{_MONTH}\s+|\d{{1,2}}/)?((?:19|20)\d{{2}})'
+_DATE_RANGE_PATTERN = re.compile(
+    rf'\b{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|(present|current|now)\b)',
+    re.IGNORECASE
+)
+
+DateRange = namedtuple('DateRange', ['text', 'start_year', 'end_year', 'span'])
+
+
+class ParsedResume:
+    """
+    Resume text parsed once per upload and shared by every analyzer.
+
+    Each view is computed on first use and cached, so analyzers that need the same
+    view (usually the lowercased text) do not rescan the resume.
+    """
+
+    def __init__(self, text: str):
+        # The full text is kept for storage; analyzers only ever see the capped ``text``
+        self.full_text = text or ''
+        self.text = self.full_text[:MAX_RESUME_CHARS]
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> tuple:
+        """Lowercased word tokens; keeps ``c++``, ``c#`` and ``node.js`` intact"""
+        return tuple(_TOKEN_PATTERN.findall(self.lower))
+
+    @cached_property
+    def sections(self) -> dict:
+        """Section name -> (start, end) character span of its content in ``text``"""
+        headings = [(match.group(1).lower(), match.start(), match.end()) for match in _HEADING_PATTERN.finditer(self.text)]
+        sections = {}
+        for i, (heading, _, content_start) in enumerate(headings):
+            end = headings[i + 1][1] if i + 1 < len(headings) else len(self.text)
+            section = _HEADING_SECTION[heading]
+            # Repeated headings extend the first occurrence's span
+            start = sections[section][0] if section in sections else content_start
+            sections[section] = (start, end)
+        return sections
+
+    @cached_property
+    def date_ranges(self) -> list:
+        """Date ranges such as ``Jan 2019 - Present``; ``end_year`` is None for ongoing ones"""
+        ranges = []
+        for match in _DATE_RANGE_PATTERN.finditer(self.text):
+            start_year, end_year, ongoing = match.groups()
+            ranges.append(DateRange(
+                match.group(0), int(start_year), None if ongoing else int(end_year), match.span()
+            ))
+        return ranges
+
+    @cached_property
+    def links(self) -> list:
+        """URLs in document order, without trailing punctuation"""
+        return [match.group(0).rstrip('.,;:') for match in _LINK_PATTERN.finditer(self.text)]
+
+    def section(self, name: str) -> str:
+        """Content of a section, or an empty string if the resume has none"""
+        span = self.sections.get(name)
+        return self.text[span[0]:span[1]].strip() if span else ''
+
+    def relevant_text(self, max_chars: int = 4000) -> str:
+        """
+        Text for LLM prompts: the sections that matter for screening, most relevant
+        first, trimmed to ``max_chars``. Falls back to the start of the resume when
+        no sections are recognised.
+        """
+        parts = []
+        for name in RELEVANT_SECTIONS:
+            content = self.section(name)
+            if content:
+                parts.append(f"{name.upper()}:\n{content}")
+        if not parts:
+            return self.text[:max_chars]
+        return "\n\n".join(parts)[:max_chars]
+
+
+def parse_resume(resume) -> ParsedResume:
+    """Return ``resume`` as a ParsedResume, parsing it if it is still a string"""
+    if isinstance(resume, ParsedResume):
+        return resume
+    return ParsedResume(resume)
@@ -1,13 +1,17 @@
 import requests
 import re
 
+from services.parsed_resume import parse_resume
+
 def extract_links(text):
     """Extract LinkedIn and GitHub URLs from text"""
-    linkedin_pattern = r'https?://(www\.)?linkedin\.com/in/[A-Za-z0-9_-]+'
-    github_pattern = r'https?://(www\.)?github\.com/[A-Za-z0-9_-]+'
+    linkedin_pattern = re.compile(r'https?://(www\.)?linkedin\.com/in/[A-Za-z0-9_-]+')
+    github_pattern = re.compile(r'https?://(www\.)?github\.com/[A-Za-z0-9_-]+')
     
-    linkedin_links = re.findall(linkedin_pattern, text)
-    github_links = re.findall(github_pattern, text)
+    # Match against the links found when the resume was parsed instead of rescanning it
+    links = parse_resume(text).links
+    linkedin_links = [match.group(0) for match in map(linkedin_pattern.match, links) if match]
+    github_links = [match.group(0) for match in map(github_pattern.match, links) if match]
     
     return linkedin_links, github_links
 
@@ -28,7 +32,7 @@ def verify_github_profile(url):
     try:
         username = url.rstrip('/').split('/')[-1]
         api_url = f'https://api.github.com/users/{username}'
-        response = requests.get(api_url)
+        response = requests.get(api_url, timeout=10)
         if response.status_code == 200:
             data = response.json()
             return {
@@ -1,40 +1,408 @@
 import PyPDF2
-from docx import Document
 import os
+import re
+import gzip
+import time
+import uuid
+import zipfile
+import atexit
+import logging
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+from services.file_store import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes so cached analyses are recomputed
+PARSER_VERSION = '3'
+
+# PDF extraction limits; pages past the cap are ignored
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '100'))
+PDF_EXTRACT_TIMEOUT = float(os.getenv('PDF_EXTRACT_TIMEOUT', '60'))
+
+# Compressed extracted-text artifacts, stored next to the uploads folder
+TEXT_CACHE_FOLDER = os.getenv('TEXT_CACHE_FOLDER', 'text_cache')
+
+# Rough characters-per-token ratio used to turn token budgets into character budgets
+APPROX_CHARS_PER_TOKEN = 4
+
+# PDFs are parsed in worker processes so a pathological page can be killed;
+# documents with at least this many pages are also split across the workers
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# WordprocessingML elements read by the DOCX extractor
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_DOCX_PART = re.compile(r'word/(header|footer)(\d*)\.xml$')
+
+def _extract_pdf_page_range(file_path, start, end):
+    """Extract the text of pages ``start`` to ``end - 1``; runs inside pool workers"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [pdf_reader.pages[i].extract_text() or '' for i in range(start, end)]
+
+def _extract_pdf_pages(file_path, max_pages, parallel):
+    """
+    Count the pages, capped at ``max_pages``, and extract them unless the document
+    is to be split across workers; runs inside pool workers.
+
+    Returns:
+        tuple: (page count, page texts, or None when the pages are left for split tasks)
+    """
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        page_count = min(len(pdf_reader.pages), max_pages)
+        if parallel is None:
+            parallel = PDF_WORKERS > 1 and page_count >= PDF_PARALLEL_MIN_PAGES
+        if parallel:
+            return page_count, None
+        return page_count, [pdf_reader.pages[i].extract_text() or '' for i in range(page_count)]
+
+def _extract_pdf_prefix(file_path, max_pages, budget):
+    """Extract pages until ``budget`` characters are reached; runs inside pool workers"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return _collect_prefix(
+            (pdf_reader.pages[i].extract_text() or '' for i in range(min(len(pdf_reader.pages), max_pages))),
+            budget
+        )
+
+def _collect_prefix(chunks, budget):
+    """Take text chunks until ``budget`` characters are reached; (chunks, True if none were left)"""
+    taken = []
+    length = 0
+    for chunk in chunks:
+        if budget is not None and length >= budget:
+            return taken, False
+        taken.append(chunk)
+        length += len(chunk) + 1
+    return taken, True
+
+def _page_ranges(page_count, parts):
+    """Split ``page_count`` pages into at most ``parts`` contiguous ranges"""
+    size = -(-page_count // parts)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+class PdfWorkerPool:
+    """
+    Long-lived process pool that runs PDF parsing under a wall-clock budget.
+
+    Workers are spawned rather than forked, so they never inherit a lock held
+    by one of the server's threads. A page cannot be interrupted mid-parse, so
+    a task that overruns its budget gets the whole pool terminated and
+    replaced; callers whose tasks were lost with it resubmit them within what
+    is left of their own budget.
+    """
+
+    def __init__(self, workers=PDF_WORKERS):
+        self.workers = max(1, workers)
+        self._context = multiprocessing.get_context('spawn')
+        self._pool = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _current(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._context.Pool(self.workers)
+                self._generation += 1
+            return self._pool, self._generation
+
+    def _recycle(self, generation):
+        """Terminate the pool if it is still the one ``generation`` ran on"""
+        with self._lock:
+            if self._pool is None or self._generation != generation:
+                return
+            pool, self._pool = self._pool, None
+        pool.terminate()
+        pool.join()
+
+    def starmap(self, func, tasks, timeout):
+        """
+        Run ``func(*args)`` for every args tuple in ``tasks`` and return the results in order.
+
+        Raises:
+            Exception: If the tasks do not finish within ``timeout`` seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            pool, generation = self._current()
+            try:
+                result = pool.starmap_async(func, tasks)
+            except ValueError:
+                # Another caller terminated this pool after we picked it up
+                continue
+            while not result.ready():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._recycle(generation)
+                    raise Exception(f"PDF extraction exceeded {timeout}s")
+                if self._generation != generation:
+                    break
+                result.wait(min(remaining, 0.25))
+            else:
+                return result.get()
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+# Global pool shared by every extraction
+pdf_worker_pool = PdfWorkerPool()
+atexit.register(pdf_worker_pool.close)
+
+def extract_text_from_pdf(file_path, max_pages=None, timeout=None, parallel=None):
+    """
+    Extract text from PDF file
+
+    Pages are parsed in ``pdf_worker_pool``, so every document, however short,
+    is killed once it exceeds its budget.
+
+    Args:
+        file_path (str): Path of the PDF
+        max_pages (int): Page cap, defaults to ``PDF_MAX_PAGES``
+        timeout (float): Wall-clock budget in seconds, defaults to ``PDF_EXTRACT_TIMEOUT``
+        parallel (bool): Force or disable splitting pages across workers; by default
+            documents with at least ``PDF_PARALLEL_MIN_PAGES`` pages are split
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    timeout = PDF_EXTRACT_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+        # Even opening the reader parses the page tree, so it happens in a worker
+        [(page_count, page_texts)] = pdf_worker_pool.starmap(
+            _extract_pdf_pages, [(file_path, max_pages, parallel)], timeout
+        )
+        if page_texts is None:
+            ranges = _page_ranges(page_count, PDF_WORKERS * 2) if page_count else []
+            chunks = pdf_worker_pool.starmap(
+                _extract_pdf_page_range, [(file_path, start, end) for start, end in ranges],
+                max(deadline - time.monotonic(), 0)
+            ) if ranges else []
+            page_texts = [text for chunk in chunks for text in chunk]
+        return "\n".join(page_texts).strip()
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
+def _docx_text_parts(archive):
+    """Names of the parts holding document text, in reading order: headers, body, footers"""
+    headers, footers = [], []
+    for name in archive.namelist():
+        match = _DOCX_PART.match(name)
+        if match:
+            target = headers if match.group(1) == 'header' else footers
+            target.append((int(match.group(2) or 0), name))
+    return [name for _, name in sorted(headers)] + ['word/document.xml'] + [name for _, name in sorted(footers)]
+
+def _iter_docx_part_paragraphs(stream):
+    """
+    Stream-parse one WordprocessingML part and yield the text of each paragraph.
+
+    Table cells are paragraphs too, so they come out in reading order. Paragraphs in a
+    text box are nested inside an outer paragraph and are yielded before it; the legacy
+    ``mc:Fallback`` copy of each text box is skipped so its text is not duplicated.
+    """
+    paragraphs = []  # text runs of the open paragraph and any enclosing ones
+    fallback_depth = 0
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if fallback_depth:
+            continue
+
+        if event == 'start':
+            if tag == _W + 'p':
+                paragraphs.append([])
+            continue
+
+        if tag == _W + 'p':
+            yield ''.join(paragraphs.pop())
+            elem.clear()
+        elif paragraphs:
+            if tag == _W + 't':
+                paragraphs[-1].append(elem.text or '')
+            elif tag == _W + 'tab':
+                paragraphs[-1].append('\t')
+            elif tag in (_W + 'br', _W + 'cr'):
+                paragraphs[-1].append('\n')
+
 def extract_text_from_docx(file_path):
     """Extract text from DOCX file"""
+    return "\n".join(iter_text_from_docx(file_path)).strip()
+
+def iter_text_from_pdf(file_path, max_pages=None):
+    """Yield the text of each PDF page, parsing a page only when it is requested"""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    try:
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for i in range(min(len(pdf_reader.pages), max_pages)):
+                yield pdf_reader.pages[i].extract_text() or ''
+    except Exception as e:
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+
+def iter_text_from_docx(file_path):
+    """Yield the text of each DOCX paragraph, including table cells, headers, footers and text boxes"""
     try:
-        doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text.strip()
+        with zipfile.ZipFile(file_path) as archive:
+            for part in _docx_text_parts(archive):
+                with archive.open(part) as stream:
+                    yield from _iter_docx_part_paragraphs(stream)
     except Exception as e:
         raise Exception(f"Failed to extract text from DOCX: {str(e)}")
 
-def extract_text_from_file(file_path):
-    """Extract text from resume file (PDF or DOCX)"""
+def _check_resume_file(file_path):
+    """Validate the file exists and return its format"""
     if not os.path.exists(file_path):
         raise Exception("File does not exist")
     
     file_extension = file_path.lower().split('.')[-1]
+    if file_extension not in ['pdf', 'docx', 'doc']:
+        raise Exception(f"Unsupported file format: {file_extension}")
+    return file_extension
+
+def iter_text_from_file(file_path):
+    """Lazily yield resume text in document order: pages for PDF, paragraphs for DOCX"""
+    file_extension = _check_resume_file(file_path)
     
     if file_extension == 'pdf':
-        return extract_text_from_pdf(file_path)
-    elif file_extension in ['docx', 'doc']:
-        return extract_text_from_docx(file_path)
+        return iter_text_from_pdf(file_path)
+    return iter_text_from_docx(file_path)
+
+def extract_text_prefix(file_path, max_chars=None, max_tokens=None, timeout=None):
+    """
+    Extract only as much text as downstream consumers will read.
+
+    Pages or paragraphs are parsed lazily and parsing stops once the budget is met.
+    PDF pages are parsed in ``pdf_worker_pool`` under the same wall-clock budget
+    as full extraction.
+
+    Args:
+        file_path (str): Path of the resume
+        max_chars (int): Character budget
+        max_tokens (int): Token budget, converted with ``APPROX_CHARS_PER_TOKEN``;
+            the smaller of the two budgets wins
+        timeout (float): PDF wall-clock budget in seconds, defaults to ``PDF_EXTRACT_TIMEOUT``
+
+    Returns:
+        tuple: (text prefix, True if the whole document fit within the budget)
+    """
+    budgets = [b for b in (max_chars, max_tokens * APPROX_CHARS_PER_TOKEN if max_tokens else None) if b]
+    budget = min(budgets) if budgets else None
+
+    if _check_resume_file(file_path) == 'pdf':
+        timeout = PDF_EXTRACT_TIMEOUT if timeout is None else timeout
+        try:
+            [(chunks, complete)] = pdf_worker_pool.starmap(
+                _extract_pdf_prefix, [(file_path, PDF_MAX_PAGES, budget)], timeout
+            )
+        except Exception as e:
+            raise Exception(f"Failed to extract text from PDF: {str(e)}")
     else:
-        raise Exception(f"Unsupported file format: {file_extension}")
+        text_iter = iter_text_from_docx(file_path)
+        try:
+            chunks, complete = _collect_prefix(text_iter, budget)
+        finally:
+            # Closes the underlying file when we stop early
+            text_iter.close()
+
+    text = "\n".join(chunks).strip()
+    if budget is not None and len(text) > budget:
+        return text[:budget], False
+    return text, complete
+
+def extract_text_from_file(file_path):
+    """Extract text from resume file (PDF or DOCX)"""
+    file_extension = _check_resume_file(file_path)
+    
+    if file_extension == 'pdf':
+        return extract_text_from_pdf(file_path)
+    return extract_text_from_docx(file_path)
+
+def _text_cache_path(content_hash, cache_folder=None):
+    """Artifact path for the text of a file, keyed by its content hash and the parser version"""
+    return os.path.join(cache_folder or TEXT_CACHE_FOLDER, f"{content_hash}.p{PARSER_VERSION}.txt.gz")
+
+def read_cached_text(content_hash, cache_folder=None):
+    """Return the cached extracted text for a file hash, or None on a miss"""
+    path = _text_cache_path(content_hash, cache_folder)
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        logger.warning(f"Discarding unreadable text cache entry {path}: {str(e)}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+def write_cached_text(content_hash, text, cache_folder=None):
+    """Store extracted text for a file hash; failures are logged, never raised"""
+    path = _text_cache_path(content_hash, cache_folder)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as file:
+            file.write(text)
+        # Readers never see a partially written artifact
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write text cache entry {path}: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def extract_text_cached(file_path, content_hash=None, cache_folder=None):
+    """
+    Extract text from a resume, reusing the cached artifact for identical file bytes.
+
+    Args:
+        file_path (str): Path of the resume
+        content_hash (str): SHA-256 of the file bytes, computed from the file if omitted
+        cache_folder (str): Cache directory, ``TEXT_CACHE_FOLDER`` by default
+
+    Returns:
+        str: Extracted text
+    """
+    if content_hash is None:
+        content_hash = hash_file(file_path)
+
+    text = read_cached_text(content_hash, cache_folder)
+    if text is None:
+        text = extract_text_from_file(file_path)
+        write_cached_text(content_hash, text, cache_folder)
+    return text
+
+def prune_text_cache(cache_folder=None):
+    """
+    Delete artifacts written by other parser versions and abandoned temp files.
+
+    Returns:
+        int: Number of files removed
+    """
+    cache_folder = cache_folder or TEXT_CACHE_FOLDER
+    if not os.path.isdir(cache_folder):
+        return 0
+
+    suffix = f".p{PARSER_VERSION}.txt.gz"
+    removed = 0
+    for name in os.listdir(cache_folder):
+        if name.endswith(suffix) or not name.endswith(('.txt.gz', '.tmp')):
+            continue
+        try:
+            os.remove(os.path.join(cache_folder, name))
+            removed += 1
+        except OSError as e:
+            logger.warning(f"Failed to remove stale text cache entry {name}: {str(e)}")
+    return removed
@@ -0,0 +1,300 @@
+import os
+import logging
+from datetime import datetime
+
+from services.resume_parser import (
+    extract_text_cached, extract_text_prefix, read_cached_text, write_cached_text, PARSER_VERSION
+)
+from services.watson_service import analyze_resume_with_watson, get_mock_analysis, ANALYSIS_VERSION
+from services.database import save_candidate, find_analysis_by_hash
+from services.bias_detection import (
+    analyze_resume_bias, create_blind_version, get_bias_detector, BIAS_ANALYZER_VERSION, BLIND_SCREENING_THRESHOLD
+)
+from services.profile_verification import enrich_candidate_profiles
+from services.jd_matching import match_job_description
+from services.advanced_ranking import advanced_ranking_service
+from services.batch_ranking import batch_ranking_engine
+from services.jd_registry import jd_registry
+from services.skill_index import candidate_search_fields
+from services.leaderboard import leaderboards
+from services.semantic_prefilter import encode_text_vector, TEXT_VECTOR_VERSION
+from services.hr_integration import send_candidate_to_hr
+from services.file_store import hash_file
+from services.parsed_resume import parse_resume
+from services.stage_scheduler import StageScheduler, stage_executor
+from services.metrics import PIPELINE_STAGE_SECONDS, HR_PUSH_FAILURES
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages reported to progress callbacks; independent stages may finish in any order
+PIPELINE_STAGES = [
+    'extracted',
+    'bias_analysed',
+    'blind_created',
+    'llm_analysed',
+    'enriched',
+    'jd_matched',
+    'ranked',
+    'hr_pushed',
+    'saved'
+]
+
+# Per-stage timeouts in seconds; network stages fall back to empty or mock results
+CPU_STAGE_TIMEOUT = float(os.getenv('CPU_STAGE_TIMEOUT', '30'))
+LLM_STAGE_TIMEOUT = float(os.getenv('LLM_STAGE_TIMEOUT', '90'))
+NETWORK_STAGE_TIMEOUT = float(os.getenv('NETWORK_STAGE_TIMEOUT', '30'))
+
+# Resumes whose text fits in this many characters are extracted in one lazy pass;
+# longer ones are extracted in full, since the LLM and JD matcher pick sections
+# from anywhere in the document
+ANALYSIS_CHAR_BUDGET = int(os.getenv('ANALYSIS_CHAR_BUDGET', '4000'))
+
+
+def _report(on_progress, stage, partial_result=None):
+    """Notify the progress callback, never letting it break the pipeline"""
+    if on_progress is None:
+        return
+    try:
+        on_progress(stage, partial_result)
+    except Exception as e:
+        logger.error(f"Progress callback failed at stage {stage}: {str(e)}")
+
+
+def _timed_stage(stage, func):
+    """Wrap a stage function so its runtime is recorded in the stage histogram"""
+    def wrapper(**kwargs):
+        with PIPELINE_STAGE_SECONDS.time(stage=stage):
+            return func(**kwargs)
+    return wrapper
+
+
+def _progress_payload(stage, result):
+    """Partial result sent to progress callbacks for a finished stage"""
+    if stage == 'extracted':
+        return {'characters': len(result.text)}
+    if stage == 'blind_created':
+        return {'removed_personal_info': result[1]}
+    if stage == 'ranked':
+        return {key: result[1][key] for key in ('overall_advanced_score', 'ranking_tier')}
+    return result
+
+
+def get_analyzer_version():
+    """Version stamp of every analyzer whose output a deduplicated upload reuses"""
+    bias_version = f"{BIAS_ANALYZER_VERSION}.{get_bias_detector().version}"
+    return f"parser-{PARSER_VERSION}/bias-{bias_version}/llm-{ANALYSIS_VERSION}"
+
+
+def push_candidate_to_hr(candidate_data):
+    """Send a processed candidate to the HR system configured in the environment"""
+    hr_system = os.getenv('HR_SYSTEM', 'workday')  # default to workday
+    try:
+        hr_api_key = os.getenv('HR_API_KEY')
+        hr_api_url = os.getenv('HR_API_URL')
+        hr_response = send_candidate_to_hr(hr_system, candidate_data, api_key=hr_api_key, api_url=hr_api_url)
+        if not hr_response.get('success', False):
+            logger.error(f"Failed to send candidate to HR system: {hr_response.get('error')}")
+            HR_PUSH_FAILURES.inc(system=hr_system)
+        return hr_response
+    except Exception as e:
+        logger.error(f"Exception during HR system integration: {str(e)}")
+        HR_PUSH_FAILURES.inc(system=hr_system)
+        return {'success': False, 'error': str(e)}
+
+
+def process_resume(file_path, filename, file_id, job_description=None, content_hash=None,
+                   on_progress=None, reuse_analysis=True):
+    """
+    Run the full analysis pipeline for a resume that has already been saved to disk.
+
+    Files whose bytes were already analysed with the current analyzer versions are not
+    re-analysed; the new record references the stored analysis instead. Text extracted
+    from the same bytes by the current parser is read from the text cache.
+
+    Args:
+        file_path (str): Path of the saved resume file
+        filename (str): Sanitized original filename
+        file_id (str): Candidate id to store the results under
+        job_description: Optional job description text, or a ParsedJobDescription from
+            the JD registry, to match against
+        content_hash (str): SHA-256 of the file bytes, computed from the file if omitted
+        on_progress (callable): Optional ``on_progress(stage, partial_result)`` hook
+            called after each stage in ``PIPELINE_STAGES`` completes
+        reuse_analysis (bool): Set to False to force a fresh analysis
+
+    Returns:
+        dict: Upload response payload
+    """
+    if content_hash is None:
+        content_hash = hash_file(file_path)
+    # Parsed once per distinct job description, however many resumes are screened against it
+    job_description = jd_registry.register(job_description)
+    analysis_version = get_analyzer_version()
+
+    existing = find_analysis_by_hash(content_hash, analysis_version) if reuse_analysis else None
+    scheduler = StageScheduler(stage_executor)
+    if existing:
+        analysis_ref = existing['id']
+        resume_text = existing['resume_text']
+        analysis_resume = parse_resume(resume_text or '')
+
+        # The stored file is enough; drop the duplicate copy
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+        _report(on_progress, 'extracted', {'characters': len(resume_text or ''), 'deduplicated': True})
+        reused = {
+            'bias_analysed': existing['bias_analysis'],
+            'blind_created': (existing['blind_resume_text'], existing['removed_personal_info']),
+            'llm_analysed': existing['analysis_result'],
+            'enriched': existing['profile_enrichment']
+        }
+        for stage, result in reused.items():
+            scheduler.add(stage, lambda result=result: result)
+        ranking_dependencies = ()
+    else:
+        analysis_ref = None
+        analysis_resume = None
+
+        # Files parsed before skip extraction entirely. Otherwise a lazy pass reads up
+        # to the budget; a document that fits is done, a longer one is extracted in
+        # full. Each text is segmented once and the ParsedResume is shared by every
+        # analyzer.
+        cached_text = read_cached_text(content_hash)
+        if cached_text is not None:
+            prefix_text, complete = cached_text, True
+        else:
+            with PIPELINE_STAGE_SECONDS.time(stage='prefix_extracted'):
+                prefix_text, complete = extract_text_prefix(file_path, max_chars=ANALYSIS_CHAR_BUDGET)
+
+        if complete:
+            def extract():
+                if cached_text is None:
+                    write_cached_text(content_hash, prefix_text)
+                return parse_resume(prefix_text)
+        else:
+            extract = _timed_stage('extracted', lambda: parse_resume(extract_text_cached(file_path, content_hash)))
+
+        # PDF extraction, prefix or full, enforces its own wall-clock budget
+        scheduler.add('extracted', extract)
+        scheduler.add(
+            'bias_analysed', _timed_stage('bias_analysed', lambda extracted: analyze_resume_bias(extracted)),
+            depends_on=('extracted',),
+            timeout=CPU_STAGE_TIMEOUT
+        )
+        scheduler.add(
+            'blind_created', _timed_stage('blind_created', lambda extracted: create_blind_version(extracted)),
+            depends_on=('extracted',),
+            timeout=CPU_STAGE_TIMEOUT
+        )
+
+        def analyze(extracted, bias_analysed, blind_created):
+            # The stored full-text bias result decides whether the LLM sees the blind version
+            if bias_analysed['overall_bias_score'] > BLIND_SCREENING_THRESHOLD:
+                return analyze_resume_with_watson(blind_created[0])
+            return analyze_resume_with_watson(extracted)
+
+        scheduler.add(
+            'llm_analysed', _timed_stage('llm_analysed', analyze),
+            depends_on=('extracted', 'bias_analysed', 'blind_created'),
+            timeout=LLM_STAGE_TIMEOUT,
+            fallback=lambda extracted, **_: get_mock_analysis(extracted)
+        )
+        scheduler.add(
+            'enriched', _timed_stage('enriched', lambda extracted: enrich_candidate_profiles(extracted)),
+            depends_on=('extracted',),
+            timeout=NETWORK_STAGE_TIMEOUT,
+            fallback={'linkedin_profiles': [], 'github_profiles': []}
+        )
+        ranking_dependencies = ('extracted',)
+
+    def match_jd(extracted=None):
+        if not job_description:
+            return None
+        with PIPELINE_STAGE_SECONDS.time(stage='jd_matched'):
+            return match_job_description(job_description, extracted or analysis_resume)
+
+    scheduler.add(
+        'jd_matched', match_jd,
+        depends_on=ranking_dependencies,
+        timeout=LLM_STAGE_TIMEOUT,
+        fallback=None
+    )
+
+    def rank(extracted=None):
+        # Feature vectors and component scores are stored so batch rankings can
+        # re-score and re-weight without the text
+        features = advanced_ranking_service.extract_features(extracted or analysis_resume)
+        return features, advanced_ranking_service.generate_advanced_ranking(features, job_description)
+
+    scheduler.add(
+        'ranked', _timed_stage('ranked', rank),
+        depends_on=ranking_dependencies,
+        timeout=CPU_STAGE_TIMEOUT
+    )
+
+    results, degraded_stages = scheduler.run(
+        on_complete=lambda stage, result: _report(on_progress, stage, _progress_payload(stage, result))
+    )
+    if not analysis_ref:
+        resume_text = results['extracted'].full_text
+    bias_analysis = results['bias_analysed']
+    blind_resume, removed_info = results['blind_created']
+    analysis_result = results['llm_analysed']
+    profile_enrichment = results['enriched']
+    jd_match_result = results['jd_matched']
+    ranking_features, advanced_ranking = results['ranked']
+    encoded_features, encoded_components = batch_ranking_engine.encode_candidate(ranking_features)
+    skills, years_experience, relevance_score = candidate_search_fields(analysis_result, advanced_ranking)
+    # Term vector for offline shortlisting against future job descriptions
+    text_vector = encode_text_vector(analysis_resume if analysis_ref else results['extracted'])
+
+    # Prepare candidate data dictionary
+    candidate_data = {
+        'id': file_id,
+        'filename': filename,
+        'upload_date': datetime.now().isoformat(),
+        'resume_text': resume_text,
+        'blind_resume_text': blind_resume,
+        'analysis_result': analysis_result,
+        'bias_analysis': bias_analysis,
+        'removed_personal_info': removed_info,
+        'profile_enrichment': profile_enrichment,
+        'jd_match_result': jd_match_result,
+        'advanced_ranking': advanced_ranking,
+        'ranking_features': encoded_features,
+        'ranking_components': encoded_components,
+        'ranking_features_version': batch_ranking_engine.version,
+        'content_hash': content_hash,
+        'analysis_version': analysis_version,
+        'analysis_ref': analysis_ref,
+        'jd_id': job_description.jd_id if job_description else None,
+        'skills': skills,
+        'years_experience': years_experience,
+        'relevance_score': relevance_score,
+        'text_vector': text_vector,
+        'text_vector_version': TEXT_VECTOR_VERSION
+    }
+
+    # Example: Send shortlisted candidate to HR system (e.g., Workday)
+    # This can be conditional or triggered by a separate API in real use
+    with PIPELINE_STAGE_SECONDS.time(stage='hr_pushed'):
+        hr_response = push_candidate_to_hr(candidate_data)
+    _report(on_progress, 'hr_pushed', {'success': hr_response.get('success', False)})
+
+    with PIPELINE_STAGE_SECONDS.time(stage='saved'):
+        save_candidate(candidate_data)
+    leaderboard_position = leaderboards.record(candidate_data)
+    _report(on_progress, 'saved', {'candidate_id': file_id, 'leaderboard': leaderboard_position})
+
+    return {
+        'success': True,
+        'candidate_id': file_id,
+        'analysis': analysis_result,
+        'bias_analysis': bias_analysis,
+        'fair_screening_available': True,
+        'deduplicated': analysis_ref is not None,
+        'analysis_ref': analysis_ref,
+        'degraded_stages': degraded_stages,
+        'leaderboard': leaderboard_position
+    }
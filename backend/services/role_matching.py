@@ -0,0 +1,163 @@
+import threading
+from collections import namedtuple
+from datetime import datetime
+from typing import Dict, Union
+
+import numpy as np
+
+from services.advanced_ranking import advanced_ranking_service
+from services.batch_ranking import BatchRankingEngine
+from services.database import get_open_job_descriptions
+from services.jd_registry import jd_registry
+from services.parsed_resume import ParsedResume, parse_resume
+from services.semantic_prefilter import vectorize, cosine_similarities
+
+# Share of each signal in a role's fit score
+ROLE_FIT_WEIGHTS = {'similarity': 0.5, 'skill_coverage': 0.3, 'requirement_coverage': 0.2}
+
+# Roles returned when the caller does not ask for a limit
+DEFAULT_ROLE_MATCHES = 10
+MAX_ROLE_MATCHES = 100
+
+# Everything about the open requisitions that scoring a resume needs, built once per set of open roles
+OpenRoles = namedtuple('OpenRoles', [
+    'key', 'roles', 'titles', 'terms', 'role_skills', 'requirement_mentions', 'requirement_roles', 'requirements'
+])
+
+
+class RoleMatcher:
+    """
+    Scores one resume against every open requisition at once.
+
+    Open job descriptions are compiled into matrices: hashed term vectors for
+    TF-IDF similarity, a roles x keywords matrix of the skills each role asks
+    for, and a keywords x requirements matrix of the skills each requirement
+    mentions. A resume is then scanned once and scored against all roles with a
+    handful of matrix products. The matrices are rebuilt only when roles open
+    or close.
+    """
+
+    def __init__(self):
+        self.extractor = advanced_ranking_service.feature_extractor
+        self.width = len(self.extractor.feature_names)
+        # Keywords lead the feature vector, so a keyword's index is its feature column
+        self._keyword_columns = {keyword: i for i, keyword in enumerate(self.extractor.keywords)}
+        self._open_roles = None
+        self._lock = threading.Lock()
+
+    def _build(self, key) -> OpenRoles:
+        roles, titles, term_vectors, requirements = [], [], [], []
+        requirement_roles, mention_pairs, skill_pairs = [], [], []
+        for jd_id, title in key:
+            parsed = jd_registry.get(jd_id)
+            if parsed is None:
+                continue
+            row = len(roles)
+            roles.append(parsed)
+            titles.append(title)
+            term_vectors.append(vectorize(parsed.text))
+            skill_pairs.extend((row, self._keyword_columns[skill]) for skill in parsed.skills)
+            for requirement, skills in parsed.requirement_skills:
+                column = len(requirements)
+                requirements.append(requirement)
+                requirement_roles.append(row)
+                mention_pairs.extend((self._keyword_columns[skill], column) for skill in skills)
+
+        lengths = [len(indices) for indices, _ in term_vectors]
+        terms = (
+            np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            np.concatenate([indices for indices, _ in term_vectors] or [np.zeros(0, dtype=np.int32)]),
+            np.concatenate([weights for _, weights in term_vectors] or [np.zeros(0, dtype=np.float32)])
+        )
+        role_skills = np.zeros((len(roles), self.width))
+        for row, column in skill_pairs:
+            role_skills[row, column] = 1
+        requirement_mentions = np.zeros((self.width, len(requirements)))
+        for row, column in mention_pairs:
+            requirement_mentions[row, column] = 1
+
+        return OpenRoles(key, roles, titles, terms, role_skills, requirement_mentions,
+                         np.array(requirement_roles, dtype=np.int64), requirements)
+
+    def open_roles(self) -> OpenRoles:
+        """Compiled open requisitions, rebuilt if roles opened or closed since the last call"""
+        key = tuple(get_open_job_descriptions())
+        with self._lock:
+            if self._open_roles is None or self._open_roles.key != key:
+                self._open_roles = self._build(key)
+            return self._open_roles
+
+    def match(self, resume: Union[str, ParsedResume], limit: int = DEFAULT_ROLE_MATCHES) -> Dict:
+        """
+        Best-fit open roles for a resume.
+
+        The fit score blends TF-IDF similarity between the resume and each job
+        description, the share of the role's skills the resume shows, and the
+        share of its requirements with no gap as in
+        ``AdvancedRankingService.analyze_skill_gaps``.
+
+        Args:
+            resume: Resume text or ParsedResume
+            limit (int): Roles to return
+
+        Returns:
+            dict: Open role count and the best ``limit`` roles, best first
+        """
+        resume = parse_resume(resume)
+        open_roles = self.open_roles()
+        count = len(open_roles.roles)
+        extracted = self.extractor.extract(resume)
+        features = np.asarray(extracted.vector, dtype=np.float64)
+
+        similarity = cosine_similarities(open_roles.terms, resume.text)
+
+        role_skill_counts = open_roles.role_skills.sum(axis=1)
+        matched_skill_counts = open_roles.role_skills @ features
+        # Roles that name no known skill are not held against the resume
+        skill_coverage = np.divide(matched_skill_counts, role_skill_counts,
+                                   out=np.ones(count), where=role_skill_counts > 0)
+
+        gaps = (features @ open_roles.requirement_mentions) == 0
+        requirement_counts = np.bincount(open_roles.requirement_roles, minlength=count)
+        gap_counts = np.bincount(open_roles.requirement_roles[gaps], minlength=count)
+        requirement_coverage = np.divide(requirement_counts - gap_counts, requirement_counts,
+                                         out=np.ones(count), where=requirement_counts > 0)
+
+        fit = 100 * (ROLE_FIT_WEIGHTS['similarity'] * similarity +
+                     ROLE_FIT_WEIGHTS['skill_coverage'] * skill_coverage +
+                     ROLE_FIT_WEIGHTS['requirement_coverage'] * requirement_coverage)
+        order = BatchRankingEngine.order(fit, limit)
+
+        matches = []
+        for position, i in enumerate(order, start=1):
+            parsed = open_roles.roles[i]
+            skills_found = self.extractor.found_keywords(extracted, list(parsed.skills))
+            matches.append({
+                'rank': position,
+                'jd_id': parsed.jd_id,
+                'title': open_roles.titles[i],
+                'fit_score': round(float(fit[i]), 2),
+                'similarity': round(float(similarity[i]), 4),
+                'skill_coverage': round(float(skill_coverage[i]) * 100, 2),
+                'matched_skills': skills_found,
+                'missing_skills': [skill for skill in parsed.skills if skill not in skills_found],
+                'job_specific_gaps': [
+                    open_roles.requirements[j] for j in np.flatnonzero(gaps & (open_roles.requirement_roles == i))
+                ],
+                'missing_skills_count': int(gap_counts[i])
+            })
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'open_roles': count,
+            'matches': matches
+        }
+
+
+# Global matcher shared by the API
+role_matcher = RoleMatcher()
+
+
+def match_resume_to_roles(resume, limit: int = DEFAULT_ROLE_MATCHES) -> Dict:
+    """Best-fit open roles for a resume, see ``RoleMatcher.match``"""
+    return role_matcher.match(resume, max(0, min(int(limit), MAX_ROLE_MATCHES)))
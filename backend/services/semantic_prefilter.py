@@ -0,0 +1,190 @@
+import os
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.database import get_text_vectors, save_text_vectors, get_resume_texts
+from services.parsed_resume import parse_resume
+from services.batch_ranking import BatchRankingEngine
+from services.jd_registry import jd_registry
+from services.jd_matching import match_job_description
+
+# Bump whenever tokenisation or hashing changes so stored vectors are rebuilt
+TEXT_VECTOR_VERSION = '1'
+
+# Terms are hashed into 2**HASH_BITS buckets; collisions only blur rare terms together
+HASH_BITS = 20
+HASH_DIMENSIONS = 1 << HASH_BITS
+
+# Candidates sent to the LLM matcher when the caller does not ask for a shortlist size
+DEFAULT_SHORTLIST_SIZE = int(os.getenv('JD_SHORTLIST_SIZE', '20'))
+MAX_SHORTLIST_SIZE = 200
+
+# LLM matches of shortlisted candidates run on their own small pool, so a large
+# shortlist cannot starve the pipeline stages of concurrent uploads
+SHORTLIST_MATCH_WORKERS = int(os.getenv('SHORTLIST_MATCH_WORKERS', '4'))
+shortlist_executor = ThreadPoolExecutor(max_workers=SHORTLIST_MATCH_WORKERS, thread_name_prefix='shortlist-match')
+
+
+def _bucket(term: str) -> int:
+    return zlib.crc32(term.encode('utf-8')) & (HASH_DIMENSIONS - 1)
+
+
+def vectorize(text) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed unigram and bigram term frequencies of a text.
+
+    Returns:
+        tuple: (sorted unique int32 bucket indices, float32 sublinear term frequencies)
+    """
+    tokens = parse_resume(text).tokens
+    counts = Counter(map(_bucket, tokens))
+    counts.update(_bucket(f'{a} {b}') for a, b in zip(tokens, tokens[1:]))
+    if not counts:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    weights = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    order = np.argsort(indices)
+    return indices[order], weights[order].astype(np.float32)
+
+
+def encode_text_vector(text) -> bytes:
+    """Packed little-endian term vector of a text, as stored in the database"""
+    indices, weights = vectorize(text)
+    return indices.astype('<i4').tobytes() + weights.astype('<f4').tobytes()
+
+
+def decode_text_vectors(encoded: List[bytes]):
+    """
+    Stored term vectors as one sparse matrix in CSR form.
+
+    Returns:
+        tuple: (indptr, indices, weights); row ``i`` holds
+        ``indices[indptr[i]:indptr[i + 1]]``
+    """
+    lengths = np.array([len(vector or b'') // 8 for vector in encoded], dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = np.empty(indptr[-1], dtype=np.int32)
+    weights = np.empty(indptr[-1], dtype=np.float32)
+    for i, vector in enumerate(encoded):
+        if lengths[i]:
+            half = lengths[i] * 4
+            indices[indptr[i]:indptr[i + 1]] = np.frombuffer(vector, dtype='<i4', count=lengths[i])
+            weights[indptr[i]:indptr[i + 1]] = np.frombuffer(vector, dtype='<f4', offset=half)
+    return indptr, indices, weights
+
+
+def cosine_similarities(matrix, query) -> np.ndarray:
+    """
+    TF-IDF cosine similarity of every row of a term matrix with a query text.
+
+    Inverse document frequencies come from the matrix itself, so terms every
+    resume shares count for little and distinctive ones dominate.
+    """
+    indptr, indices, weights = matrix
+    rows = len(indptr) - 1
+    if rows == 0:
+        return np.zeros(0)
+
+    document_frequency = np.bincount(indices, minlength=HASH_DIMENSIONS)
+    idf = np.log((1 + rows) / (1 + document_frequency)) + 1
+    query_indices, query_weights = vectorize(query)
+    query_vector = np.zeros(HASH_DIMENSIONS)
+    query_vector[query_indices] = query_weights * idf[query_indices]
+    query_norm = np.linalg.norm(query_vector)
+
+    # Per-row sums via reduceat; a trailing zero keeps start offsets of empty rows in bounds
+    starts = indptr[:-1]
+    empty = starts == indptr[1:]
+    tfidf = np.append(weights * idf[indices].astype(np.float32), np.float32(0))
+    norms = np.sqrt(np.add.reduceat(tfidf * tfidf, starts, dtype=np.float64))
+    dots = np.add.reduceat(tfidf * np.append(query_vector[indices], 0).astype(np.float32), starts, dtype=np.float64)
+    norms[empty] = 0
+    dots[empty] = 0
+
+    denominator = norms * query_norm
+    return np.divide(dots, denominator, out=np.zeros(rows), where=denominator > 0)
+
+
+def load_text_matrix(candidate_ids: List[str] = None):
+    """
+    Stored term vectors of the given candidates, or of every candidate.
+
+    Candidates stored without one, or under another vectorizer version, are
+    vectorised from their resume text and written back.
+
+    Returns:
+        tuple: (rows of (candidate id, filename), CSR matrix)
+    """
+    rows = get_text_vectors(candidate_ids)
+    stale = [row[0] for row in rows if row[2] != TEXT_VECTOR_VERSION or row[3] is None]
+    refreshed = {}
+    if stale:
+        texts = get_resume_texts(stale)
+        refreshed = {candidate_id: encode_text_vector(texts.get(candidate_id) or '') for candidate_id in stale}
+        save_text_vectors([(candidate_id, vector, TEXT_VECTOR_VERSION) for candidate_id, vector in refreshed.items()])
+
+    matrix = decode_text_vectors([refreshed.get(row[0], row[3]) for row in rows])
+    return [(candidate_id, filename) for candidate_id, filename, *_ in rows], matrix
+
+
+def shortlist_candidates(job_description, candidate_ids: List[str] = None,
+                         shortlist_size: int = DEFAULT_SHORTLIST_SIZE, explain: bool = True) -> Dict:
+    """
+    Pick the stored candidates closest to a job description, offline, and only
+    send that shortlist to the LLM matcher.
+
+    Args:
+        job_description: Job description text or ParsedJobDescription
+        candidate_ids (list): Candidates to consider, or None for every stored candidate
+        shortlist_size (int): Candidates kept after the local similarity pass
+        explain (bool): Whether to run the LLM matcher on the shortlist
+
+    Returns:
+        dict: Shortlisted candidates by similarity, with the LLM match of each
+        when ``explain`` is set
+
+    Raises:
+        ValueError: If no job description is given
+    """
+    job_description = jd_registry.register(job_description)
+    if job_description is None:
+        raise ValueError("A job description is required")
+
+    rows, matrix = load_text_matrix(candidate_ids)
+    similarities = cosine_similarities(matrix, job_description.text)
+    order = BatchRankingEngine.order(similarities, shortlist_size)
+
+    matches = [None] * len(order)
+    if explain and len(order):
+        texts = get_resume_texts([rows[i][0] for i in order])
+        # The matcher is network bound, so the shortlist is matched concurrently
+        matches = list(shortlist_executor.map(
+            lambda i: match_job_description(job_description, texts.get(rows[i][0]) or ''), order
+        ))
+
+    shortlist = []
+    for position, (i, match) in enumerate(zip(order, matches), start=1):
+        candidate_id, filename = rows[i]
+        entry = {
+            'rank': position,
+            'candidate_id': candidate_id,
+            'filename': filename,
+            'similarity': round(float(similarities[i]), 4)
+        }
+        if explain:
+            entry['jd_match_result'] = match
+        shortlist.append(entry)
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'jd_id': job_description.jd_id,
+        'total_candidates': len(rows),
+        'shortlist_size': shortlist_size,
+        'llm_calls': len(order) if explain else 0,
+        'shortlist': shortlist
+    }
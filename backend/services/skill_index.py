@@ -0,0 +1,511 @@
+import re
+import json
+import math
+import logging
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.database import (
+    get_skill_index_snapshot, get_skill_index_changes, get_unindexed_candidates,
+    save_candidate_skills, get_candidate_filenames
+)
+
+logger = logging.getLogger(__name__)
+
+# Results returned when the caller does not ask for a limit
+DEFAULT_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 1000
+
+# Queries with a required skill held by at most this fraction of the documents are
+# evaluated on that skill's posting list instead of dense masks over every document
+SPARSE_QUERY_FRACTION = 1 / 32
+
+# Spellings folded onto one indexed skill name
+SKILL_ALIASES = {
+    'k8s': 'kubernetes',
+    'js': 'javascript',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence'
+}
+
+# Skill groups of advanced ranking scanned for every resume
+_RANKED_SKILL_GROUPS = ('technical', 'soft_skills', 'domain')
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+_QUERY_OPERATORS = {'AND', 'OR', 'NOT'}
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a skill search query cannot be parsed"""
+
+
+def normalize_skill(skill) -> Optional[str]:
+    """Lowercased skill name with whitespace collapsed and aliases resolved, or None if empty"""
+    if not isinstance(skill, str):
+        return None
+    skill = ' '.join(skill.lower().split()).strip(' ,;:!?()[]{}"\'')
+    if not skill:
+        return None
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def _number(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _load_json(value, field):
+    """Decode a stored JSON column, or None with a warning if it is unreadable"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Indexing candidate without its unreadable {field}: {str(e)}")
+        return None
+
+
+def candidate_search_fields(analysis_result, advanced_ranking=None):
+    """
+    Skills, years of experience and relevance score a candidate is searched by.
+
+    Skills are the LLM's key and hidden skills plus the skill categories advanced
+    ranking found in the resume, normalised and deduplicated.
+
+    Returns:
+        tuple: (list of skills, years experience or None, relevance score or None)
+    """
+    analysis_result = _load_json(analysis_result, 'analysis_result')
+    advanced_ranking = _load_json(advanced_ranking, 'advanced_ranking')
+    analysis_result = analysis_result if isinstance(analysis_result, dict) else {}
+    advanced_ranking = advanced_ranking if isinstance(advanced_ranking, dict) else {}
+
+    raw_skills = list(analysis_result.get('key_skills') or []) + list(analysis_result.get('hidden_skills') or [])
+    skill_analysis = advanced_ranking.get('skill_gap_analysis', {}).get('skill_analysis', {})
+    for group in _RANKED_SKILL_GROUPS:
+        raw_skills.extend(skill_analysis.get(group, {}).get('found', []))
+
+    skills = [skill for skill in dict.fromkeys(map(normalize_skill, raw_skills)) if skill]
+    return skills, _number(analysis_result.get('years_experience')), _number(analysis_result.get('relevance_score'))
+
+
+# Parsed query nodes: ('skill', name), ('not', node), ('and', [nodes]), ('or', [nodes])
+def parse_query(query: str):
+    """
+    Parse a boolean skill query.
+
+    Skills are combined with AND, OR and NOT (any case) and grouped with
+    parentheses; AND binds tighter than OR. Adjacent words form one skill, so
+    ``machine learning AND python`` has two terms; quote a skill that contains an
+    operator word.
+
+    Raises:
+        QuerySyntaxError: If the query is empty or malformed
+    """
+    if not isinstance(query, str):
+        raise QuerySyntaxError("Query must be text")
+    tokens = []
+    words = []
+
+    def flush_words():
+        if words:
+            tokens.append(('skill', ' '.join(words)))
+            words.clear()
+
+    for quoted, open_paren, close_paren, word in _QUERY_TOKEN.findall(query):
+        if word and word.upper() not in _QUERY_OPERATORS:
+            words.append(word)
+            continue
+        flush_words()
+        if open_paren:
+            tokens.append(('(', None))
+        elif close_paren:
+            tokens.append((')', None))
+        elif word:
+            tokens.append((word.upper(), None))
+        else:
+            tokens.append(('skill', quoted))
+    flush_words()
+    if not tokens:
+        raise QuerySyntaxError("Query is empty")
+
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == 'OR':
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() == 'AND':
+            take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_not():
+        if peek() == 'NOT':
+            take()
+            return ('not', parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        kind, value = take() if position < len(tokens) else (None, None)
+        if kind == '(':
+            node = parse_or()
+            if peek() != ')':
+                raise QuerySyntaxError("Unbalanced parentheses in query")
+            take()
+            return node
+        if kind == 'skill':
+            skill = normalize_skill(value)
+            if skill is None:
+                raise QuerySyntaxError("Empty skill in query")
+            return ('skill', skill)
+        raise QuerySyntaxError(f"Expected a skill, got {kind or 'end of query'}")
+
+    node = parse_or()
+    if position != len(tokens):
+        raise QuerySyntaxError(f"Unexpected {tokens[position][0]} in query")
+    return node
+
+
+def query_terms(node) -> List[str]:
+    """Skills a result can match, i.e. those not under a NOT, in query order"""
+    kind, value = node
+    if kind == 'skill':
+        return [value]
+    if kind == 'not':
+        return []
+    return list(dict.fromkeys(term for child in value for term in query_terms(child)))
+
+
+def required_skills(node) -> set:
+    """Skills every result of the query must have"""
+    kind, value = node
+    if kind == 'skill':
+        return {value}
+    if kind == 'not':
+        return set()
+    children = [required_skills(child) for child in value]
+    return set.union(*children) if kind == 'and' else set.intersection(*children)
+
+
+SearchHit = namedtuple('SearchHit', ['candidate_id', 'matched_skills', 'years_experience', 'relevance_score'])
+
+
+class SkillIndex:
+    """
+    In-memory inverted index from normalised skill to candidates.
+
+    Candidates get dense integer document ids; each skill's posting list holds
+    the ids of the candidates that have it. Re-indexing a candidate retires its
+    old document and appends a new one, so posting lists only ever grow at the
+    end and stay sorted. The index loads from the ``candidate_skills`` table on
+    first use and replays the database's change log before every query, so
+    candidates saved by any process are searchable on the next query.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._loaded = False
+        self._seq = 0
+        self._size = 0
+        self._dead = 0
+        self._doc_ids = {}
+        self._candidate_ids = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._years = np.zeros(0, dtype=np.float64)
+        self._relevance = np.zeros(0, dtype=np.float64)
+        # skill -> sorted int32 doc ids, and doc ids added since the skill was last queried
+        self._postings = {}
+        self._pending = {}
+
+    def _grow(self, size):
+        if size <= len(self._alive):
+            return
+        capacity = max(size, 2 * len(self._alive), 1024)
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+        self._years = np.concatenate([self._years, np.full(capacity - len(self._years), np.nan)])
+        self._relevance = np.concatenate([self._relevance, np.zeros(capacity - len(self._relevance))])
+
+    def _retire(self, candidate_id):
+        doc = self._doc_ids.pop(candidate_id, None)
+        if doc is not None:
+            self._alive[doc] = False
+            self._dead += 1
+
+    def _apply(self, fields, postings, candidate_ids):
+        """Replace the documents of ``candidate_ids`` with the given database rows"""
+        # Work out the whole batch before touching the index, so a failure leaves it as it was
+        start = self._size
+        docs = {candidate_id: doc for doc, candidate_id in enumerate(fields, start=start)}
+        additions = {}
+        for candidate_id, skill in postings:
+            doc = docs.get(candidate_id)
+            if doc is None:
+                # Postings without search fields belong to no indexed candidate
+                continue
+            added = additions.get(skill)
+            if added is None:
+                added = additions[skill] = []
+            added.append(doc)
+        years = np.array([np.nan if y is None else y for y, _ in fields.values()], dtype=np.float64)
+        relevance = np.clip(np.array([0.0 if r is None else r for _, r in fields.values()], dtype=np.float64), 0.0, 100.0)
+
+        self._grow(start + len(fields))
+        for candidate_id in candidate_ids:
+            self._retire(candidate_id)
+        self._doc_ids.update(docs)
+        self._candidate_ids.extend(docs)
+        self._years[start:start + len(fields)] = years
+        self._relevance[start:start + len(fields)] = relevance
+        for skill, added in additions.items():
+            pending = self._pending.get(skill)
+            if pending is None:
+                self._pending[skill] = added
+            else:
+                pending.extend(added)
+        self._alive[start:start + len(fields)] = True
+        self._size = start + len(fields)
+
+    def _load(self):
+        self._reset()
+        backfill_skill_index()
+        self._seq, _ = get_skill_index_changes(0)
+        fields, postings = get_skill_index_snapshot()
+        self._apply(fields, postings, ())
+        self._loaded = True
+
+    def _sync(self):
+        """Load the index, or catch up with candidates saved or deleted since the last query"""
+        if not self._loaded:
+            self._load()
+            return
+        seq, changed = get_skill_index_changes(self._seq)
+        if changed:
+            fields, postings = get_skill_index_snapshot(changed)
+            self._apply(fields, postings, changed)
+        self._seq = seq
+        # Rebuild once retired documents outnumber live ones
+        if self._dead > 10000 and self._dead > self._size - self._dead:
+            self._load()
+
+    def _posting_list(self, skill) -> np.ndarray:
+        pending = self._pending.pop(skill, None)
+        if pending:
+            # Pending documents were all added after the skill's posting list was last merged
+            merged = np.sort(np.asarray(pending, dtype=np.int32))
+            if skill in self._postings:
+                merged = np.concatenate([self._postings[skill], merged])
+            self._postings[skill] = merged
+        return self._postings.get(skill, np.zeros(0, dtype=np.int32))
+
+    def _skill_mask(self, skill, masks) -> np.ndarray:
+        """Boolean mask over document ids having ``skill``, memoised in ``masks`` for one query"""
+        if skill not in masks:
+            mask = np.zeros(self._size, dtype=bool)
+            mask[self._posting_list(skill)] = True
+            masks[skill] = mask
+        return masks[skill]
+
+    def _has_skill(self, skill, docs) -> np.ndarray:
+        """Boolean array marking which of the sorted document ids ``docs`` have ``skill``"""
+        posting = self._posting_list(skill)
+        if not len(posting):
+            return np.zeros(len(docs), dtype=bool)
+        positions = np.minimum(np.searchsorted(posting, docs), len(posting) - 1)
+        return posting[positions] == docs
+
+    def _evaluate_docs(self, node, docs) -> np.ndarray:
+        """Boolean array marking which of the sorted document ids ``docs`` match a query node"""
+        kind, value = node
+        if kind == 'skill':
+            return self._has_skill(value, docs)
+        if kind == 'not':
+            return ~self._evaluate_docs(value, docs)
+        combine = np.logical_and if kind == 'and' else np.logical_or
+        return combine.reduce([self._evaluate_docs(child, docs) for child in value])
+
+    def _sparse_candidates(self, node, size) -> Optional[np.ndarray]:
+        """Shortest posting list of a required skill, if it is short enough to filter instead of masking"""
+        shortest = min((self._posting_list(skill) for skill in required_skills(node)), key=len, default=None)
+        if shortest is None or len(shortest) > size * SPARSE_QUERY_FRACTION:
+            return None
+        return shortest
+
+    def _evaluate(self, node, masks) -> np.ndarray:
+        """Boolean mask over document ids matching a parsed query node"""
+        kind, value = node
+        if kind == 'skill':
+            return self._skill_mask(value, masks).copy()
+        if kind == 'not':
+            return ~self._evaluate(value, masks)
+        # Evaluate the shortest posting lists first so AND can stop at an empty result
+        children = sorted(value, key=lambda child: len(self._posting_list(child[1])) if child[0] == 'skill' else self._size)
+        mask = self._evaluate(children[0], masks)
+        for child in children[1:]:
+            if kind == 'and':
+                if not mask.any():
+                    break
+                mask &= self._evaluate(child, masks)
+            else:
+                mask |= self._evaluate(child, masks)
+        return mask
+
+    def search(self, query: str, min_years: float = None, limit: int = DEFAULT_SEARCH_RESULTS) -> Dict:
+        """
+        Candidates matching a boolean skill query, most relevant first.
+
+        Results are ordered by the number of query skills matched, then by
+        relevance score; ties keep the order candidates were indexed in.
+
+        Args:
+            query (str): Skill query, see ``parse_query``
+            min_years (float): Minimum years of experience; candidates without a
+                known experience are excluded when set
+            limit (int): Results to return
+
+        Returns:
+            dict: Total number of matches and the top ``limit`` SearchHits
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+        """
+        node = parse_query(query)
+        terms = query_terms(node)
+        with self._lock:
+            self._sync()
+            size = self._size
+            rare_docs = self._sparse_candidates(node, size)
+            if rare_docs is not None:
+                # Only documents holding the rarest required skill can match, so the
+                # query is checked against those alone
+                docs = rare_docs[self._evaluate_docs(node, rare_docs) & self._alive[rare_docs]]
+                if min_years is not None:
+                    with np.errstate(invalid='ignore'):
+                        docs = docs[self._years[docs] >= min_years]
+                term_hits = [self._has_skill(term, docs) for term in terms]
+            else:
+                masks = {}
+                mask = self._evaluate(node, masks) & self._alive[:size]
+                if min_years is not None:
+                    # NaN years compare False, so unknown experience never qualifies
+                    with np.errstate(invalid='ignore'):
+                        mask &= self._years[:size] >= min_years
+                docs = np.flatnonzero(mask)
+                term_hits = [self._skill_mask(term, masks)[docs] for term in terms]
+
+            matched = np.zeros(len(docs), dtype=np.int64)
+            for term_hit in term_hits:
+                matched += term_hit
+
+            top = docs[:0]
+            if limit > 0 and len(docs):
+                relevance = self._relevance[docs]
+                if limit < len(docs):
+                    # Relevance scores lie in [0, 100], so the key orders by matched terms
+                    # first. Ties at the cut-off keep the earliest indexed candidates.
+                    key = matched * 1000.0 + relevance
+                    threshold = -np.partition(-key, limit - 1)[limit - 1]
+                    above = np.flatnonzero(key > threshold)
+                    tied = np.flatnonzero(key == threshold)[:limit - len(above)]
+                    candidates = np.concatenate([above, tied])
+                else:
+                    candidates = np.arange(len(docs))
+                order = np.lexsort((docs[candidates], -relevance[candidates], -matched[candidates]))[:limit]
+                top = candidates[order]
+
+            hits = []
+            for i in top:
+                doc = docs[i]
+                years = self._years[doc]
+                hits.append(SearchHit(
+                    candidate_id=self._candidate_ids[doc],
+                    matched_skills=[term for term, term_hit in zip(terms, term_hits) if term_hit[i]],
+                    years_experience=None if np.isnan(years) else float(years),
+                    relevance_score=float(self._relevance[doc])
+                ))
+            return {'total_matches': len(docs), 'hits': hits}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'candidates': self._size - self._dead,
+                'retired_documents': self._dead,
+                'skills': len(self._postings.keys() | self._pending.keys())
+            }
+
+
+def backfill_skill_index(batch_size: int = 500):
+    """Index the skills of candidates saved before skill indexing existed"""
+    rows = get_unindexed_candidates()
+    for i in range(0, len(rows), batch_size):
+        save_candidate_skills([
+            (candidate_id,) + candidate_search_fields(analysis_result, advanced_ranking)
+            for candidate_id, analysis_result, advanced_ranking in rows[i:i + batch_size]
+        ])
+    return len(rows)
+
+
+# Global index shared by the API
+skill_index = SkillIndex()
+
+
+def search_candidates(query: str, min_years: float = None, limit: int = DEFAULT_SEARCH_RESULTS) -> Dict:
+    """
+    Search every stored candidate by skills.
+
+    Args:
+        query (str): Boolean skill query, e.g. ``kubernetes AND (python OR go)``
+        min_years (float): Minimum years of experience
+        limit (int): Results to return, at most MAX_SEARCH_RESULTS
+
+    Returns:
+        dict: Matching candidates, best first
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    limit = max(0, min(int(limit), MAX_SEARCH_RESULTS))
+    found = skill_index.search(query, min_years=min_years, limit=limit)
+    filenames = get_candidate_filenames([hit.candidate_id for hit in found['hits']])
+    return {
+        'query': query,
+        'min_years': min_years,
+        'total_matches': found['total_matches'],
+        'results': [
+            {
+                'rank': position,
+                'candidate_id': hit.candidate_id,
+                'filename': filenames.get(hit.candidate_id),
+                'matched_skills': hit.matched_skills,
+                'years_experience': hit.years_experience,
+                'relevance_score': hit.relevance_score
+            }
+            for position, hit in enumerate(found['hits'], start=1)
+        ]
+    }
@@ -0,0 +1,241 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+_NO_FALLBACK = object()
+
+# How often the coordinator checks whether queued stages with a timeout have started
+_START_POLL_SECONDS = 0.05
+
+
+class StageTimeout(Exception):
+    """Raised when a stage without a fallback exceeds its timeout"""
+
+
+class StageScheduler:
+    """
+    Runs a small dependency graph of pipeline stages concurrently.
+
+    Each stage is submitted as soon as the stages it depends on have finished, so
+    independent stages overlap and end-to-end latency tracks the slowest chain
+    instead of the sum of all stages.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._stages = {}
+
+    def add(self, name, func, depends_on=(), timeout=None, fallback=_NO_FALLBACK):
+        """
+        Register a stage.
+
+        Args:
+            name (str): Stage name, also the key of its result
+            func (callable): Called with the results of ``depends_on`` as keyword arguments
+            depends_on (tuple): Names of stages that must finish first
+            timeout (float): Seconds the stage may take once it starts running
+            fallback: Value, or callable taking the same arguments as ``func``, used
+                when the stage times out or raises; without one the error propagates
+        """
+        for dependency in depends_on:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dependency}")
+        self._stages[name] = {
+            'func': func,
+            'depends_on': tuple(depends_on),
+            'timeout': timeout,
+            'fallback': fallback
+        }
+
+    def run(self, on_complete=None):
+        """
+        Execute every registered stage.
+
+        Args:
+            on_complete (callable): Optional ``on_complete(name, result)`` hook called
+                from the coordinating thread as each stage finishes
+
+        Returns:
+            tuple: (results by stage name, names of stages that fell back)
+        """
+        results = {}
+        degraded = []
+        running = {}  # future -> (name, start time holder, kwargs)
+        pending = dict(self._stages)
+
+        def timed(func, started):
+            def call(**kwargs):
+                # The timeout counts from here, not from submission, so time spent
+                # queued behind other uploads' stages is not held against the stage
+                started.append(time.monotonic())
+                return func(**kwargs)
+            return call
+
+        def submit_ready():
+            for name in [n for n, stage in pending.items() if all(d in results for d in stage['depends_on'])]:
+                stage = pending.pop(name)
+                kwargs = {dependency: results[dependency] for dependency in stage['depends_on']}
+                started = []
+                func = timed(stage['func'], started) if stage['timeout'] else stage['func']
+                future = self.executor.submit(func, **kwargs)
+                running[future] = (name, started, kwargs)
+
+        def deadline(name, started):
+            timeout = self._stages[name]['timeout']
+            return started[0] + timeout if timeout and started else None
+
+        def finish(name, result):
+            results[name] = result
+            if on_complete:
+                on_complete(name, result)
+
+        def fall_back(name, kwargs, error):
+            fallback = self._stages[name]['fallback']
+            if fallback is _NO_FALLBACK:
+                raise error
+            logger.error(f"Stage {name} failed, using fallback: {str(error)}")
+            degraded.append(name)
+            return fallback(**kwargs) if callable(fallback) else fallback
+
+        submit_ready()
+        while running:
+            deadlines = [deadline(name, started) for name, started, _ in running.values()]
+            deadlines = [d for d in deadlines if d is not None]
+            wait_timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            if any(self._stages[name]['timeout'] and not started for name, started, _ in running.values()):
+                wait_timeout = _START_POLL_SECONDS if wait_timeout is None else min(wait_timeout, _START_POLL_SECONDS)
+            done, _ = wait(list(running), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name, _, kwargs = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = fall_back(name, kwargs, e)
+                finish(name, result)
+
+            now = time.monotonic()
+            for future, (name, started, kwargs) in list(running.items()):
+                stage_deadline = deadline(name, started)
+                if stage_deadline is not None and now >= stage_deadline and not future.done():
+                    # The worker thread cannot be interrupted; its late result is discarded
+                    # and, on a StageExecutor, its slot is handed to a replacement worker
+                    del running[future]
+                    abandon = getattr(self.executor, 'abandon', None)
+                    if abandon is not None:
+                        abandon(future)
+                    error = StageTimeout(f"Stage {name} timed out after {self._stages[name]['timeout']}s")
+                    finish(name, fall_back(name, kwargs, error))
+
+            submit_ready()
+
+        return results, degraded
+
+
+class StageExecutor(Executor):
+    """
+    Thread pool whose slots are not held by abandoned work.
+
+    Works like ``ThreadPoolExecutor``, plus ``abandon``: a running task whose
+    result is no longer wanted cannot be interrupted, so a replacement worker
+    takes over its slot at once and the abandoned thread exits when the task
+    returns. At most ``max_workers`` tasks that are still wanted run at a time.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix='stage'):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._started = 0
+        self._abandoned = set()
+        self._threads = []
+        self._shutdown = False
+
+    def _start_worker(self):
+        # Abandoned workers exit once their task returns; forget them so the list stays bounded
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        self._started += 1
+        thread = threading.Thread(
+            target=self._work, name=f'{self.thread_name_prefix}_{self._started}', daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            with self._lock:
+                if future in self._abandoned:
+                    # A replacement worker already holds this slot
+                    self._abandoned.discard(future)
+                    return
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            future = Future()
+            self._queue.put((future, fn, args, kwargs))
+            if self._workers < self.max_workers:
+                self._workers += 1
+                self._start_worker()
+            return future
+
+    def abandon(self, future):
+        """Give up on a task: cancel it if queued, otherwise free its slot for other work"""
+        if future.cancel():
+            return
+        with self._lock:
+            if future.done() or self._shutdown:
+                return
+            self._abandoned.add(future)
+            self._start_worker()
+
+    def abandoned(self):
+        """Number of abandoned tasks still running"""
+        with self._lock:
+            return len(self._abandoned)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            workers = self._workers
+            threads = list(self._threads)
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in range(workers):
+            self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+# Shared pool for pipeline stages; sized for the network-bound stages of several concurrent uploads
+stage_executor = StageExecutor(
+    max_workers=int(os.getenv('STAGE_WORKERS', '16')),
+    thread_name_prefix='pipeline-stage'
+)
@@ -1,22 +1,34 @@
 import os
 import json
+import logging
 from dotenv import load_dotenv
 from openai import OpenAI
+from services.metrics import LLM_CALLS, LLM_FALLBACKS
+from services.parsed_resume import parse_resume
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
 client = OpenAI()
 
-def analyze_resume_with_watson(resume_text, job_description=None):
+# Bump whenever the analysis prompt or model changes so cached analyses are recomputed
+ANALYSIS_VERSION = 'gpt-4o-mini-3'
+
+# Characters of section-selected resume text sent in the analysis prompt
+ANALYSIS_PROMPT_CHARS = 4000
+
+def _analyze_resume_with_openai(resume_text, job_description=None):
     """
     Analyze resume using OpenAI API.
     """
+    resume = parse_resume(resume_text)
     prompt = f"""
     You are an expert HR recruiter. Analyze the following resume and provide a comprehensive assessment.
 
     RESUME TEXT:
-    {resume_text[:4000]}  # Limit text to avoid token limits
+    {resume.relevant_text(ANALYSIS_PROMPT_CHARS)}
 
     Please analyze this resume and provide:
     1. Years of experience (numeric value)
@@ -142,21 +154,22 @@ def hr_query_chatbot(message):
     except Exception as e:
         return f"HR Chatbot error: {str(e)}"
 
-# Fallback function for when Watson credentials aren't available
+# Fallback function for when the LLM is not available
 def analyze_resume_with_watson(resume_text, job_description=None):
-    """Wrapper function that handles Watson analysis with fallback"""
+    """Wrapper function that handles LLM analysis with fallback"""
+    LLM_CALLS.inc(service='resume_analysis')
     try:
-        analyzer = WatsonResumeAnalyzer()
-        return analyzer.analyze_resume(resume_text, job_description)
+        return _analyze_resume_with_openai(resume_text, job_description)
     except Exception as e:
-        # Fallback to mock analysis if Watson is not configured
-        print(f"Watson analysis failed, using mock data: {str(e)}")
+        # Fallback to mock analysis if the LLM is not configured or fails
+        logger.warning(f"Resume analysis failed, using mock data: {str(e)}")
+        LLM_FALLBACKS.inc(service='resume_analysis')
         return get_mock_analysis(resume_text)
 
 def get_mock_analysis(resume_text):
     """Mock analysis for testing when Watson is not available"""
     # Simple analysis based on text content
-    text_lower = resume_text.lower()
+    text_lower = parse_resume(resume_text).lower
 
     # Mock analysis logic
     experience = 3 if 'experience' in text_lower else 1
@@ -0,0 +1,34 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import database
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case that runs against a fresh candidates database in a temporary folder"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.original_db_path = database.DB_PATH
+        database.DB_PATH = os.path.join(self.folder, 'candidates.db')
+        database.init_database()
+
+    def tearDown(self):
+        database.DB_PATH = self.original_db_path
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def save_candidate(self, candidate_id, **fields):
+        """Store a minimal candidate, with ``fields`` added to or overriding the defaults"""
+        candidate = {
+            'id': candidate_id,
+            'filename': f'{candidate_id}.pdf',
+            'upload_date': '2024-01-01T00:00:00',
+            'resume_text': '',
+            'analysis_result': {}
+        }
+        candidate.update(fields)
+        database.save_candidate(candidate)
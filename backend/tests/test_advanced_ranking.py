@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.advanced_ranking import AdvancedRankingService, RankingFeatureExtractor, RankingFeatures
+
+RESUME = """Senior engineer who led teams of eight and mentored staff.
+Promoted within 2 years. Managed projects in Python, SQL and Docker on AWS.
+Known for teamwork, communication and problem solving in data science work."""
+
+JOB_DESCRIPTION = """Requirements: Python, SQL and Docker experience
+Must have kubernetes cluster operations"""
+
+
+class TestRankingFeatureExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = RankingFeatureExtractor(
+            ['lead', 'leadership', 'Node.js'],
+            {'growth': [r'promoted?\s+within\s+\d+', r'fast\s+track'], 'steady': [r'steady\s+advancement']}
+        )
+
+    def test_keywords_match_as_substrings(self):
+        """Test keywords are found inside longer words, case-insensitively"""
+        features = self.extractor.extract("Leadership across NODE.JS services")
+        self.assertEqual(self.extractor.found_keywords(features, ['lead', 'leadership', 'node.js']),
+                         ['lead', 'leadership', 'node.js'])
+
+    def test_pattern_hits_are_counted_per_group(self):
+        """Test each matching pattern counts once towards its group"""
+        features = self.extractor.extract("Promoted within 2 years, then promoted within 1 year. Fast track.")
+        self.assertEqual(self.extractor.pattern_hits(features, 'growth'), 2)
+        self.assertEqual(self.extractor.pattern_hits(features, 'steady'), 0)
+
+    def test_vector_follows_feature_names(self):
+        """Test the vector has one presence flag per feature name"""
+        features = self.extractor.extract("lead on a fast track")
+        self.assertEqual(len(features.vector), len(self.extractor.feature_names))
+        self.assertEqual(dict(zip(self.extractor.feature_names, features.vector))['keyword:lead'], 1)
+        self.assertEqual(dict(zip(self.extractor.feature_names, features.vector))['keyword:leadership'], 0)
+
+    def test_company_values_follow_request_order(self):
+        """Test company value hits line up with the requested values"""
+        features = self.extractor.extract("We value Ownership", ['integrity', 'ownership'])
+        self.assertEqual(features.company_hits, (0, 1))
+
+
+class TestAdvancedRankingService(unittest.TestCase):
+
+    def setUp(self):
+        self.service = AdvancedRankingService()
+
+    def test_analyses_find_expected_signals(self):
+        """Test culture, trajectory and skill analyses read the shared features"""
+        result = self.service.generate_advanced_ranking(RESUME, JOB_DESCRIPTION, ['teamwork'], 6)
+
+        self.assertEqual(result['culture_fit_analysis']['company_fit_score'], 100)
+        self.assertEqual(result['career_trajectory_analysis']['trajectory_components']['rapid_growth'], 25)
+        self.assertEqual(result['career_trajectory_analysis']['trajectory_components']['leadership_potential'], 45)
+        self.assertEqual(result['skill_gap_analysis']['skill_analysis']['technical']['found'],
+                         ['python', 'sql', 'aws', 'docker'])
+        self.assertEqual(result['skill_gap_analysis']['job_specific_gaps'], ['kubernetes cluster operations'])
+
+    def test_rescoring_features_matches_text(self):
+        """Test scoring precomputed features gives the same result as scoring the text"""
+        features = self.service.extract_features(RESUME, ['teamwork'])
+        self.assertIsInstance(features, RankingFeatures)
+
+        from_text = self.service.generate_advanced_ranking(RESUME, JOB_DESCRIPTION, ['teamwork'], 6)
+        from_features = self.service.generate_advanced_ranking(features, JOB_DESCRIPTION, ['teamwork'], 6)
+        for result in (from_text, from_features):
+            result.pop('recommendations')
+        self.assertEqual(from_text, from_features)
+
+    def test_domain_skill_recommendations(self):
+        """Test low domain coverage produces a recommendation instead of failing"""
+        result = self.service.analyze_skill_gaps("python developer")
+        self.assertIn("Develop 5 additional domain skills", result['recommendations'])
+
+
+if __name__ == '__main__':
+    unittest.main()
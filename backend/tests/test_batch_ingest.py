@@ -0,0 +1,83 @@
+import unittest
+import io
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.batch_ingest import iter_zip_resumes, discard_batch_items, batch_registry, BatchTooLarge
+from services.job_queue import job_queue, batch_job_queue, find_job_queue
+
+class TestBatchIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.upload_folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.upload_folder, ignore_errors=True)
+
+    def _make_zip(self, members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+        buffer.seek(0)
+        return buffer
+
+    def test_zip_members_streamed_to_disk(self):
+        """Test resume members are written to disk and other files are skipped"""
+        archive = self._make_zip({
+            'batch/alice.pdf': b'%PDF alice',
+            'bob.docx': b'bob',
+            '../misc/notes <v2>.txt': b'ignored'
+        })
+
+        items = list(iter_zip_resumes(archive, self.upload_folder, {'pdf', 'docx'}, 10, 1024))
+
+        saved = [item for item in items if 'file_path' in item]
+        skipped = [item for item in items if item.get('status') == 'skipped']
+        self.assertEqual([item['filename'] for item in saved], ['alice.pdf', 'bob.docx'])
+        self.assertEqual([item['filename'] for item in skipped], ['notes_v2.txt'])
+        with open(saved[0]['file_path'], 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF alice')
+        self.assertEqual(len(saved[0]['content_hash']), 64)
+
+    def test_zip_file_count_limit(self):
+        """Test archives with too many members are rejected"""
+        archive = self._make_zip({f'{i}.pdf': b'x' for i in range(3)})
+
+        with self.assertRaises(BatchTooLarge):
+            list(iter_zip_resumes(archive, self.upload_folder, {'pdf'}, 2, 1024))
+
+    def test_oversized_member_skipped(self):
+        """Test members larger than the per-file limit are not extracted"""
+        archive = self._make_zip({'big.pdf': b'x' * 4096})
+
+        items = list(iter_zip_resumes(archive, self.upload_folder, {'pdf'}, 10, 1024))
+
+        self.assertEqual(items[0]['status'], 'skipped')
+        self.assertEqual(os.listdir(self.upload_folder), [])
+
+    def test_discard_batch_items_removes_saved_files(self):
+        """Test files saved for a rejected batch are deleted and skipped items ignored"""
+        archive = self._make_zip({'alice.pdf': b'%PDF alice', 'notes.txt': b'ignored'})
+        items = list(iter_zip_resumes(archive, self.upload_folder, {'pdf'}, 10, 1024))
+        self.assertEqual(len(os.listdir(self.upload_folder)), 1)
+
+        discard_batch_items(items + [{'filename': 'gone.pdf', 'file_path': os.path.join(self.upload_folder, 'gone.pdf')}])
+
+        self.assertEqual(os.listdir(self.upload_folder), [])
+
+    def test_batches_use_their_own_queue(self):
+        """Test batch jobs are bounded separately from interactive uploads and can still be found"""
+        self.assertIs(batch_registry.queue, batch_job_queue)
+        self.assertIsNot(batch_job_queue, job_queue)
+
+        job_id = batch_job_queue.submit(lambda on_progress: 'done')
+        self.assertIs(find_job_queue(job_id), batch_job_queue)
+        self.assertIsNone(find_job_queue('missing'))
+
+if __name__ == '__main__':
+    unittest.main()
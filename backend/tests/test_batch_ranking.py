@@ -0,0 +1,156 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from database_case import DatabaseTestCase
+from services import database
+from services.advanced_ranking import advanced_ranking_service
+from services.batch_ranking import (
+    batch_ranking_engine, rank_candidates, encode_features, decode_feature_matrix
+)
+
+RESUMES = [
+    "Led teams and mentored staff. Promoted within 2 years, then promoted 3 times. "
+    "Python, Java, SQL, AWS, Docker, Kubernetes, React. Machine learning and devops. "
+    "Leadership, communication, teamwork, problem solving. Honest, ethical, quality focused.",
+    "Managed projects in Python and SQL. Team player who likes to learn and grow.",
+    "Barista with excellent latte art.",
+    "Data science researcher; innovative design of cloud computing systems. Fast track graduate."
+]
+
+JOB_DESCRIPTION = """Requirements: Python, SQL and Docker experience
+Must have kubernetes cluster operations
+Required strong communication with stakeholders"""
+
+
+class TestBatchRankingEngine(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.features = [advanced_ranking_service.extract_features(text) for text in RESUMES]
+        self.matrix = decode_feature_matrix([encode_features(f) for f in self.features], batch_ranking_engine.width)
+
+    def test_matrix_scores_match_service(self):
+        """Test vectorised scores and tiers reproduce the per-resume analysis"""
+        scores = batch_ranking_engine.score_matrix(self.matrix)
+        tiers = batch_ranking_engine.tiers(scores['overall'])
+
+        for i, features in enumerate(self.features):
+            result = advanced_ranking_service.generate_advanced_ranking(features, JOB_DESCRIPTION)
+            self.assertAlmostEqual(scores['overall'][i], result['overall_advanced_score'])
+            self.assertAlmostEqual(scores['culture_fit'][i], result['culture_fit_analysis']['overall_score'])
+            self.assertAlmostEqual(scores['career_trajectory'][i],
+                                   result['career_trajectory_analysis']['overall_trajectory_score'])
+            self.assertAlmostEqual(scores['skill_coverage'][i], result['skill_gap_analysis']['overall_skill_coverage'])
+            self.assertEqual(tiers[i], result['ranking_tier'])
+
+    def test_job_gaps_match_service(self):
+        """Test vectorised job gap counts match the per-resume skill gap analysis"""
+        gaps = batch_ranking_engine.job_gap_counts(self.matrix, JOB_DESCRIPTION)
+        for i, features in enumerate(self.features):
+            result = advanced_ranking_service.generate_advanced_ranking(features, JOB_DESCRIPTION)
+            self.assertEqual(gaps[i], result['skill_gap_analysis']['missing_skills_count'])
+
+    def test_rank_orders_best_first_with_limit(self):
+        """Test ranking returns the top rows by score, ties broken by input order"""
+        matrix = np.vstack([self.matrix, self.matrix[0]])
+        ranked = batch_ranking_engine.rank(matrix, limit=3)
+        overall = ranked['overall']
+
+        self.assertEqual(list(ranked['order'][:2]), [0, 4])
+        self.assertEqual(len(ranked['order']), 3)
+        self.assertTrue(all(overall[a] >= overall[b] for a, b in zip(ranked['order'], ranked['order'][1:])))
+
+    def test_default_weights_reproduce_scores(self):
+        """Test resolved default weights score stored components like the default formulas"""
+        components = batch_ranking_engine.component_matrix(self.matrix)
+        weighted = batch_ranking_engine.score_components(components, batch_ranking_engine.resolve_weights({}))
+        self.assertTrue(np.allclose(weighted['overall'], batch_ranking_engine.score_matrix(self.matrix)['overall']))
+
+    def test_custom_weights_are_normalised(self):
+        """Test custom weights only change the balance between scores"""
+        components = batch_ranking_engine.component_matrix(self.matrix)
+        skills_only = batch_ranking_engine.resolve_weights({'culture_fit': 0, 'career_trajectory': 0, 'skill_coverage': 5})
+        scores = batch_ranking_engine.score_components(components, skills_only)
+        self.assertTrue(np.allclose(scores['overall'], scores['skill_coverage']))
+
+        technical_only = batch_ranking_engine.resolve_weights({'skills': {'soft_skills': 0, 'domain': 0}})
+        scores = batch_ranking_engine.score_components(components, technical_only)
+        technical = components[:, batch_ranking_engine.component_names.index('skills:technical')]
+        self.assertTrue(np.allclose(scores['skill_coverage'], technical))
+
+    def test_invalid_weights_rejected(self):
+        """Test unknown, negative and all-zero weights raise ValueError"""
+        for weights in ({'speed': 1}, {'culture_fit': -1}, {'culture_fit': 'high'}, {'skills': {'cooking': 1}},
+                        {'trajectory': {'rapid_growth': 0, 'steady_progression': 0, 'leadership_potential': 0}},
+                        {'culture_fit': 0, 'career_trajectory': 0, 'skill_coverage': 0}):
+            with self.subTest(weights=weights):
+                with self.assertRaises(ValueError):
+                    batch_ranking_engine.resolve_weights(weights)
+
+    def test_empty_matrix(self):
+        """Test ranking an empty candidate set returns no rows"""
+        ranked = batch_ranking_engine.rank(decode_feature_matrix([], batch_ranking_engine.width), JOB_DESCRIPTION)
+        self.assertEqual(len(ranked['order']), 0)
+
+
+class TestRankCandidates(DatabaseTestCase):
+
+    def _save(self, candidate_id, resume_text, with_features=True):
+        features, components = batch_ranking_engine.encode_candidate(
+            advanced_ranking_service.extract_features(resume_text)
+        )
+        self.save_candidate(
+            candidate_id,
+            resume_text=resume_text,
+            ranking_features=features if with_features else None,
+            ranking_components=components if with_features else None,
+            ranking_features_version=batch_ranking_engine.version if with_features else None
+        )
+
+    def test_leaderboard_recomputes_missing_features(self):
+        """Test candidates without stored features are scored from their text and backfilled"""
+        self._save('strong', RESUMES[0])
+        self._save('weak', RESUMES[2])
+        self._save('legacy', RESUMES[1], with_features=False)
+
+        report = rank_candidates(JOB_DESCRIPTION)
+
+        self.assertEqual(report['total_candidates'], 3)
+        self.assertEqual([entry['candidate_id'] for entry in report['leaderboard']], ['strong', 'legacy', 'weak'])
+        self.assertEqual([entry['rank'] for entry in report['leaderboard']], [1, 2, 3])
+        stored = {row[0]: row[2] for row in database.get_ranking_vectors()}
+        self.assertEqual(stored['legacy'], batch_ranking_engine.version)
+
+    def test_leaderboard_for_candidate_subset(self):
+        """Test only the requested candidates are ranked"""
+        for i, text in enumerate(RESUMES):
+            self._save(f'c{i}', text)
+
+        report = rank_candidates(JOB_DESCRIPTION, candidate_ids=['c2', 'c3'], limit=1)
+
+        self.assertEqual(report['total_candidates'], 2)
+        self.assertEqual([entry['candidate_id'] for entry in report['leaderboard']], ['c3'])
+
+    def test_reweighting_uses_stored_components(self):
+        """Test custom weights re-rank from stored component scores without rescanning resumes"""
+        self._save('skilled', "Python, Java, SQL, AWS, Docker and React developer.")
+        self._save('leader', "Led teams, managed projects, mentored staff and supervised staff.")
+        # Resume text is no longer read once components are stored
+        conn = database.sqlite3.connect(database.DB_PATH)
+        conn.execute("UPDATE candidates SET resume_text = ''")
+        conn.commit()
+        conn.close()
+
+        by_skills = rank_candidates(weights={'culture_fit': 0, 'career_trajectory': 0, 'skill_coverage': 1})
+        by_trajectory = rank_candidates(weights={'culture_fit': 0, 'career_trajectory': 1, 'skill_coverage': 0})
+
+        self.assertEqual(by_skills['leaderboard'][0]['candidate_id'], 'skilled')
+        self.assertEqual(by_trajectory['leaderboard'][0]['candidate_id'], 'leader')
+        self.assertEqual(by_trajectory['weights']['career_trajectory'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
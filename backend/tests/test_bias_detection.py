@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import bias_detection
+from services.bias_detection import (
+    BiasDetector, LexiconMatcher, analyze_resume_bias, create_blind_version, get_bias_detector, reload_bias_lexicons
+)
+
+class TestLexiconMatcher(unittest.TestCase):
+
+    def test_scan_respects_word_boundaries(self):
+        """Test terms only match whole words, so 'he' does not match inside 'the'"""
+        matcher = LexiconMatcher({'male': {'terms': ['he', 'his']}})
+        hits = matcher.scan("The theme is his. He agreed.")
+        self.assertEqual([term for term, _ in hits['male']], ['his', 'he'])
+
+    def test_scan_returns_categories_and_spans(self):
+        """Test hits carry their category and span, with multi-word terms preferred"""
+        matcher = LexiconMatcher({
+            'education': {'terms': ['ivy', 'ivy league']},
+            'age': {'patterns': [r'\d{1,2}\s*years?']}
+        })
+        hits = matcher.scan("Ivy League grad, 12 years")
+        self.assertEqual(hits['education'], [('ivy league', (0, 10))])
+        self.assertEqual(hits['age'], [('12 years', (17, 25))])
+        self.assertEqual(matcher.counts("ivy ivy"), {'education': 2, 'age': 0})
+
+class TestBiasDetector(unittest.TestCase):
+
+    def test_gender_terms_counted_once_each(self):
+        """Test each distinct gender term counts once however often it appears"""
+        result = BiasDetector().analyze_bias("He said his team. He left.")
+        self.assertEqual(result['gender_bias']['male_terms'], 2)
+        self.assertEqual(result['gender_bias']['female_terms'], 0)
+
+    def test_neutral_resume_scores_zero(self):
+        """Test a resume without lexicon hits has no bias score"""
+        result = analyze_resume_bias("Python developer. Built APIs with Flask.")
+        self.assertEqual(result['overall_bias_score'], 0)
+        self.assertEqual(result['bias_free_score'], 100)
+
+class TestBlindResume(unittest.TestCase):
+
+    def test_redacts_identifiers_with_spans(self):
+        """Test each identifier is replaced once and its span maps to its placeholder"""
+        text = "Jane Mary Smith\njane.smith@example.com | (555) 123-4567\n42 Wallaby Way Sydney NSW"
+        blind, removed = create_blind_version(text)
+
+        self.assertEqual(blind, "[NAME REMOVED]\n[EMAIL REMOVED] | [PHONE REMOVED]\n[ADDRESS REMOVED]")
+        self.assertEqual(removed['names'], ['Jane Mary Smith'])
+        self.assertEqual(removed['phones'], ['(555) 123-4567'])
+        for span in removed['spans']:
+            self.assertIn(text[span['start']:span['end']], removed[span['type']])
+            self.assertEqual(blind[span['blind_start']:span['blind_end']][0], '[')
+
+    def test_address_stays_on_one_line(self):
+        """Test address matches stop at line breaks and need more than three words"""
+        blind, removed = create_blind_version("5 years Python\nworked at home")
+        self.assertEqual(removed['addresses'], [])
+        self.assertEqual(blind, "5 years Python\nworked at home")
+
+    def test_common_phrases_are_not_names(self):
+        """Test excluded capitalised phrases are left in place"""
+        blind, removed = create_blind_version("This Is a summary")
+        self.assertEqual(blind, "This Is a summary")
+        self.assertEqual(removed['names'], [])
+
+class TestLexiconReload(unittest.TestCase):
+
+    def setUp(self):
+        self.original = get_bias_detector()
+        self.lexicon_file = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+
+    def tearDown(self):
+        bias_detection._detector = self.original
+        os.remove(self.lexicon_file.name)
+
+    def write_lexicons(self, lexicons):
+        with open(self.lexicon_file.name, 'w') as file:
+            json.dump(lexicons, file)
+
+    def test_reload_swaps_detector_and_version(self):
+        """Test reloading overrides the listed categories and changes the version stamp"""
+        self.write_lexicons({'location': {'terms': ['offshore']}})
+        info = reload_bias_lexicons(self.lexicon_file.name)
+
+        self.assertNotEqual(info['version'], self.original.version)
+        self.assertIsNot(get_bias_detector(), self.original)
+        result = analyze_resume_bias("Worked offshore")
+        self.assertEqual(result['location_bias']['location_indicators'], 1)
+        self.assertEqual(result['lexicon_version'], info['version'])
+        # Categories not in the file keep their defaults
+        self.assertEqual(get_bias_detector().lexicons['age'], self.original.lexicons['age'])
+
+    def test_invalid_file_keeps_current_detector(self):
+        """Test a malformed lexicon file is rejected without replacing the detector"""
+        self.write_lexicons({'location': {'terms': 'offshore'}})
+        with self.assertRaises(ValueError):
+            reload_bias_lexicons(self.lexicon_file.name)
+        self.assertIs(get_bias_detector(), self.original)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from database_case import DatabaseTestCase
+from services.bias_detection import analyze_resume_bias, get_bias_detector, INDICATOR_COUNTS
+from services.bias_report import build_bias_report, score_indicator_matrix, SCORE_CATEGORIES
+
+RESUMES = [
+    "He led his team. Senior engineer from Berlin, 12 years at Harvard and Stanford.",
+    "She and her colleagues shipped a young product. Ivy League graduate.",
+    "Python developer building APIs.",
+    "He, she, him and her worked in London at an international, overseas company."
+]
+
+class TestBiasReport(DatabaseTestCase):
+
+    def _save(self, candidate_id, resume_text, bias_analysis):
+        self.save_candidate(candidate_id, resume_text=resume_text, bias_analysis=bias_analysis)
+
+    def test_vectorised_scores_match_detector(self):
+        """Test matrix scoring reproduces BiasDetector's per-resume scores"""
+        detector = get_bias_detector()
+        counts = np.array([[detector.count_indicators(text)[key] for _, key in INDICATOR_COUNTS] for text in RESUMES])
+        scores = score_indicator_matrix(counts)
+
+        for text, row in zip(RESUMES, scores):
+            analysis = analyze_resume_bias(text)
+            expected = [analysis[f'{category}_bias']['score'] for category in SCORE_CATEGORIES]
+            self.assertTrue(np.allclose(row, expected))
+            self.assertAlmostEqual(row.mean(), analysis['overall_bias_score'])
+
+    def test_report_uses_stored_counts_and_rescans_stale_ones(self):
+        """Test stored analyses are reused and outdated or missing ones are recounted"""
+        self._save('current', RESUMES[0], analyze_resume_bias(RESUMES[0]))
+        self._save('outdated', RESUMES[1], {'overall_bias_score': 0, 'lexicon_version': 'old'})
+        self._save('missing', RESUMES[2], None)
+
+        report = build_bias_report(include_candidates=True)
+
+        self.assertEqual(report['total_candidates'], 3)
+        self.assertEqual(report['rescanned_candidates'], 2)
+        scores = {c['id']: c['overall_bias_score'] for c in report['candidates']}
+        for candidate_id, text in zip(['current', 'outdated', 'missing'], RESUMES):
+            self.assertAlmostEqual(scores[candidate_id], analyze_resume_bias(text)['overall_bias_score'])
+        self.assertEqual(sum(report['overall']['histogram']['counts']), 3)
+        self.assertIn('p90', report['categories']['gender']['percentiles'])
+
+    def test_empty_report(self):
+        """Test a report over no candidates has empty distributions"""
+        report = build_bias_report()
+        self.assertEqual(report['total_candidates'], 0)
+        self.assertIsNone(report['overall']['mean'])
+
+if __name__ == '__main__':
+    unittest.main()
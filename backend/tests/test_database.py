@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database_case import DatabaseTestCase
+from services import database
+
+class TestDatabase(DatabaseTestCase):
+
+    def _save(self, candidate_id, **fields):
+        candidate = {
+            'resume_text': 'Python developer with 5 years experience',
+            'blind_resume_text': 'Python developer',
+            'analysis_result': {'relevance_score': 80},
+            'bias_analysis': {'overall_bias_score': 5},
+            'content_hash': 'abc',
+            'analysis_version': 'v1'
+        }
+        candidate.update(fields)
+        self.save_candidate(candidate_id, **candidate)
+
+    def test_duplicate_references_original_analysis(self):
+        """Test deduplicated records resolve to the referenced analysis"""
+        self._save('original')
+        self._save('duplicate', resume_text=None, analysis_result=None, analysis_ref='original')
+
+        found = database.find_analysis_by_hash('abc', 'v1')
+        duplicate = database.get_candidate_by_id('duplicate')
+
+        self.assertEqual(found['id'], 'original')
+        self.assertEqual(duplicate['analysis_ref'], 'original')
+        self.assertEqual(duplicate['analysis_result'], {'relevance_score': 80})
+        self.assertEqual(duplicate['bias_analysis'], {'overall_bias_score': 5})
+        self.assertEqual(duplicate['resume_text'], 'Python developer with 5 years experience')
+        self.assertIsNone(database.find_analysis_by_hash('abc', 'v2'))
+
+    def test_delete_original_keeps_duplicates(self):
+        """Test deleting the referenced record hands its analysis to a duplicate"""
+        self._save('original')
+        self._save('duplicate', analysis_ref='original')
+        self._save('duplicate2', analysis_ref='original')
+
+        self.assertTrue(database.delete_candidate('original'))
+
+        duplicate = database.get_candidate_by_id('duplicate')
+        duplicate2 = database.get_candidate_by_id('duplicate2')
+        self.assertIsNone(duplicate['analysis_ref'])
+        self.assertEqual(duplicate['analysis_result'], {'relevance_score': 80})
+        self.assertEqual(duplicate2['analysis_ref'], 'duplicate')
+        self.assertEqual(duplicate2['bias_analysis'], {'overall_bias_score': 5})
+
+    def test_resave_keeps_created_at(self):
+        """Test re-analysing a candidate updates it in place without resetting created_at"""
+        self._save('original')
+        conn = database.sqlite3.connect(database.DB_PATH)
+        conn.execute("UPDATE candidates SET created_at = '2020-01-01 00:00:00' WHERE id = 'original'")
+        conn.commit()
+        conn.close()
+
+        self._save('original', analysis_result={'relevance_score': 95})
+
+        candidate = database.get_candidate_by_id('original')
+        self.assertEqual(candidate['created_at'], '2020-01-01 00:00:00')
+        self.assertEqual(candidate['analysis_result'], {'relevance_score': 95})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import hashlib
+import io
+import os
+import sys
+import shutil
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.file_store import save_stream, hash_file, FileTooLarge
+
+class TestFileStore(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'resume.pdf')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_save_stream_hashes_content(self):
+        """Test streamed saves return the size and SHA-256 of the bytes written"""
+        content = b'%PDF resume' * 10000
+
+        written, content_hash = save_stream(io.BytesIO(content), self.path)
+
+        self.assertEqual(written, len(content))
+        self.assertEqual(content_hash, hashlib.sha256(content).hexdigest())
+        self.assertEqual(hash_file(self.path), content_hash)
+
+    def test_save_stream_size_limit(self):
+        """Test streamed saves stop and clean up once the size limit is exceeded"""
+        with self.assertRaises(FileTooLarge):
+            save_stream(io.BytesIO(b'x' * 20), self.path, max_bytes=10)
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import os
+import sys
+import json
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ibm_cloud_sdk_core import ApiException, DetailedResponse
+from database_case import DatabaseTestCase
+from services import jd_matching
+from services.jd_matching import AssistantSessionPool, JDMatcher, get_jd_matcher
+
+JOB_DESCRIPTION = "Backend engineer. Requirements: Python and SQL experience"
+RESUME = "Python developer with SQL and Docker experience."
+
+CREDENTIALS = {
+    'WATSONX_API_KEY': 'test-key',
+    'WATSONX_URL': 'https://assistant.example.com',
+    'WATSONX_PROJECT_ID': 'assistant-id'
+}
+
+
+class FakeAssistant:
+    """Records session traffic and answers every message with a canned reply"""
+
+    def __init__(self, reply='{"match_score": 72, "explanation": "fits"}'):
+        self.reply = reply
+        self.created = []
+        self.deleted = []
+        self.messages = []
+        self.failures = []
+
+    def create_session(self, assistant_id):
+        session_id = f's{len(self.created)}'
+        self.created.append(session_id)
+        return DetailedResponse(response={'session_id': session_id})
+
+    def delete_session(self, assistant_id, session_id):
+        self.deleted.append(session_id)
+
+    def message(self, assistant_id, session_id, input):
+        self.messages.append(session_id)
+        if self.failures:
+            raise self.failures.pop(0)
+        return DetailedResponse(response={'output': {'generic': [{'text': self.reply}]}})
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAssistantSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.assistant = FakeAssistant()
+        self.clock = Clock()
+        self.pool = AssistantSessionPool(self.assistant, 'assistant-id', max_idle=2, ttl=60, clock=self.clock)
+
+    def test_released_session_is_reused(self):
+        """Test a released session is handed out again instead of creating one"""
+        first = self.pool.acquire()
+        self.pool.release(first)
+        self.assertEqual(self.pool.acquire(), first)
+        self.assertEqual(self.assistant.created, [first])
+
+    def test_expired_sessions_are_replaced(self):
+        """Test sessions idle past the TTL are deleted and a fresh one is opened"""
+        self.pool.prewarm(2)
+        self.assertEqual(len(self.pool), 2)
+
+        self.clock.now = 61
+        session_id = self.pool.acquire()
+        self.assertEqual(sorted(self.assistant.deleted), ['s0', 's1'])
+        self.assertEqual(session_id, 's2')
+        self.assertEqual(len(self.pool), 0)
+
+    def test_unhealthy_and_surplus_sessions_are_deleted(self):
+        """Test broken sessions and sessions beyond max_idle are not kept"""
+        sessions = [self.pool.acquire() for _ in range(4)]
+        self.pool.release(sessions[0], healthy=False)
+        for session_id in sessions[1:]:
+            self.pool.release(session_id)
+
+        self.assertEqual(len(self.pool), 2)
+        self.assertEqual(self.assistant.deleted, [sessions[0], sessions[3]])
+        self.pool.close()
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(sorted(self.assistant.deleted), sorted(sessions))
+
+
+class TestJDMatcher(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with mock.patch.dict(os.environ, CREDENTIALS):
+            self.matcher = JDMatcher()
+        self.assistant = FakeAssistant()
+        self.matcher.assistant = self.assistant
+        self.matcher.sessions = AssistantSessionPool(self.assistant, 'assistant-id')
+
+    def test_matches_share_one_session(self):
+        """Test consecutive matches reuse a pooled session without deleting it"""
+        for _ in range(3):
+            result = self.matcher.match_jd_resume(JOB_DESCRIPTION, RESUME)
+        self.assertEqual(result, json.loads(self.assistant.reply))
+        self.assertEqual(self.assistant.created, ['s0'])
+        self.assertEqual(self.assistant.messages, ['s0', 's0', 's0'])
+        self.assertEqual(self.assistant.deleted, [])
+
+    def test_unparseable_reply_returns_session(self):
+        """Test a reply that is not JSON raises but keeps the session for reuse"""
+        self.assistant.reply = 'not json'
+        with self.assertRaises(Exception):
+            self.matcher.match_jd_resume(JOB_DESCRIPTION, RESUME)
+        self.assertEqual(self.assistant.deleted, [])
+        self.assertEqual(len(self.matcher.sessions), 1)
+
+    def test_expired_session_is_retried_once(self):
+        """Test a session the service no longer knows is dropped and the message resent"""
+        self.assistant.failures = [ApiException(404, message='Invalid Session')]
+        result = self.matcher.match_jd_resume(JOB_DESCRIPTION, RESUME)
+
+        self.assertEqual(result['match_score'], 72)
+        self.assertEqual(self.assistant.messages, ['s0', 's1'])
+        self.assertEqual(self.assistant.deleted, [])
+        self.assertEqual(len(self.matcher.sessions), 1)
+
+    def test_api_error_discards_session(self):
+        """Test other service errors are raised and the session is deleted"""
+        self.assistant.failures = [ApiException(500, message='Internal Server Error')]
+        with self.assertRaises(Exception):
+            self.matcher.match_jd_resume(JOB_DESCRIPTION, RESUME)
+        self.assertEqual(self.assistant.deleted, ['s0'])
+        self.assertEqual(len(self.matcher.sessions), 0)
+
+    def test_connection_pool_sized_for_workers(self):
+        """Test the client keeps a keep-alive pool sized by JD_MATCHER_CONNECTIONS"""
+        with mock.patch.dict(os.environ, CREDENTIALS):
+            adapter = JDMatcher().assistant.http_client.get_adapter('https://assistant.example.com')
+        self.assertEqual(adapter._pool_maxsize, jd_matching.JD_MATCHER_CONNECTIONS)
+
+
+class TestSharedMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.original = jd_matching._matcher
+        jd_matching._matcher = None
+
+    def tearDown(self):
+        jd_matching._matcher = self.original
+
+    def test_matcher_created_once(self):
+        """Test every caller gets the same process-wide matcher"""
+        with mock.patch.dict(os.environ, CREDENTIALS), \
+                mock.patch.object(AssistantSessionPool, 'prewarm'), \
+                mock.patch.object(jd_matching.atexit, 'register'):
+            self.assertIs(get_jd_matcher(), get_jd_matcher())
+
+    def test_missing_credentials_not_cached(self):
+        """Test a configuration error is raised on each call rather than remembered"""
+        with mock.patch.dict(os.environ, {key: '' for key in CREDENTIALS}):
+            with self.assertRaises(Exception):
+                get_jd_matcher()
+        self.assertIsNone(jd_matching._matcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
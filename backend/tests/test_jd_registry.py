@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database_case import DatabaseTestCase
+from services.advanced_ranking import advanced_ranking_service
+from services.jd_registry import JDRegistry, UnknownJobDescription, job_description_hash
+
+JOB_DESCRIPTION = """Senior backend engineer to lead a small team.
+Requirements: Python, SQL and Docker experience
+Must have kubernetes cluster operations"""
+
+RESUME = "Python and SQL developer who led teams and shipped Docker services."
+
+
+class TestJDRegistry(DatabaseTestCase):
+
+    def test_register_parses_once_per_content(self):
+        """Test identical job descriptions share one id and one parse"""
+        registry = JDRegistry()
+        first = registry.register(JOB_DESCRIPTION)
+        second = registry.register(f"\n  {JOB_DESCRIPTION}  \n")
+
+        self.assertIs(first, second)
+        self.assertEqual(first.jd_id, job_description_hash(JOB_DESCRIPTION))
+        self.assertEqual(registry.stats()['hits'], 1)
+        self.assertIn('kubernetes cluster operations', first.requirements)
+        self.assertEqual(first.skills, ('python', 'sql', 'docker', 'kubernetes'))
+        self.assertIn('lead', first.keywords)
+
+    def test_empty_text_is_not_registered(self):
+        """Test missing or blank job descriptions resolve to None"""
+        registry = JDRegistry()
+        self.assertIsNone(registry.register(None))
+        self.assertIsNone(registry.register('   '))
+        with self.assertRaises(ValueError):
+            registry.register(42)
+
+    def test_lru_bounds_entries_and_characters(self):
+        """Test least recently used parses are evicted beyond either bound"""
+        registry = JDRegistry(max_entries=2)
+        a = registry.register("Job A: " + JOB_DESCRIPTION)
+        registry.register("Job B: " + JOB_DESCRIPTION)
+        registry.get(a.jd_id)
+        registry.register("Job C: " + JOB_DESCRIPTION)
+        self.assertEqual(registry.stats()['entries'], 2)
+        self.assertIs(registry.get(a.jd_id), a)
+
+        small = JDRegistry(max_chars=len(JOB_DESCRIPTION) + 10)
+        small.register("Job A: " + JOB_DESCRIPTION)
+        small.register("Job B: " + JOB_DESCRIPTION)
+        self.assertEqual(small.stats()['entries'], 1)
+
+    def test_evicted_or_new_process_reloads_from_database(self):
+        """Test ids stay resolvable after the in-memory parse is gone"""
+        jd_id = JDRegistry().register(JOB_DESCRIPTION).jd_id
+
+        fresh = JDRegistry()
+        parsed = fresh.resolve(jd_id=jd_id)
+        self.assertEqual(parsed.text, JOB_DESCRIPTION)
+        with self.assertRaises(UnknownJobDescription):
+            fresh.resolve(jd_id='missing')
+
+    def test_ranking_accepts_parsed_job_description(self):
+        """Test advanced ranking gives the same result for the text and its parse"""
+        parsed = JDRegistry().register(JOB_DESCRIPTION)
+        from_text = advanced_ranking_service.generate_advanced_ranking(RESUME, JOB_DESCRIPTION)
+        from_parse = advanced_ranking_service.generate_advanced_ranking(RESUME, parsed)
+        for result in (from_text, from_parse):
+            result.pop('recommendations')
+        self.assertEqual(from_text, from_parse)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.job_queue import JobQueue, JobQueueFull
+
+def wait_for_status(queue, job_id, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get_job(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {statuses}")
+
+class TestJobQueue(unittest.TestCase):
+
+    def test_job_reports_stages_and_result(self):
+        """Test completed jobs expose per-stage progress and the final result"""
+        queue = JobQueue(max_workers=1)
+
+        def pipeline(value, on_progress=None):
+            on_progress('extracted', None)
+            on_progress('saved', None)
+            return {'value': value}
+
+        job_id = queue.submit(pipeline, 42)
+        job = wait_for_status(queue, job_id, ('completed', 'failed'))
+
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['result'], {'value': 42})
+        self.assertEqual([s['stage'] for s in job['stages']], ['extracted', 'saved'])
+        self.assertEqual(job['current_stage'], 'saved')
+
+    def test_failed_job_records_error(self):
+        """Test exceptions in the pipeline mark the job as failed"""
+        queue = JobQueue(max_workers=1)
+
+        def pipeline(on_progress=None):
+            raise Exception("extraction failed")
+
+        job_id = queue.submit(pipeline)
+        job = wait_for_status(queue, job_id, ('completed', 'failed'))
+
+        self.assertEqual(job['status'], 'failed')
+        self.assertIn("extraction failed", job['error'])
+
+    def test_submit_rejected_when_full(self):
+        """Test the queue rejects work beyond its pending limit"""
+        queue = JobQueue(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        def pipeline(on_progress=None):
+            release.wait(5)
+
+        job_id = queue.submit(pipeline)
+        with self.assertRaises(JobQueueFull):
+            queue.submit(pipeline)
+
+        release.set()
+        wait_for_status(queue, job_id, ('completed',))
+        queue.submit(lambda on_progress=None: None)
+
+    def test_iter_events_streams_stages_then_result(self):
+        """Test job events carry partial results and end with the final outcome"""
+        queue = JobQueue(max_workers=1)
+        release = threading.Event()
+
+        def pipeline(on_progress=None):
+            on_progress('extracted', {'characters': 10})
+            release.wait(5)
+            on_progress('saved', None)
+            return {'success': True}
+
+        job_id = queue.submit(pipeline)
+        events = queue.iter_events(job_id, heartbeat_seconds=0.05)
+
+        self.assertEqual(next(events), (0, 'extracted', {'characters': 10}))
+        self.assertEqual(next(events), (None, None, None))
+        release.set()
+        self.assertEqual(list(events), [(1, 'saved', None), (2, 'completed', {'success': True})])
+
+        resumed = list(queue.iter_events(job_id, start=2))
+        self.assertEqual(resumed, [(2, 'completed', {'success': True})])
+
+    def test_unknown_job(self):
+        """Test unknown job ids return None"""
+        queue = JobQueue(max_workers=1)
+        self.assertIsNone(queue.get_job('missing'))
+
+if __name__ == '__main__':
+    unittest.main()
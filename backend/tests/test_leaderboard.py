@@ -0,0 +1,116 @@
+import unittest
+import os
+import sys
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database_case import DatabaseTestCase
+from services import database
+from services.leaderboard import JDLeaderboard, LeaderboardRegistry, leaderboard_score
+
+
+def _candidate(candidate_id, match_score, advanced_score, jd_id='jd-1', upload_date='2024-01-01T00:00:00'):
+    return {
+        'id': candidate_id,
+        'filename': f'{candidate_id}.pdf',
+        'upload_date': upload_date,
+        'resume_text': '',
+        'analysis_result': {},
+        'jd_id': jd_id,
+        'jd_match_result': {'match_score': match_score},
+        'advanced_ranking': {'overall_advanced_score': advanced_score}
+    }
+
+
+class TestJDLeaderboard(unittest.TestCase):
+
+    def test_insertions_match_full_sort(self):
+        """Test incremental inserts and re-scores keep the same order as sorting from scratch"""
+        random.seed(3)
+        board = JDLeaderboard('jd')
+        scores = {}
+        for i in range(300):
+            candidate_id = f'c{random.randint(0, 150)}'
+            scores[candidate_id] = (random.randint(0, 100), random.randint(0, 100))
+            board.add(candidate_id, None, '2024-01-01', *scores[candidate_id])
+
+        expected = sorted(scores, key=lambda c: (-leaderboard_score(*scores[c]), c))
+        self.assertEqual([entry['candidate_id'] for entry in board.window(0, len(scores))], expected)
+        self.assertEqual(board.position(expected[10])['rank'], 11)
+
+    def test_windows_and_percentiles(self):
+        """Test rank windows page through the board and percentiles span 100 to 0"""
+        board = JDLeaderboard('jd')
+        for i, score in enumerate([10, 90, 50, 70, 30]):
+            rank = board.add(f'c{i}', None, f'2024-01-0{i + 1}', score, score)
+
+        self.assertEqual(rank, 4)
+        page = board.window(offset=1, limit=2)
+        self.assertEqual([(e['rank'], e['candidate_id']) for e in page], [(2, 'c3'), (3, 'c2')])
+        self.assertEqual(board.position('c1')['percentile'], 100.0)
+        self.assertEqual(board.position('c2')['percentile'], 50.0)
+        self.assertEqual(board.position('c0')['percentile'], 0.0)
+        self.assertEqual(board.window(offset=10), [])
+
+    def test_ties_go_to_earlier_upload_and_missing_scores_count_zero(self):
+        """Test equal scores rank by upload date and missing scores rank last"""
+        board = JDLeaderboard('jd')
+        board.add('late', None, '2024-02-01', 80, 60)
+        board.add('early', None, '2024-01-01', 60, 80)
+        board.add('unscored', None, '2023-01-01', None, None)
+        self.assertEqual([e['candidate_id'] for e in board.window()], ['early', 'late', 'unscored'])
+
+        self.assertTrue(board.remove('early'))
+        self.assertFalse(board.remove('early'))
+        self.assertEqual(board.position('late')['rank'], 1)
+
+
+class TestLeaderboardRegistry(DatabaseTestCase):
+
+    def test_loads_stored_candidates_and_records_arrivals(self):
+        """Test a board loads from the database once and later arrivals are ranked immediately"""
+        for candidate in (_candidate('a', 80, 70), _candidate('b', 40, 50), _candidate('other', 99, 99, jd_id='jd-2')):
+            database.save_candidate(candidate)
+        registry = LeaderboardRegistry()
+        self.assertEqual(registry.window('jd-1')['total_candidates'], 2)
+
+        arrival = _candidate('c', 70, 60)
+        database.save_candidate(arrival)
+        position = registry.record(arrival)
+
+        self.assertEqual((position['rank'], position['total_candidates']), (2, 3))
+        self.assertEqual(position['percentile'], 50.0)
+        self.assertEqual([e['candidate_id'] for e in registry.window('jd-1')['leaderboard']], ['a', 'c', 'b'])
+
+    def test_reanalysis_moves_candidate_between_boards(self):
+        """Test a candidate re-screened against another job description leaves the old board"""
+        database.save_candidate(_candidate('a', 80, 70))
+        registry = LeaderboardRegistry()
+        self.assertIsNotNone(registry.position('jd-1', 'a'))
+
+        moved = _candidate('a', 50, 50, jd_id='jd-2')
+        database.save_candidate(moved)
+        registry.record(moved)
+
+        self.assertIsNone(registry.position('jd-1', 'a'))
+        self.assertEqual(registry.position('jd-2', 'a')['rank'], 1)
+        self.assertIsNone(registry.record(_candidate('x', 1, 1, jd_id=None)))
+
+    def test_changes_from_other_processes_are_replayed(self):
+        """Test saves and deletes made elsewhere reach a board that is already loaded"""
+        database.save_candidate(_candidate('a', 80, 70))
+        registry = LeaderboardRegistry()
+        self.assertEqual(registry.window('jd-1')['total_candidates'], 1)
+
+        # Saved by another worker, which never calls this registry's record()
+        database.save_candidate(_candidate('b', 90, 90))
+        database.save_candidate(_candidate('a', 10, 10))
+        self.assertEqual([e['candidate_id'] for e in registry.window('jd-1')['leaderboard']], ['b', 'a'])
+
+        database.delete_candidate('b')
+        self.assertIsNone(registry.position('jd-1', 'b'))
+        self.assertEqual(registry.window('jd-1')['total_candidates'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
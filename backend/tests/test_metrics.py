@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.metrics import MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_renders_cumulative_buckets(self):
+        """Test histograms render cumulative buckets, sum and count"""
+        histogram = self.registry.histogram('stage_seconds', 'Stage duration', ['stage'], buckets=(0.1, 1))
+        histogram.observe(0.05, stage='bias')
+        histogram.observe(0.5, stage='bias')
+        histogram.observe(5, stage='bias')
+
+        output = self.registry.render()
+
+        self.assertIn('# TYPE stage_seconds histogram', output)
+        self.assertIn('stage_seconds_bucket{stage="bias",le="0.1"} 1', output)
+        self.assertIn('stage_seconds_bucket{stage="bias",le="1"} 2', output)
+        self.assertIn('stage_seconds_bucket{stage="bias",le="+Inf"} 3', output)
+        self.assertIn('stage_seconds_sum{stage="bias"} 5.55', output)
+        self.assertIn('stage_seconds_count{stage="bias"} 3', output)
+
+    def test_counter_and_gauge(self):
+        """Test counters accumulate and gauges read their callback"""
+        counter = self.registry.counter('llm_calls_total', 'LLM calls', ['service'])
+        counter.inc(service='jd_match')
+        counter.inc(2, service='jd_match')
+        self.registry.gauge('jobs', 'Jobs', ['status'], callback=lambda: {('queued',): 4})
+
+        output = self.registry.render()
+
+        self.assertIn('llm_calls_total{service="jd_match"} 3', output)
+        self.assertIn('jobs{status="queued"} 4', output)
+
+    def test_label_validation(self):
+        """Test observations must provide exactly the declared labels"""
+        counter = self.registry.counter('failures_total', 'Failures', ['system'])
+        with self.assertRaises(ValueError):
+            counter.inc(service='workday')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import parsed_resume
+from services.parsed_resume import ParsedResume, parse_resume
+from services.profile_verification import extract_links
+
+RESUME = """Jane Doe
+jane@example.com | https://github.com/janedoe | https://www.linkedin.com/in/jane-doe.
+
+Summary
+Backend engineer who enjoys distributed systems.
+
+Experience
+Senior Engineer, Acme Corp  Jan 2019 - Present
+Engineer, Initech  06/2015 to 2018
+
+Education
+BSc Computer Science, 2015
+
+Skills: Python, C++, Node.js, Kubernetes
+"""
+
+class TestParsedResume(unittest.TestCase):
+
+    def setUp(self):
+        self.resume = ParsedResume(RESUME)
+
+    def test_sections(self):
+        """Test headings split the resume into section spans"""
+        self.assertEqual(set(self.resume.sections), {'summary', 'experience', 'education', 'skills'})
+        self.assertTrue(self.resume.section('experience').startswith("Senior Engineer"))
+        self.assertEqual(self.resume.section('skills'), "Python, C++, Node.js, Kubernetes")
+        self.assertEqual(self.resume.section('projects'), '')
+
+    def test_tokens_keep_technology_names(self):
+        """Test tokens are lowercased and keep names like c++ and node.js"""
+        for token in ('python', 'c++', 'node.js', 'kubernetes'):
+            self.assertIn(token, self.resume.tokens)
+
+    def test_date_ranges(self):
+        """Test date ranges are detected with ongoing ranges left open"""
+        years = [(r.start_year, r.end_year) for r in self.resume.date_ranges]
+        self.assertEqual(years, [(2019, None), (2015, 2018)])
+
+    def test_links(self):
+        """Test links are found without trailing punctuation and feed profile enrichment"""
+        self.assertEqual(self.resume.links, ['https://github.com/janedoe', 'https://www.linkedin.com/in/jane-doe'])
+        self.assertEqual(
+            extract_links(self.resume),
+            (['https://www.linkedin.com/in/jane-doe'], ['https://github.com/janedoe'])
+        )
+
+    def test_relevant_text_orders_sections_and_skips_contact_details(self):
+        """Test LLM text leads with screening sections and leaves out the header"""
+        text = self.resume.relevant_text(4000)
+        self.assertTrue(text.startswith("SKILLS:\nPython"))
+        self.assertNotIn("jane@example.com", text)
+        self.assertEqual(len(self.resume.relevant_text(20)), 20)
+
+    def test_relevant_text_without_sections(self):
+        """Test resumes without recognised headings fall back to the text prefix"""
+        self.assertEqual(ParsedResume("Just some text").relevant_text(4), "Just")
+
+    def test_cap_applies_to_analyzers_only(self):
+        """Test text past MAX_RESUME_CHARS is hidden from analyzers but kept in full_text"""
+        with mock.patch.object(parsed_resume, 'MAX_RESUME_CHARS', 10):
+            resume = ParsedResume(RESUME)
+        self.assertEqual(resume.text, RESUME[:10])
+        self.assertEqual(resume.full_text, RESUME)
+
+    def test_parse_resume_reuses_parsed(self):
+        """Test parsing an already parsed resume returns the same object"""
+        self.assertIs(parse_resume(self.resume), self.resume)
+        self.assertEqual(parse_resume("Text").lower, "text")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.advanced_ranking import AdvancedRankingService
+from services.bias_detection import analyze_resume_bias, create_blind_version
+from services.parsed_resume import ParsedResume, MAX_RESUME_CHARS
+from services.profile_verification import extract_links
+
+# Repeated units aimed at the quantifiers in each analyzer's patterns
+ADVERSARIAL_UNITS = [
+    'a', ' ', '\t', '\n', '-', '.', '@', 'a@', 'a.', '1 a,', 'Aa A. ', '(555', 'jan 2019 ',
+    'http://a', 'skills: ', 'must have ', 'a' * 39 + ' ', '1' + ' a' * 9, '1 aaaa,bbbb.cc-dd '
+]
+
+INPUT_CHARS = 50000
+
+# Generous per-call bound; linear scans of 50KB take tens of milliseconds
+MAX_SECONDS = 2.0
+
+
+class TestRegexSafety(unittest.TestCase):
+
+    def setUp(self):
+        self.ranking = AdvancedRankingService()
+        self.analyzers = {
+            'bias': analyze_resume_bias,
+            'blind': create_blind_version,
+            'ranking': lambda text: self.ranking.generate_advanced_ranking(text, text),
+            'links': extract_links,
+            'parse': self._parse_all
+        }
+
+    @staticmethod
+    def _parse_all(text):
+        resume = ParsedResume(text)
+        return resume.tokens, resume.sections, resume.date_ranges, resume.links
+
+    def test_analyzers_stay_fast_on_pathological_input(self):
+        """Test every analyzer handles adversarial repeated input within the time bound"""
+        for unit in ADVERSARIAL_UNITS:
+            text = unit * (INPUT_CHARS // len(unit))
+            for name, analyze in self.analyzers.items():
+                with self.subTest(analyzer=name, unit=unit):
+                    start = time.perf_counter()
+                    analyze(text)
+                    self.assertLess(time.perf_counter() - start, MAX_SECONDS)
+
+    def test_oversized_resume_is_truncated(self):
+        """Test resume text beyond MAX_RESUME_CHARS is ignored"""
+        resume = ParsedResume('a' * (MAX_RESUME_CHARS + 10))
+        self.assertEqual(len(resume.text), MAX_RESUME_CHARS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,27 @@
 import unittest
 import os
 import sys
+import shutil
+import tempfile
+import time
+import zipfile
+from unittest import mock
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from services.resume_parser import extract_text_from_file
+from reportlab.pdfgen import canvas
+from docx import Document
+from services import resume_parser
+from services.resume_parser import (
+    extract_text_from_file, extract_text_from_pdf, extract_text_from_docx, extract_text_prefix, _page_ranges,
+    extract_text_cached, read_cached_text, prune_text_cache
+)
+
+def write_test_pdf(path, pages):
+    pdf = canvas.Canvas(path)
+    for page in range(pages):
+        pdf.drawString(72, 720, f"Page {page} Python developer")
+        pdf.showPage()
+    pdf.save()
 
 class TestResumeParser(unittest.TestCase):
 
@@ -45,5 +63,159 @@ class TestResumeParser(unittest.TestCase):
             # Expected for non-existent file
             self.assertIn("File does not exist", str(e))
 
+    def test_extract_text_from_pdf_parallel_matches_serial(self):
+        """Test page-parallel PDF extraction returns the same text as the serial path"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 5)
+        try:
+            serial = extract_text_from_pdf(pdf_path, parallel=False)
+            parallel = extract_text_from_pdf(pdf_path, parallel=True)
+            self.assertEqual(serial, parallel)
+            self.assertIn("Page 0", serial)
+            self.assertIn("Page 4", serial)
+        finally:
+            os.remove(pdf_path)
+
+    def test_extract_text_from_pdf_page_cap(self):
+        """Test pages past the cap are not extracted"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 5)
+        try:
+            text = extract_text_from_pdf(pdf_path, max_pages=2)
+            self.assertIn("Page 1", text)
+            self.assertNotIn("Page 2", text)
+        finally:
+            os.remove(pdf_path)
+
+    def test_extract_text_from_pdf_counts_pages_in_workers(self):
+        """Test the reader is only ever opened inside the pool, including to count pages"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 5)
+        try:
+            with mock.patch.object(resume_parser.PyPDF2, 'PdfReader', side_effect=AssertionError("opened in caller")):
+                for parallel in (False, True):
+                    text = extract_text_from_pdf(pdf_path, max_pages=4, parallel=parallel)
+                    self.assertIn("Page 3", text)
+                    self.assertNotIn("Page 4", text)
+        finally:
+            os.remove(pdf_path)
+
+    def test_pdf_worker_pool_kills_overrunning_tasks(self):
+        """Test a task past its budget is killed and the pool keeps serving later extractions"""
+        pool = resume_parser.PdfWorkerPool(workers=1)
+        try:
+            with self.assertRaises(Exception) as raised:
+                pool.starmap(time.sleep, [(30,)], timeout=0.5)
+            self.assertIn("exceeded", str(raised.exception))
+            self.assertEqual(pool.starmap(max, [(1, 2), (4, 3)], timeout=30), [2, 4])
+        finally:
+            pool.close()
+
+    def test_page_ranges_cover_all_pages(self):
+        """Test page ranges are contiguous and cover every page once"""
+        self.assertEqual(_page_ranges(10, 4), [(0, 3), (3, 6), (6, 9), (9, 10)])
+        self.assertEqual(_page_ranges(2, 8), [(0, 1), (1, 2)])
+
+    def test_extract_text_prefix_stops_at_budget(self):
+        """Test prefix extraction stops once the character budget is met"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 5)
+        try:
+            text, complete = extract_text_prefix(pdf_path, max_chars=40)
+            self.assertFalse(complete)
+            self.assertLessEqual(len(text), 40)
+            self.assertTrue(text.startswith("Page 0"))
+            self.assertNotIn("Page 4", text)
+        finally:
+            os.remove(pdf_path)
+
+    def test_extract_text_prefix_whole_document(self):
+        """Test a document within budget is returned whole and marked complete"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 3)
+        try:
+            text, complete = extract_text_prefix(pdf_path, max_tokens=1000)
+            self.assertTrue(complete)
+            self.assertEqual(text, extract_text_from_pdf(pdf_path, parallel=False))
+        finally:
+            os.remove(pdf_path)
+
+    def test_extract_text_prefix_pdf_runs_under_budget(self):
+        """Test PDF prefix extraction goes through the killable worker pool"""
+        pdf_path = 'test_resume_pages.pdf'
+        write_test_pdf(pdf_path, 2)
+        overrun = Exception("PDF extraction exceeded 5s")
+        try:
+            with mock.patch.object(resume_parser.pdf_worker_pool, 'starmap', side_effect=overrun) as starmap:
+                with self.assertRaises(Exception) as raised:
+                    extract_text_prefix(pdf_path, max_chars=40, timeout=5)
+            self.assertIn("exceeded", str(raised.exception))
+            self.assertEqual(starmap.call_args[0][2], 5)
+        finally:
+            os.remove(pdf_path)
+
+    def test_extract_text_from_docx_tables_and_headers(self):
+        """Test DOCX extraction includes header, table cell and footer text in reading order"""
+        docx_path = 'test_resume.docx'
+        doc = Document()
+        doc.sections[0].header.paragraphs[0].text = "Jane Doe"
+        doc.add_paragraph("Software Engineer")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Python"
+        table.cell(0, 1).text = "Kubernetes"
+        doc.sections[0].footer.paragraphs[0].text = "jane@example.com"
+        doc.save(docx_path)
+        try:
+            text = extract_text_from_docx(docx_path)
+            self.assertEqual(text, "Jane Doe\nSoftware Engineer\nPython\nKubernetes\njane@example.com")
+        finally:
+            os.remove(docx_path)
+
+    def test_extract_text_from_docx_text_box_once(self):
+        """Test text box content is extracted once, skipping its legacy fallback copy"""
+        docx_path = 'test_resume.docx'
+        document = (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+            'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"><w:body>'
+            '<w:p><w:r><w:t>Summary</w:t></w:r><w:r><mc:AlternateContent>'
+            '<mc:Choice><w:txbxContent><w:p><w:r><w:t>Skills: Go</w:t></w:r></w:p></w:txbxContent></mc:Choice>'
+            '<mc:Fallback><w:txbxContent><w:p><w:r><w:t>Skills: Go</w:t></w:r></w:p></w:txbxContent></mc:Fallback>'
+            '</mc:AlternateContent></w:r></w:p></w:body></w:document>'
+        )
+        with zipfile.ZipFile(docx_path, 'w') as archive:
+            archive.writestr('word/document.xml', document)
+        try:
+            self.assertEqual(extract_text_from_docx(docx_path), "Skills: Go\nSummary")
+        finally:
+            os.remove(docx_path)
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_folder = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.cache_folder, 'resume.pdf')
+        write_test_pdf(self.pdf_path, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_folder)
+
+    def test_second_extraction_reads_cache(self):
+        """Test identical file bytes are parsed once and then served from the cache"""
+        text = extract_text_cached(self.pdf_path, 'abc', cache_folder=self.cache_folder)
+        self.assertEqual(read_cached_text('abc', self.cache_folder), text)
+
+        with mock.patch.object(resume_parser, 'extract_text_from_file') as extract:
+            self.assertEqual(extract_text_cached(self.pdf_path, 'abc', cache_folder=self.cache_folder), text)
+            extract.assert_not_called()
+
+    def test_parser_version_change_invalidates_entries(self):
+        """Test entries from another parser version are missed and pruned"""
+        extract_text_cached(self.pdf_path, 'abc', cache_folder=self.cache_folder)
+
+        with mock.patch.object(resume_parser, 'PARSER_VERSION', 'next'):
+            self.assertIsNone(read_cached_text('abc', self.cache_folder))
+            self.assertEqual(prune_text_cache(self.cache_folder), 1)
+        self.assertEqual(os.listdir(self.cache_folder), ['resume.pdf'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database_case import DatabaseTestCase
+from services import database
+from services.advanced_ranking import advanced_ranking_service
+from services.jd_registry import jd_registry
+from services.role_matching import RoleMatcher
+
+ROLES = {
+    'Backend Engineer': """Backend engineer building Python services.
+Requirements: Python, SQL and Docker experience
+Must have kubernetes cluster operations""",
+    'Data Scientist': """Data scientist for our machine learning team.
+Requirements: machine learning and data science background
+Must have strong communication with stakeholders""",
+    'Frontend Developer': """Frontend developer for our design system.
+Requirements: React and JavaScript expertise
+Required teamwork with designers"""
+}
+
+RESUME = ("Senior engineer. Python, SQL, Docker and Kubernetes in production. "
+          "Built Python services and led platform teams.")
+
+
+class TestRoleMatcher(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.jd_ids = {}
+        for title, text in ROLES.items():
+            parsed = jd_registry.register(text)
+            # The shared registry skips storing job descriptions it parsed for an earlier test database
+            database.save_job_description(parsed.jd_id, parsed.text)
+            self.jd_ids[title] = parsed.jd_id
+            database.update_job_description(self.jd_ids[title], True, title)
+
+    def test_best_fit_role_first(self):
+        """Test the resume's closest requisition ranks first"""
+        report = RoleMatcher().match(RESUME)
+
+        self.assertEqual(report['open_roles'], 3)
+        self.assertEqual([m['title'] for m in report['matches']][0], 'Backend Engineer')
+        best = report['matches'][0]
+        self.assertEqual(best['matched_skills'], ['python', 'sql', 'docker', 'kubernetes'])
+        self.assertEqual(best['missing_skills'], [])
+        self.assertEqual(best['skill_coverage'], 100.0)
+        scores = [m['fit_score'] for m in report['matches']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_gaps_match_skill_gap_analysis(self):
+        """Test batched gap counts equal analyze_skill_gaps for every role"""
+        report = RoleMatcher().match(RESUME)
+        for match in report['matches']:
+            with self.subTest(role=match['title']):
+                expected = advanced_ranking_service.generate_advanced_ranking(
+                    RESUME, ROLES[match['title']])['skill_gap_analysis']
+                self.assertEqual(match['missing_skills_count'], expected['missing_skills_count'])
+                self.assertEqual(match['job_specific_gaps'], [gap.lower() for gap in expected['job_specific_gaps']])
+
+    def test_closing_a_role_rebuilds_matrices(self):
+        """Test closed requisitions drop out and the limit caps the result"""
+        matcher = RoleMatcher()
+        self.assertEqual(len(matcher.match(RESUME, limit=2)['matches']), 2)
+
+        database.update_job_description(self.jd_ids['Backend Engineer'], is_open=False)
+        report = matcher.match(RESUME)
+        self.assertEqual(report['open_roles'], 2)
+        self.assertNotIn('Backend Engineer', [m['title'] for m in report['matches']])
+
+    def test_no_open_roles(self):
+        """Test matching with no open requisitions returns no roles"""
+        for jd_id in self.jd_ids.values():
+            database.update_job_description(jd_id, is_open=False)
+        self.assertEqual(RoleMatcher().match(RESUME)['matches'], [])
+        self.assertFalse(database.update_job_description('missing', is_open=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import sys
+import threading
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from database_case import DatabaseTestCase
+from services import database
+from services import semantic_prefilter
+from services.semantic_prefilter import (
+    vectorize, encode_text_vector, decode_text_vectors, cosine_similarities, shortlist_candidates,
+    TEXT_VECTOR_VERSION
+)
+
+JOB_DESCRIPTION = "Backend engineer: Python, Django and PostgreSQL APIs, Kubernetes deployments."
+
+RESUMES = {
+    'backend': "Built Python Django APIs on PostgreSQL and ran Kubernetes deployments.",
+    'frontend': "React, TypeScript developer building design systems.",
+    'partial': "Python scripting for data analysis in pandas.",
+    'empty': ""
+}
+
+
+class TestVectors(unittest.TestCase):
+
+    def test_vectorize_counts_unigrams_and_bigrams(self):
+        """Test a text hashes to sorted unique buckets with sublinear frequencies"""
+        indices, weights = vectorize("python python developer")
+        self.assertEqual(len(indices), 4)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertAlmostEqual(float(weights.max()), 1 + np.log(2), places=5)
+        self.assertEqual(len(vectorize("")[0]), 0)
+
+    def test_encoding_round_trip(self):
+        """Test packed vectors decode back into CSR rows, including empty ones"""
+        encoded = [encode_text_vector(text) for text in RESUMES.values()]
+        indptr, indices, weights = decode_text_vectors(encoded)
+
+        self.assertEqual(len(indptr), len(RESUMES) + 1)
+        for row, text in enumerate(RESUMES.values()):
+            expected_indices, expected_weights = vectorize(text)
+            self.assertTrue(np.array_equal(indices[indptr[row]:indptr[row + 1]], expected_indices))
+            self.assertTrue(np.allclose(weights[indptr[row]:indptr[row + 1]], expected_weights))
+
+    def test_similarity_prefers_matching_resume(self):
+        """Test cosine similarity ranks the matching resume first and gives empty text zero"""
+        matrix = decode_text_vectors([encode_text_vector(text) for text in RESUMES.values()])
+        similarities = dict(zip(RESUMES, cosine_similarities(matrix, JOB_DESCRIPTION)))
+
+        self.assertGreater(similarities['backend'], similarities['partial'])
+        self.assertGreater(similarities['partial'], similarities['frontend'])
+        self.assertEqual(similarities['empty'], 0)
+        self.assertLessEqual(similarities['backend'], 1 + 1e-9)
+        self.assertEqual(len(cosine_similarities(decode_text_vectors([]), JOB_DESCRIPTION)), 0)
+
+
+class TestShortlist(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for candidate_id, text in RESUMES.items():
+            self.save_candidate(
+                candidate_id,
+                resume_text=text,
+                # Legacy rows without a vector are vectorised on first use
+                text_vector=encode_text_vector(text) if candidate_id != 'partial' else None,
+                text_vector_version=TEXT_VECTOR_VERSION if candidate_id != 'partial' else None
+            )
+
+    def test_only_shortlist_reaches_llm(self):
+        """Test the LLM matcher runs once per shortlisted candidate, best match first"""
+        calls = []
+        threads = set()
+
+        def fake_match(job_description, resume_text):
+            calls.append(resume_text)
+            threads.add(threading.current_thread().name)
+            return {'match_score': 90, 'explanation': 'fits'}
+
+        with mock.patch.object(semantic_prefilter, 'match_job_description', fake_match):
+            report = shortlist_candidates(JOB_DESCRIPTION, shortlist_size=2)
+
+        self.assertEqual(report['total_candidates'], 4)
+        self.assertEqual([entry['candidate_id'] for entry in report['shortlist']], ['backend', 'partial'])
+        self.assertEqual(sorted(calls), sorted([RESUMES['backend'], RESUMES['partial']]))
+        # Matches run on the shortlist's own pool, not the shared pipeline stage pool
+        self.assertTrue(all(name.startswith('shortlist-match') for name in threads))
+        self.assertEqual(report['shortlist'][0]['jd_match_result']['match_score'], 90)
+        stored = {row[0]: row[2] for row in database.get_text_vectors()}
+        self.assertEqual(stored['partial'], TEXT_VECTOR_VERSION)
+
+    def test_without_explanations_no_llm_calls(self):
+        """Test explain=False ranks the requested candidates without calling the matcher"""
+        with mock.patch.object(semantic_prefilter, 'match_job_description') as match:
+            report = shortlist_candidates(JOB_DESCRIPTION, candidate_ids=['frontend', 'partial'], explain=False)
+
+        match.assert_not_called()
+        self.assertEqual(report['llm_calls'], 0)
+        self.assertEqual([entry['candidate_id'] for entry in report['shortlist']], ['partial', 'frontend'])
+        self.assertNotIn('jd_match_result', report['shortlist'][0])
+
+    def test_job_description_required(self):
+        """Test shortlisting without a job description raises ValueError"""
+        with self.assertRaises(ValueError):
+            shortlist_candidates('  ')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+import os
+import sys
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database_case import DatabaseTestCase
+from services import database
+from services import skill_index as skill_index_module
+from services.skill_index import (
+    SkillIndex, QuerySyntaxError, parse_query, normalize_skill, candidate_search_fields
+)
+
+
+class TestQueryParsing(unittest.TestCase):
+
+    def test_precedence_and_phrases(self):
+        """Test AND binds tighter than OR and adjacent words form one skill"""
+        self.assertEqual(
+            parse_query('Machine Learning and python OR NOT k8s'),
+            ('or', [('and', [('skill', 'machine learning'), ('skill', 'python')]),
+                    ('not', ('skill', 'kubernetes'))])
+        )
+        self.assertEqual(parse_query('"research and development"'), ('skill', 'research and development'))
+
+    def test_malformed_queries_rejected(self):
+        """Test empty, dangling and unbalanced queries raise QuerySyntaxError"""
+        for query in ('', '   ', 'python AND', '(python OR go', 'python)', 'NOT', 'AND python', '""', None):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    parse_query(query)
+
+    def test_normalize_skill(self):
+        """Test skills are lowercased, trimmed and folded onto their aliases"""
+        self.assertEqual(normalize_skill('  Node.JS '), 'node.js')
+        self.assertEqual(normalize_skill('NodeJS'), 'node.js')
+        self.assertEqual(normalize_skill('Machine   Learning,'), 'machine learning')
+        self.assertIsNone(normalize_skill(' , '))
+        self.assertIsNone(normalize_skill(3))
+
+    def test_candidate_search_fields(self):
+        """Test skills are merged from the LLM analysis and advanced ranking"""
+        skills, years, relevance = candidate_search_fields(
+            {'key_skills': ['Python', 'K8s'], 'hidden_skills': ['Mentoring'], 'years_experience': '6',
+             'relevance_score': 80},
+            {'skill_gap_analysis': {'skill_analysis': {'technical': {'found': ['python', 'docker']}}}}
+        )
+        self.assertEqual(skills, ['python', 'kubernetes', 'mentoring', 'docker'])
+        self.assertEqual((years, relevance), (6.0, 80.0))
+        self.assertEqual(candidate_search_fields(None), ([], None, None))
+
+    def test_unreadable_json_indexed_without_skills(self):
+        """Test a stored analysis that is not valid JSON is logged and yields no skills"""
+        with self.assertLogs(skill_index_module.logger, 'WARNING'):
+            skills, years, relevance = candidate_search_fields('{"key_skills": [', '{}')
+        self.assertEqual((skills, years, relevance), ([], None, None))
+
+
+class TestSkillIndex(DatabaseTestCase):
+
+    def _save(self, candidate_id, skills, years=None, relevance=None, indexed=True):
+        analysis = {'key_skills': skills, 'years_experience': years, 'relevance_score': relevance}
+        fields = {}
+        if indexed:
+            fields['skills'], fields['years_experience'], fields['relevance_score'] = \
+                candidate_search_fields(analysis)
+        self.save_candidate(candidate_id, analysis_result=analysis, **fields)
+
+    def _ids(self, index, query, **kwargs):
+        return [hit.candidate_id for hit in index.search(query, **kwargs)['hits']]
+
+    def test_boolean_queries(self):
+        """Test AND, OR and NOT combine posting lists"""
+        self._save('a', ['Python', 'Kubernetes'], relevance=70)
+        self._save('b', ['Python', 'Go'], relevance=90)
+        self._save('c', ['Kubernetes', 'Go', 'PHP'], relevance=80)
+        index = SkillIndex()
+
+        self.assertEqual(self._ids(index, 'python AND kubernetes'), ['a'])
+        self.assertEqual(self._ids(index, 'python OR kubernetes'), ['a', 'b', 'c'])
+        self.assertEqual(self._ids(index, 'go OR php'), ['c', 'b'])
+        self.assertEqual(self._ids(index, 'go AND NOT php'), ['b'])
+        self.assertEqual(self._ids(index, 'NOT python'), ['c'])
+        self.assertEqual(self._ids(index, 'k8s AND (python OR php)'), ['c', 'a'])
+        self.assertEqual(self._ids(index, 'rust'), [])
+
+    def test_sparse_and_dense_evaluation_agree(self):
+        """Test filtering the rarest required skill's postings matches dense mask evaluation"""
+        self._save('a', ['Python', 'Kubernetes'], years=3, relevance=70)
+        self._save('b', ['Python', 'Go'], years=8, relevance=90)
+        self._save('c', ['Kubernetes', 'Go', 'PHP'], relevance=80)
+        self._save('d', ['Rust'], years=1, relevance=50)
+        self._save('b', ['Python', 'Go', 'Rust'], years=8, relevance=90)
+        index = SkillIndex()
+        queries = ['python', 'python AND kubernetes', 'go AND NOT php', 'rust AND (go OR python)',
+                   'k8s AND (python OR NOT go)', 'python OR go', 'NOT python', 'haskell AND python']
+
+        for fraction in (0, 1):
+            with mock.patch.object(skill_index_module, 'SPARSE_QUERY_FRACTION', fraction):
+                results = [index.search(query, min_years=min_years)
+                           for query in queries for min_years in (None, 2)]
+            if fraction == 0:
+                dense = results
+        self.assertEqual(results, dense)
+        with mock.patch.object(skill_index_module, 'SPARSE_QUERY_FRACTION', 1):
+            self.assertEqual(self._ids(index, 'rust AND go'), ['b'])
+
+    def test_ranking_min_years_and_limit(self):
+        """Test results rank by skills matched then relevance, filtered by experience"""
+        self._save('both', ['Python', 'Kubernetes'], years=2, relevance=10)
+        self._save('senior', ['Python'], years=8, relevance=60)
+        self._save('unknown', ['Python'], relevance=99)
+        self._save('tied', ['Python'], years=8, relevance=60)
+        index = SkillIndex()
+
+        found = index.search('python OR kubernetes', limit=2)
+        self.assertEqual(found['total_matches'], 4)
+        self.assertEqual([hit.candidate_id for hit in found['hits']], ['both', 'unknown'])
+        self.assertEqual(found['hits'][0].matched_skills, ['python', 'kubernetes'])
+        self.assertEqual(self._ids(index, 'python', min_years=5), ['senior', 'tied'])
+        self.assertEqual(self._ids(index, 'python', min_years=5, limit=1), ['senior'])
+        self.assertEqual(self._ids(index, 'python', limit=0), [])
+
+    def test_saves_and_deletes_reach_a_loaded_index(self):
+        """Test the index catches up with candidates saved, re-saved and deleted after loading"""
+        self._save('a', ['Python'])
+        index = SkillIndex()
+        self.assertEqual(self._ids(index, 'python'), ['a'])
+
+        self._save('b', ['Python'])
+        self._save('a', ['Go'])
+        self.assertEqual(self._ids(index, 'python'), ['b'])
+        self.assertEqual(self._ids(index, 'go'), ['a'])
+
+        database.delete_candidate('b')
+        self.assertEqual(self._ids(index, 'python'), [])
+        self.assertEqual(index.stats()['candidates'], 1)
+
+    def test_postings_without_fields_are_skipped(self):
+        """Test postings of a candidate missing from the field rows leave the index consistent"""
+        self._save('a', ['Python'])
+        index = SkillIndex()
+        self.assertEqual(self._ids(index, 'python'), ['a'])
+
+        self._save('b', ['Python'])
+        snapshot = database.get_skill_index_snapshot
+        # Simulate a candidate saved between reading the fields and the postings
+        with mock.patch.object(skill_index_module, 'get_skill_index_snapshot',
+                               lambda ids: ({}, snapshot(ids)[1])):
+            self.assertEqual(self._ids(index, 'python'), ['a'])
+        self.assertEqual(index.stats()['candidates'], 1)
+
+        self._save('b', ['Python'])
+        self.assertEqual(self._ids(index, 'python'), ['a', 'b'])
+
+    def test_legacy_candidates_are_backfilled(self):
+        """Test candidates saved without skills are indexed from their analysis on load"""
+        self._save('legacy', ['Docker'], years=4, indexed=False)
+        index = SkillIndex()
+
+        found = index.search('docker')
+        self.assertEqual([hit.candidate_id for hit in found['hits']], ['legacy'])
+        self.assertEqual(found['hits'][0].years_experience, 4.0)
+        self.assertEqual(database.get_unindexed_candidates(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.stage_scheduler import StageScheduler, StageTimeout, StageExecutor
+
+class TestStageScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=False)
+
+    def test_independent_stages_overlap(self):
+        """Test independent stages run concurrently and dependencies receive results"""
+        scheduler = StageScheduler(self.executor)
+        scheduler.add('a', lambda: time.sleep(0.2) or 1)
+        scheduler.add('b', lambda: time.sleep(0.2) or 2)
+        scheduler.add('c', lambda a, b: a + b, depends_on=('a', 'b'))
+        completed = []
+
+        start = time.monotonic()
+        results, degraded = scheduler.run(on_complete=lambda name, result: completed.append(name))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(degraded, [])
+        self.assertEqual(completed[-1], 'c')
+        self.assertLess(elapsed, 0.35)
+
+    def test_timeout_uses_fallback(self):
+        """Test a slow stage is replaced by its fallback after the timeout"""
+        scheduler = StageScheduler(self.executor)
+        scheduler.add('slow', lambda: time.sleep(1) or 'late', timeout=0.05, fallback='fallback')
+
+        start = time.monotonic()
+        results, degraded = scheduler.run()
+
+        self.assertEqual(results['slow'], 'fallback')
+        self.assertEqual(degraded, ['slow'])
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_failure_without_fallback_propagates(self):
+        """Test errors propagate from stages without a fallback"""
+        scheduler = StageScheduler(self.executor)
+        scheduler.add('slow', lambda: time.sleep(1), timeout=0.05)
+
+        with self.assertRaises(StageTimeout):
+            scheduler.run()
+
+    def test_timeout_starts_when_stage_runs(self):
+        """Test time spent queued behind other work does not count against a stage"""
+        executor = StageExecutor(max_workers=1)
+        try:
+            executor.submit(time.sleep, 0.3)
+            scheduler = StageScheduler(executor)
+            scheduler.add('quick', lambda: 'done', timeout=0.2, fallback='fallback')
+
+            results, degraded = scheduler.run()
+
+            self.assertEqual(results['quick'], 'done')
+            self.assertEqual(degraded, [])
+        finally:
+            executor.shutdown(wait=False)
+
+    def test_timed_out_stage_frees_its_slot(self):
+        """Test a stage abandoned on timeout does not keep later work waiting"""
+        executor = StageExecutor(max_workers=1)
+        try:
+            scheduler = StageScheduler(executor)
+            scheduler.add('slow', lambda: time.sleep(1), timeout=0.05, fallback=None)
+            scheduler.run()
+
+            self.assertEqual(executor.abandoned(), 1)
+            self.assertEqual(executor.submit(lambda: 'next').result(timeout=0.5), 'next')
+        finally:
+            executor.shutdown(wait=False)
+
+    def test_finished_abandoned_workers_are_forgotten(self):
+        """Test threads of abandoned workers that have exited are not kept around"""
+        executor = StageExecutor(max_workers=1)
+        try:
+            for _ in range(5):
+                started = threading.Event()
+                future = executor.submit(lambda: (started.set(), time.sleep(0.05)))
+                started.wait(1)
+                executor.abandon(future)
+                future.result(timeout=1)
+                # Let the abandoned worker exit
+                time.sleep(0.05)
+
+            self.assertEqual(len(executor._threads), 2)
+        finally:
+            executor.shutdown(wait=False)
+
+    def test_unknown_dependency(self):
+        """Test stages must be registered after their dependencies"""
+        scheduler = StageScheduler(self.executor)
+        with self.assertRaises(ValueError):
+            scheduler.add('b', lambda a: a, depends_on=('a',))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,13 @@
 import unittest
+import os
+import sys
+import json
+from types import SimpleNamespace
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services import watson_service
+from services.watson_service import analyze_resume_with_watson
 
 def get_mock_analysis(resume_text):
     """Mock analysis for testing when Watson is not available"""
@@ -50,5 +59,32 @@ class TestWatsonService(unittest.TestCase):
         self.assertLessEqual(result['relevance_score'], 100)
         self.assertIn(result['category'], ['Highly Qualified', 'Qualified', 'Not a Fit'])
 
+
+class TestAnalyzeResume(unittest.TestCase):
+
+    def _reply(self, content):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def test_prompt_uses_relevant_sections(self):
+        """Test the analysis prompt carries the selected sections, even past the first 4000 characters"""
+        resume = "Jane Doe\n" + "Hobby notes. " * 400 + "\nSkills\nPython, Kubernetes\n"
+        analysis = {'years_experience': 4, 'key_skills': ['Python']}
+        with mock.patch.object(watson_service.client.chat.completions, 'create',
+                               return_value=self._reply(json.dumps(analysis))) as create:
+            result = analyze_resume_with_watson(resume)
+
+        self.assertEqual(result, analysis)
+        prompt = create.call_args.kwargs['messages'][1]['content']
+        self.assertIn("SKILLS:\nPython, Kubernetes", prompt)
+        self.assertNotIn("Hobby notes", prompt)
+
+    def test_failure_falls_back_to_mock(self):
+        """Test an unparseable reply falls back to the mock analysis"""
+        with mock.patch.object(watson_service.client.chat.completions, 'create',
+                               return_value=self._reply('not json')):
+            result = analyze_resume_with_watson("Python developer with experience")
+
+        self.assertEqual(result['key_skills'], ['Python', 'JavaScript', 'React'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,12 +2,27 @@ import React, { useState } from 'react';
 import axios from 'axios';
 import config from '../config';
 
+// Progress text shown as each backend processing stage finishes
+const STAGE_LABELS = {
+  extracted: 'Text extracted, checking for bias...',
+  bias_analysed: 'Bias analysis complete...',
+  blind_created: 'Blind resume created...',
+  llm_analysed: 'AI analysis complete...',
+  enriched: 'Profiles enriched...',
+  jd_matched: 'Job description matched...',
+  saved: 'Saving results...',
+};
+
+// How often the job status is polled once the event stream is lost
+const STATUS_POLL_MS = 2000;
+
 const UploadComponent = ({ onUploadSuccess }) => {
   const [file, setFile] = useState(null);
   const [jobDescription, setJobDescription] = useState('');
   const [uploading, setUploading] = useState(false);
   const [message, setMessage] = useState('');
   const [isError, setIsError] = useState(false);
+  const [progress, setProgress] = useState('');
 
   const handleFileChange = (event) => {
     const selectedFile = event.target.files[0];
@@ -38,6 +53,7 @@ const UploadComponent = ({ onUploadSuccess }) => {
 
     setUploading(true);
     setMessage('');
+    setProgress('Uploading...');
 
     const formData = new FormData();
     formData.append('file', file);
@@ -46,25 +62,70 @@ const UploadComponent = ({ onUploadSuccess }) => {
     }
 
     try {
-      const response = await axios.post(`${config.API_BASE_URL}/api/upload`, formData, {
+      // Queue the upload, then follow its progress over Server-Sent Events
+      const response = await axios.post(`${config.API_BASE_URL}/api/upload?async=1`, formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
 
-      if (response.data.success) {
-        setMessage('Resume uploaded and analyzed successfully!');
-        setIsError(false);
-        onUploadSuccess();
-      } else {
+      if (!response.data.success) {
         setMessage(response.data.error || 'Upload failed');
         setIsError(true);
+        setUploading(false);
+        return;
       }
+
+      const finish = (error) => {
+        setMessage(error || 'Resume uploaded and analyzed successfully!');
+        setIsError(Boolean(error));
+        setProgress('');
+        setUploading(false);
+        if (!error) {
+          onUploadSuccess();
+        }
+      };
+
+      // Without the event stream, poll the job status until it finishes
+      const pollStatus = async () => {
+        try {
+          const status = await axios.get(`${config.API_BASE_URL}${response.data.status_url}`);
+          if (status.data.status === 'completed') {
+            finish();
+          } else if (status.data.status === 'failed') {
+            finish(status.data.error || 'Processing failed');
+          } else {
+            setProgress(STAGE_LABELS[status.data.current_stage] || 'Processing...');
+            setTimeout(pollStatus, STATUS_POLL_MS);
+          }
+        } catch (error) {
+          console.error('Job status error:', error);
+          finish(error.response?.data?.error || 'Lost track of the upload. Please check if the server is running.');
+        }
+      };
+
+      const events = new EventSource(`${config.API_BASE_URL}${response.data.events_url}`);
+      Object.entries(STAGE_LABELS).forEach(([stage, label]) => {
+        events.addEventListener(stage, () => setProgress(label));
+      });
+      events.addEventListener('completed', () => {
+        events.close();
+        finish();
+      });
+      events.addEventListener('failed', (event) => {
+        events.close();
+        finish(JSON.parse(event.data).error || 'Processing failed');
+      });
+      events.onerror = () => {
+        // The browser would keep reconnecting, or has given up if the stream is CLOSED;
+        // either way the job status endpoint tells us how the upload ended
+        events.close();
+        pollStatus();
+      };
     } catch (error) {
       console.error('Upload error:', error);
       setMessage(error.response?.data?.error || 'Failed to upload resume. Please check if the server is running.');
       setIsError(true);
-    } finally {
       setUploading(false);
     }
   };
@@ -131,7 +192,7 @@ const UploadComponent = ({ onUploadSuccess }) => {
               {uploading ? (
                 <>
                   <span className="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>
-                  Analyzing with Watson...
+                  {progress || 'Analyzing with Watson...'}
                 </>
               ) : (
                 'Upload & Analyze Resume'